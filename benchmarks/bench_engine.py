@@ -0,0 +1,61 @@
+"""Throughput of TimerManager as the number of concurrent timers grows
+
+Runs on a simulated clock, so it measures scheduling cost only (no sleeping):
+
+    python benchmarks/bench_engine.py
+    python benchmarks/bench_engine.py --sizes 1000 10000 100000 --transitions 20
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from timer_engine import TimerManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run(n, transitions, seed=1):
+    """Start n timers and process `transitions` work/break switches per timer"""
+    rng = random.Random(seed)
+    clock = FakeClock()
+    manager = TimerManager(clock)
+
+    for i in range(n):
+        # Mix of session lengths so deadlines interleave
+        manager.add(i, work_time=rng.randint(60, 1500), break_time=rng.randint(30, 300))
+        manager.start(i)
+
+    target = n * transitions
+    events = 0
+    begin = time.perf_counter()
+    while events < target:
+        clock.now = manager.next_deadline()
+        events += len(manager.advance(clock.now))
+    elapsed = time.perf_counter() - begin
+    return events, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--transitions", type=int, default=10, help="transitions per timer")
+    args = parser.parse_args()
+
+    print(f"{'timers':>10} {'events':>10} {'seconds':>9} {'events/s':>12} {'us/event':>9}")
+    for n in args.sizes:
+        events, elapsed = run(n, args.transitions)
+        print(f"{n:>10} {events:>10} {elapsed:>9.3f} {events / elapsed:>12,.0f} {elapsed / events * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
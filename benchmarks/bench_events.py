@@ -0,0 +1,66 @@
+"""What emitting session events costs the caller, with slow and hung handlers attached
+
+The caller stands in for the Tk thread: emit() must stay in the microseconds no
+matter what the handlers do.
+
+    python benchmarks/bench_events.py
+    python benchmarks/bench_events.py --events 5000 --workers 2 --slow-ms 50
+    python benchmarks/bench_events.py --interval-ms 0    # one burst (handlers drop events)
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from events import EVENTS, EventBus
+
+
+def plugin(slow_ms):
+    def setup(bus):
+        bus.subscribe("*", lambda event: None, name="noop")
+        bus.subscribe("*", lambda event: json.dumps(event), name="serialise")
+        bus.subscribe("finished", lambda event: time.sleep(slow_ms / 1000), timeout=slow_ms / 2000, name="slow")
+        bus.subscribe("start", lambda event: time.sleep(3600), timeout=0.05, name="hung")
+    return setup
+
+
+def run(events, workers, slow_ms, interval_ms):
+    bus = EventBus(workers=workers, plugins=[("bench", lambda: plugin(slow_ms))])
+    payload = {"session": "work", "running": True, "goal": "benchmark", "remaining": 1500.0}
+    samples = []
+    for i in range(events):
+        begin = time.perf_counter()
+        bus.emit(EVENTS[i % len(EVENTS)], **payload)
+        samples.append(time.perf_counter() - begin)
+        if interval_ms:
+            time.sleep(interval_ms / 1000)
+    # Everything but the hung handler drains
+    time.sleep(0.2)
+    bus.wait(slow_ms / 1000 * events / workers + 1)
+    samples.sort()
+    return {
+        "events": events,
+        "emit_us": {
+            "p50": round(samples[len(samples) // 2] * 1e6, 1),
+            "p95": round(samples[int(len(samples) * 0.95)] * 1e6, 1),
+            "max": round(samples[-1] * 1e6, 1),
+        },
+        "bus": bus.metrics(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--slow-ms", type=float, default=20)
+    parser.add_argument("--interval-ms", type=float, default=1, help="pause between emits")
+    args = parser.parse_args()
+    print(json.dumps(run(args.events, args.workers, args.slow_ms, args.interval_ms), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Cold-start regression check: launch the app several times and compare to the budget
+
+Needs a display (use xvfb-run on headless machines):
+
+    xvfb-run python benchmarks/bench_startup.py --runs 5
+
+Exits with status 1 if the median time to first frame is over the budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "pda_pomodoro.py")
+
+
+def launch():
+    # Fresh working directory each time: no settings, goals or history to load
+    with tempfile.TemporaryDirectory() as workdir:
+        result = subprocess.run(
+            [sys.executable, APP, "--startup-check"],
+            cwd=workdir, capture_output=True, text=True, timeout=60
+        )
+    start = result.stdout.find("{")
+    if start < 0:
+        raise RuntimeError(f"no startup report (exit {result.returncode}):\n{result.stderr}")
+    return json.loads(result.stdout[start:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    reports = [launch() for _ in range(args.runs)]
+    first_frame = statistics.median(r["first_frame_ms"] for r in reports)
+    warm = statistics.median(r["warm_ms"] for r in reports)
+    budget = reports[0]["budget_ms"]
+
+    print(f"first frame: {first_frame:.1f} ms (median of {args.runs}, budget {budget} ms)")
+    print(f"fully warm:  {warm:.1f} ms")
+    for name in reports[0]["phases_ms"]:
+        print(f"  {name:<24} {statistics.median(r['phases_ms'][name] for r in reports):8.2f} ms")
+
+    if first_frame > budget:
+        print("OVER BUDGET")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
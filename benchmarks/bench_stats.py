@@ -0,0 +1,80 @@
+"""Build and query StatsRollup over synthetic session history
+
+    python benchmarks/bench_stats.py
+    python benchmarks/bench_stats.py --sessions 1000000 --goals 500
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from stats import StatsRollup
+
+
+def synthetic_sessions(count, goals, seed=1):
+    """Roughly chronological work/break records over the last few years"""
+    rng = random.Random(seed)
+    goal_names = [f"goal {i}" for i in range(goals)]
+    # Spread the sessions over ten years, like a busy shared install would have
+    step = 10 * 365 * 86400 / count
+    t = time.time() - 10 * 365 * 86400
+    records = []
+    for _ in range(count):
+        work = rng.random() < 0.7
+        length = rng.choice((25, 25, 50, 15)) * 60 if work else 5 * 60
+        completed = rng.random() < 0.9
+        focus = length if completed else rng.randint(60, length)
+        records.append({
+            "start": t,
+            "end": t + focus,
+            "type": "work" if work else "break",
+            "goal": rng.choice(goal_names) if work else "",
+            "pauses": 0,
+            "focus": focus,
+            "completed": completed,
+        })
+        t += step * rng.uniform(0.5, 1.5)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000000)
+    parser.add_argument("--goals", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=10000)
+    args = parser.parse_args()
+
+    records = synthetic_sessions(args.sessions, args.goals)
+
+    stats = StatsRollup()
+    begin = time.perf_counter()
+    stats.add_many(records)
+    build = time.perf_counter() - begin
+
+    rng = random.Random(2)
+    first = date.fromtimestamp(records[0]["start"])
+    span = (date.fromtimestamp(records[-1]["end"]) - first).days
+    begin = time.perf_counter()
+    for _ in range(args.queries):
+        d = first + timedelta(days=rng.randint(0, span))
+        stats.day(d)
+        stats.week(d)
+        stats.goal(f"goal {rng.randrange(args.goals)}")
+    query = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    stats.between(first, first + timedelta(days=span))
+    full_range = time.perf_counter() - begin
+
+    print(f"sessions:          {args.sessions:,} over {span:,} days")
+    print(f"build:             {build:.3f} s ({build / args.sessions * 1e6:.2f} us/session)")
+    print(f"day+week+goal:     {query / args.queries * 1e6:.2f} us/query")
+    print(f"whole-range total: {full_range * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Rendering and tick-path benchmarks for the Tk UI, run against a virtual X display
+
+Starts its own Xvfb if there's no DISPLAY (or run it under xvfb-run yourself):
+
+    python benchmarks/bench_ui.py                     # print timings
+    python benchmarks/bench_ui.py --save-baseline     # record them in baselines/ui.json
+    python benchmarks/bench_ui.py --compare           # exit 1 if a case regressed
+
+Each case reports the median of --repeat runs, in milliseconds. --compare fails a case
+when it is more than --threshold (default 25%) slower than its baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "ui.json")
+
+sys.path.insert(0, SRC)
+
+
+def ensure_display():
+    """Use $DISPLAY if set, otherwise start Xvfb on a free display; returns the process"""
+    if os.environ.get("DISPLAY"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        sys.exit("No DISPLAY and Xvfb isn't installed (try: xvfb-run python benchmarks/bench_ui.py)")
+    for number in range(99, 120):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            continue
+        process = subprocess.Popen(
+            [xvfb, f":{number}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        # Wait for the socket to show up
+        for _ in range(100):
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                os.environ["DISPLAY"] = f":{number}"
+                return process
+            if process.poll() is not None:
+                break
+            time.sleep(0.05)
+        process.kill()
+    sys.exit("Couldn't start Xvfb")
+
+
+def timed(fn):
+    begin = time.perf_counter()
+    fn()
+    return (time.perf_counter() - begin) * 1000
+
+
+def run_cases(repeat, ticks):
+    results = {}
+
+    def record(name, samples):
+        results[name] = statistics.median(samples)
+
+    # Construction: a fresh root every time
+    samples = []
+    for _ in range(repeat):
+        root = tk.Tk()
+        samples.append(timed(lambda: (PomodoroTimer(root), root.update_idletasks())))
+        root.destroy()
+    record("construct", samples)
+
+    root = tk.Tk()
+    app = PomodoroTimer(root)
+    root.update()
+
+    def rebuild_background():
+        app.bg_canvas.destroy()
+        app.create_background()
+        app.bg_canvas.lower()
+        root.update_idletasks()
+    record("create_background", [timed(rebuild_background) for _ in range(repeat)])
+
+    record("draw_hourglass", [timed(lambda: (app.draw_hourglass(), root.update_idletasks())) for _ in range(repeat)])
+
+    # Dialogs are built once and reused: time the first open (which builds it) and reopening
+    def open_dialog(show, hide):
+        duration = timed(lambda: (show(), root.update_idletasks()))
+        hide()
+        root.update()
+        return duration
+
+    dialogs = [
+        ("show_settings", app.show_settings, lambda: app.settings_window.withdraw()),
+        ("ask_for_goal", app.ask_for_goal, app.hide_goal_window),
+        ("show_popup", app.show_popup, app.close_popup),
+    ]
+    for name, show, hide in dialogs:
+        results[f"{name}_first"] = open_dialog(show, hide)
+        widgets = count_widgets(root)["widgets"]
+        record(name, [open_dialog(show, hide) for _ in range(repeat)])
+        if count_widgets(root)["widgets"] != widgets:
+            print(f"  warning: reopening {name} created new widgets")
+
+    def mini_window():
+        duration = timed(lambda: (app.create_mini_window(), root.update_idletasks()))
+        app.mini_window.destroy()
+        app.mini_window = None
+        root.deiconify()
+        root.update()
+        return duration
+    record("mini_window", [mini_window() for _ in range(repeat)])
+
+    # Simulated ticks: walk the clock down through a session, redrawing each second
+    def simulate_ticks():
+        app.engine.pause()
+        length = app.engine.session_length
+        for i in range(ticks):
+            app.engine.set_time_left(length - i % (length + 1))
+            app.update_display()
+        root.update_idletasks()
+    record(f"update_display_{ticks // 1000}k", [timed(simulate_ticks) for _ in range(max(1, repeat // 2))])
+
+    root.destroy()
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, ms in results.items():
+        base = baseline.get("results_ms", {}).get(name)
+        if base is None:
+            print(f"  {name:<22} {ms:9.2f} ms   (no baseline)")
+            continue
+        change = (ms - base) / base if base else 0.0
+        flag = "REGRESSED" if change > threshold else ""
+        print(f"  {name:<22} {ms:9.2f} ms   baseline {base:9.2f} ms   {change:+7.1%} {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    xvfb = ensure_display()
+    # The app keeps settings, goals and history in the working directory
+    workdir = tempfile.mkdtemp(prefix="pda-bench-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    os.environ.setdefault("PDA_POMODORO_AUDIO", "null")
+    try:
+        global tk, PomodoroTimer, count_widgets
+        import tkinter as tk
+        from pda_pomodoro import PomodoroTimer, count_widgets
+        results = run_cases(args.repeat, args.ticks)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+        if xvfb is not None:
+            xvfb.terminate()
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": sys.platform,
+                "repeat": args.repeat,
+                "results_ms": {name: round(ms, 3) for name, ms in results.items()},
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            sys.exit(f"No baseline at {args.baseline} (run with --save-baseline first)")
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regressed over {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+    else:
+        for name, ms in results.items():
+            print(f"  {name:<22} {ms:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
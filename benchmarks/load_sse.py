@@ -0,0 +1,145 @@
+"""Load generator for the shared timer server (src/pda_server.py)
+
+Opens many SSE subscribers against a local server, then sends start/pause commands
+and measures how long each takes to reach every client. It also measures the
+server's CPU use while nothing is happening.
+
+    python benchmarks/load_sse.py --spawn --clients 10000
+    python benchmarks/load_sse.py --port 8765 --clients 500      # an already running server
+
+--spawn starts its own server on a free port (and is needed for the idle CPU figure,
+which reads /proc, so Linux only).
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+SERVER = os.path.join(SRC, "pda_server.py")
+sys.path.insert(0, SRC)
+
+from pda_server import raise_file_limit
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+class Client:
+    """One SSE subscriber that remembers when it saw each state version"""
+
+    def __init__(self):
+        self.seen = {}
+        self.connected = asyncio.Event()
+
+    async def run(self, host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b"GET /events HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n")
+        await reader.readuntil(b"\r\n\r\n")
+        self.connected.set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                if line.startswith(b"id: "):
+                    self.seen[int(line[4:])] = time.perf_counter()
+        finally:
+            writer.close()
+
+
+async def post(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: 0\r\n\r\n".encode())
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return json.loads(body)
+
+
+async def wait_for_all(clients, version, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while any(version not in c.seen for c in clients):
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"version {version} didn't reach every client")
+        await asyncio.sleep(0.005)
+
+
+async def run(args, server_pid):
+    host, port = "127.0.0.1", args.port
+    clients = [Client() for _ in range(args.clients)]
+    begin = time.perf_counter()
+    tasks = []
+    # Connect in batches so the listen backlog doesn't overflow
+    for i in range(0, len(clients), 500):
+        batch = clients[i:i + 500]
+        tasks += [asyncio.create_task(c.run(host, port)) for c in batch]
+        await asyncio.gather(*(c.connected.wait() for c in batch))
+    print(f"connected {len(clients)} clients in {time.perf_counter() - begin:.2f} s")
+
+    latencies = []
+    for i in range(args.transitions):
+        path = "/pause" if i % 2 else "/start"
+        sent = time.perf_counter()
+        state = await post(host, port, path)
+        await wait_for_all(clients, state["version"])
+        per_client = [c.seen[state["version"]] - sent for c in clients]
+        latencies.append(max(per_client))
+        print(f"  {path:<7} v{state['version']:<4} all clients in {max(per_client) * 1000:7.1f} ms "
+              f"(median {statistics.median(per_client) * 1000:.1f} ms)")
+    print(f"fan-out to {len(clients)} clients: median {statistics.median(latencies) * 1000:.1f} ms, "
+          f"worst {max(latencies) * 1000:.1f} ms")
+
+    if server_pid is not None and args.idle > 0:
+        before = cpu_seconds(server_pid)
+        await asyncio.sleep(args.idle)
+        used = cpu_seconds(server_pid) - before
+        print(f"server CPU while idle with {len(clients)} clients: {used / args.idle:.2%} over {args.idle:.0f} s")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--spawn", action="store_true", help="start a server on a free port for the run")
+    parser.add_argument("--transitions", type=int, default=6)
+    parser.add_argument("--idle", type=float, default=5.0, help="seconds to measure idle server CPU (--spawn only)")
+    args = parser.parse_args()
+    raise_file_limit()
+
+    server = None
+    if args.spawn:
+        args.port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, SERVER, "--port", str(args.port), "--heartbeat", "0"],
+            stdout=subprocess.PIPE, text=True
+        )
+        server.stdout.readline()  # "Shared timer on ..."
+    try:
+        asyncio.run(run(args, server.pid if server else None))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
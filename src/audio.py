@@ -0,0 +1,233 @@
+"""Notification sound playback that never blocks the Tk thread
+
+A backend is picked once, the sound is decoded once and kept in memory, and all
+loading and playing happens on a single worker thread. Set PDA_POMODORO_AUDIO to
+force a backend: a name below, "null", or "file:<path>" to log plays to a file
+(handy for measuring latency on a headless box).
+"""
+import collections
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+
+class NullSink:
+    """Plays nothing (headless machines, tests)"""
+
+    name = "null"
+
+    def load(self, path):
+        return path
+
+    def play(self, sound):
+        pass
+
+
+class FileSink:
+    """Appends a line per play to a file instead of making a sound"""
+
+    name = "file"
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self, path):
+        return path
+
+    def play(self, sound):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(f"{time.time():.6f} {sound}\n")
+
+
+class PygameBackend:
+    """Decodes the file to PCM once (pygame.mixer.Sound) and mixes it from memory"""
+
+    name = "pygame"
+
+    def __init__(self):
+        import pygame
+        self.pygame = pygame
+        pygame.mixer.init()
+
+    def load(self, path):
+        return self.pygame.mixer.Sound(path)
+
+    def play(self, sound):
+        sound.play()
+
+
+class WinsoundBackend:
+    """Windows: WAV files are read once and played from memory, anything else beeps"""
+
+    name = "winsound"
+
+    def __init__(self):
+        import winsound
+        self.winsound = winsound
+
+    def load(self, path):
+        if path.lower().endswith(".wav"):
+            with open(path, "rb") as f:
+                return f.read()
+        return None
+
+    def play(self, sound):
+        if sound:
+            self.winsound.PlaySound(sound, self.winsound.SND_MEMORY)
+        else:
+            self.winsound.MessageBeep(self.winsound.MB_ICONASTERISK)
+
+
+class PlaysoundBackend:
+    name = "playsound"
+
+    def __init__(self):
+        from playsound import playsound
+        self.playsound = playsound
+
+    def load(self, path):
+        return path
+
+    def play(self, sound):
+        # Blocking is fine, we're on the worker thread
+        self.playsound(sound, True)
+
+
+class CommandBackend:
+    """Shells out to the platform's player (paplay/aplay/afplay)"""
+
+    name = "command"
+    PLAYERS = ["afplay"] if sys.platform == "darwin" else ["paplay", "pw-play", "aplay", "ffplay"]
+
+    def __init__(self):
+        for player in self.PLAYERS:
+            executable = shutil.which(player)
+            if executable:
+                self.command = [executable] + (["-nodisp", "-autoexit", "-loglevel", "quiet"] if player == "ffplay" else [])
+                return
+        raise RuntimeError("no command-line audio player found")
+
+    def load(self, path):
+        return path
+
+    def play(self, sound):
+        subprocess.run(self.command + [sound], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30)
+
+
+class BellBackend:
+    """Last resort: the terminal bell"""
+
+    name = "bell"
+
+    def load(self, path):
+        return path
+
+    def play(self, sound):
+        print("\a", end="", flush=True)
+
+
+BACKENDS = [PygameBackend, PlaysoundBackend, WinsoundBackend, CommandBackend, BellBackend]
+
+
+def pick_backend(preference=None):
+    """First backend that initialises, or the one named by `preference`"""
+    preference = preference if preference is not None else os.environ.get("PDA_POMODORO_AUDIO", "")
+    if preference == "null":
+        return NullSink()
+    if preference.startswith("file:"):
+        return FileSink(preference[len("file:"):])
+    candidates = [b for b in BACKENDS if b.name == preference] or BACKENDS
+    for backend in candidates:
+        try:
+            return backend()
+        except Exception:
+            continue
+    return BellBackend()
+
+
+class AudioEngine:
+    """Loads and plays one notification sound on a background worker thread"""
+
+    def __init__(self, sound_path, backend=None):
+        self.sound_path = sound_path
+        self.backend = backend
+        self._sound = None
+        self._loaded = False
+        self._jobs = queue.Queue()
+        self._worker = None
+        self._closed = False
+        self._lock = threading.Lock()
+        # Seconds from play() to the backend starting playback, most recent last
+        self.latencies = collections.deque(maxlen=100)
+
+    def preload(self):
+        """Pick the backend and decode the sound in the background"""
+        self._submit(None)
+
+    def play(self):
+        """Queue the sound; returns immediately"""
+        self._submit(time.perf_counter())
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            if self._worker is not None:
+                self._jobs.put(False)
+
+    def wait(self, timeout=None):
+        """Block until queued work is done (for tests and benchmarks)"""
+        with self._lock:
+            worker = self._worker
+            if worker is None:
+                # Nothing was ever queued
+                return True
+            if self._closed:
+                # The worker finishes what's queued, then exits
+                worker.join(timeout)
+                return not worker.is_alive()
+            done = threading.Event()
+            self._jobs.put(done)
+        return done.wait(timeout)
+
+    def _submit(self, job):
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="audio", daemon=True)
+                self._worker.start()
+        self._jobs.put(job)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is False:
+                return
+            if isinstance(job, threading.Event):
+                job.set()
+                continue
+            try:
+                self._ensure_loaded()
+                if job is not None:
+                    self.latencies.append(time.perf_counter() - job)
+                    self.backend.play(self._sound)
+            except Exception as e:
+                print(f"Error playing sound: {e}")
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        if self.backend is None:
+            self.backend = pick_backend()
+        if self.sound_path and os.path.exists(self.sound_path):
+            try:
+                self._sound = self.backend.load(self.sound_path)
+            except Exception as e:
+                print(f"Error loading sound ({self.backend.name}): {e}")
+                self.backend = BellBackend()
+        elif not isinstance(self.backend, (WinsoundBackend, NullSink, FileSink)):
+            # No custom sound: a system beep (winsound) or the bell is all we can do
+            self.backend = BellBackend()
+        self._loaded = True
@@ -0,0 +1,216 @@
+"""Single-instance control: the running app listens on a Unix domain socket
+
+The first launch takes a lock and listens. A later launch (or pda_ctl.py) connects,
+sends one request and prints the reply, without ever loading Tk. The protocol is one
+line of JSON each way:
+
+    -> {"command": "start", "goal": "write report"}
+    <- {"ok": true, "changed": true, "state": {"session": "work", "running": true, ...}}
+
+Commands: start [goal], pause, reset, status, mini, show.
+
+The socket lives in $XDG_RUNTIME_DIR (or a private folder under /tmp), and only the
+owner can connect. This module never imports tkinter. The app hooks the listening
+socket into its event loop through add_reader/remove_reader callables.
+"""
+import json
+import os
+import socket
+import tempfile
+import time
+
+COMMANDS = ("start", "pause", "reset", "status", "mini", "show")
+SOCKET_NAME = "pda-pomodoro.sock"
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+def available():
+    """Unix sockets and file handlers in the Tk event loop are POSIX-only"""
+    return os.name == "posix" and hasattr(socket, "AF_UNIX")
+
+
+def socket_path():
+    path = os.environ.get("PDA_POMODORO_SOCKET")
+    if path:
+        return path
+    folder = os.environ.get("XDG_RUNTIME_DIR")
+    if not folder:
+        # /tmp is shared: use a folder only we can get into
+        folder = os.path.join(tempfile.gettempdir(), f"pda-pomodoro-{os.getuid()}")
+        os.makedirs(folder, mode=0o700, exist_ok=True)
+        if os.stat(folder).st_uid != os.getuid():
+            raise PermissionError(f"{folder} belongs to someone else")
+    return os.path.join(folder, SOCKET_NAME)
+
+
+def send(command, goal=None, path=None, timeout=5.0, wait=0.2):
+    """Send one command to the running instance and return its reply
+
+    Raises OSError (FileNotFoundError, ConnectionRefusedError) when nothing is
+    listening. An instance that is still starting up has the socket but not its event
+    loop yet, so the reply can take as long as its startup does.
+    """
+    request = {"command": command}
+    if goal:
+        request["goal"] = goal
+    path = path or socket_path()
+    give_up = time.monotonic() + wait
+    while True:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+            break
+        except (FileNotFoundError, ConnectionRefusedError):
+            sock.close()
+            # The owner may be between taking the lock and listening
+            if time.monotonic() >= give_up:
+                raise
+            time.sleep(0.01)
+    with sock:
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        reply = bytearray()
+        while not reply.endswith(b"\n"):
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            reply += chunk
+    if not reply:
+        raise ConnectionResetError("the running instance closed the connection")
+    return json.loads(reply)
+
+
+def describe(reply):
+    """One human-readable line for a reply"""
+    if not reply.get("ok"):
+        return f"error: {reply.get('error', 'unknown')}"
+    state = reply["state"]
+    left = round(state["remaining"])
+    paused = "" if state["running"] else " (paused)"
+    goal = f"  📌 {state['goal']}" if state.get("goal") else ""
+    return f"{state['session']} {left // 60:02d}:{left % 60:02d}{paused}{goal}  · sessions today: {state['sessions_today']}"
+
+
+class ControlServer:
+    """The listening end, owned by whichever process holds the lock file
+
+    The lock (not the socket file) decides who is the instance, so a socket left
+    behind by a crash is simply replaced, and two launches at once can't both win.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or socket_path()
+        self.sock = None
+        self.handle = None
+        self.requests = 0
+        self._lock_fd = None
+        self._add_reader = self._remove_reader = None
+        self._pending = {}
+
+    def claim(self):
+        """Take the lock and listen; False if another instance already has it"""
+        import fcntl
+        fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        # Whatever is at the path belongs to a dead instance (we hold the lock)
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)
+        try:
+            sock.bind(self.path)
+        finally:
+            os.umask(umask)
+        sock.listen(16)
+        sock.setblocking(False)
+        self.sock = sock
+        return True
+
+    def attach(self, handle, add_reader, remove_reader):
+        """Start serving: handle(request) -> reply, called from the app's event loop
+
+        add_reader(sock, callback) / remove_reader(sock) wire a socket into that loop
+        (Tk's createfilehandler, or asyncio's loop.add_reader).
+        """
+        self.handle = handle
+        self._add_reader = add_reader
+        self._remove_reader = remove_reader
+        add_reader(self.sock, self.on_accept)
+
+    def on_accept(self):
+        try:
+            conn, _ = self.sock.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        conn.setblocking(False)
+        self._pending[conn] = bytearray()
+        self._add_reader(conn, lambda: self.on_readable(conn))
+
+    def on_readable(self, conn):
+        buffer = self._pending[conn]
+        try:
+            chunk = conn.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            chunk = b""
+        buffer += chunk
+        if chunk and b"\n" not in buffer and len(buffer) < MAX_REQUEST_BYTES:
+            return
+        self._drop(conn)
+        if not buffer.strip():
+            conn.close()
+            return
+        reply = self.reply_to(bytes(buffer).split(b"\n", 1)[0])
+        try:
+            # Replies are a few hundred bytes and the client is waiting for them
+            conn.setblocking(True)
+            conn.settimeout(1.0)
+            conn.sendall(json.dumps(reply).encode() + b"\n")
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def reply_to(self, line):
+        self.requests += 1
+        try:
+            request = json.loads(line)
+            command = request["command"]
+        except (ValueError, TypeError, KeyError):
+            return {"ok": False, "error": "expected a JSON object with a command"}
+        if command not in COMMANDS:
+            return {"ok": False, "error": f"unknown command {command!r}"}
+        try:
+            return self.handle(request)
+        except Exception as e:
+            print(f"Error handling control command {command}: {e}")
+            return {"ok": False, "error": str(e)}
+
+    def _drop(self, conn):
+        del self._pending[conn]
+        self._remove_reader(conn)
+
+    def close(self):
+        for conn in list(self._pending):
+            self._drop(conn)
+            conn.close()
+        if self.sock is not None:
+            if self._remove_reader is not None:
+                self._remove_reader(self.sock)
+            self.sock.close()
+            self.sock = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
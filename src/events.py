@@ -0,0 +1,332 @@
+"""Session lifecycle events for plugins (status updates, logging, home automation...)
+
+The app calls emit() at each transition. That only appends to a queue and returns.
+Handlers run later on a small pool of daemon worker threads, so a slow or hung
+handler can never hold up the countdown.
+
+Events (the payload is a plain dict: "event", "time" and the timer state):
+
+    start     a session starts or resumes
+    pause     the countdown is paused
+    reset     the session is thrown away (payload is the state before the reset)
+    finished  the countdown reached zero ("finished" is "work" or "break")
+    switch    moved on to the next session
+    *         subscribe to every event
+
+A plugin is a function taking the bus. It is found through the "pda_pomodoro.plugins"
+entry-point group, or through PDA_POMODORO_PLUGINS=module:function,... for plain
+scripts on sys.path:
+
+    def setup(bus):
+        bus.subscribe("finished", lambda event: print("done:", event["goal"]), timeout=2)
+
+Plugins are discovered and imported on a worker thread when the first event is
+emitted, so startup never pays for them. Handlers run on worker threads and must not
+touch Tk.
+
+Python can't stop a thread. A handler that overruns its timeout is counted as
+timed out, and events for it are dropped until it returns. Meanwhile the pool grows
+by one worker so that everyone else keeps going. A watchdog thread notices the overrun
+when it happens, so events already queued behind the hung handler go out without
+waiting for the next emit(). Events for one handler are
+delivered in order, and at most `backlog` of them wait; at most `inbox` events wait
+for the dispatcher.
+"""
+import collections
+import importlib
+import os
+import queue
+import threading
+import time
+
+EVENTS = ("start", "pause", "reset", "finished", "switch")
+ENTRY_POINT_GROUP = "pda_pomodoro.plugins"
+
+
+def discover():
+    """(name, load) for every plugin; load() imports it and returns its setup function"""
+    plugins = []
+    try:
+        from importlib.metadata import entry_points
+        try:
+            found = entry_points(group=ENTRY_POINT_GROUP)
+        except TypeError:
+            # Python < 3.10: a dict of group -> entry points
+            found = entry_points().get(ENTRY_POINT_GROUP, [])
+        plugins.extend((ep.name, ep.load) for ep in found)
+    except Exception as e:
+        print(f"Error listing plugins: {e}")
+    for spec in filter(None, (s.strip() for s in os.environ.get("PDA_POMODORO_PLUGINS", "").split(","))):
+        plugins.append((spec, lambda spec=spec: resolve(spec)))
+    return plugins
+
+
+def resolve(spec):
+    """"package.module:function" -> the function"""
+    module, _, attribute = spec.partition(":")
+    target = importlib.import_module(module)
+    for part in filter(None, attribute.split(".")):
+        target = getattr(target, part)
+    return target
+
+
+class Handler:
+    """One subscription, with its own queue of pending events and its metrics"""
+
+    def __init__(self, event, fn, timeout, name):
+        self.event = event
+        self.fn = fn
+        self.timeout = timeout
+        self.name = name
+        self.pending = collections.deque()
+        self.scheduled = False
+        self.running_since = None
+        self.timed_out = False
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.dropped = 0
+        # Seconds per call, most recent last
+        self.latencies = collections.deque(maxlen=500)
+
+    def report(self):
+        ordered = sorted(self.latencies)
+        report = {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "dropped": self.dropped,
+            "pending": len(self.pending),
+        }
+        if ordered:
+            report.update(
+                mean_ms=round(sum(ordered) / len(ordered) * 1000, 2),
+                p50_ms=round(ordered[len(ordered) // 2] * 1000, 2),
+                p95_ms=round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+                max_ms=round(ordered[-1] * 1000, 2),
+            )
+        return report
+
+
+class EventBus:
+    def __init__(self, workers=4, timeout=5.0, backlog=32, inbox=1024, plugins=None, clock=time.perf_counter):
+        """`plugins`: [(name, load)] to use instead of discover() (None = discover)"""
+        self.workers = workers
+        self.timeout = timeout
+        self.backlog = backlog
+        self.inbox = inbox
+        self.clock = clock
+        self.emitted = 0
+        # Events turned away because the dispatcher couldn't keep up
+        self.dropped = 0
+        self.plugins = []
+        self._plugin_sources = plugins
+        self._plugins_loaded = False
+        self._handlers = {}
+        self._inbox = collections.deque()
+        self._dispatching = False
+        self._jobs = queue.SimpleQueue()
+        self._threads = []
+        self._idle_threads = 0
+        self._queued = 0
+        self._active = 0
+        self._stuck = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        # Wakes the watchdog when a handler starts running (or the bus closes)
+        self._watch = threading.Condition(self._lock)
+        self._watchdog = None
+        self._closed = False
+
+    # ----- API -----
+
+    def subscribe(self, event, fn, timeout=None, name=None):
+        if event != "*" and event not in EVENTS:
+            raise ValueError(f"unknown event {event!r} (expected one of {', '.join(EVENTS)} or *)")
+        handler = Handler(
+            event, fn, self.timeout if timeout is None else timeout,
+            name or f"{getattr(fn, '__module__', '?')}.{getattr(fn, '__qualname__', repr(fn))}"
+        )
+        with self._lock:
+            self._handlers.setdefault(event, []).append(handler)
+        return handler
+
+    def emit(self, event, **payload):
+        """Queue an event for its handlers and return straight away"""
+        payload["event"] = event
+        payload["time"] = time.time()
+        with self._lock:
+            self.emitted += 1
+            # Before queuing work: a hung handler frees up room for another worker
+            self._check_timeouts()
+            if len(self._inbox) >= self.inbox:
+                self.dropped += 1
+                return
+            self._inbox.append(payload)
+            if not self._dispatching:
+                self._dispatching = True
+                self._submit(self._dispatch)
+
+    def load_plugins(self):
+        """Import every plugin and let it subscribe (once; normally on a worker, see emit)"""
+        if self._plugins_loaded:
+            return
+        self._plugins_loaded = True
+        sources = discover() if self._plugin_sources is None else self._plugin_sources
+        for name, load in sources:
+            try:
+                load()(self)
+                self.plugins.append(name)
+            except Exception as e:
+                print(f"Error loading plugin {name}: {e}")
+
+    def metrics(self):
+        with self._lock:
+            handlers = [h for hs in self._handlers.values() for h in hs]
+            return {
+                "emitted": self.emitted,
+                "dropped": self.dropped,
+                "plugins": list(self.plugins),
+                "workers": len(self._threads),
+                "handlers": {f"{h.event}/{h.name}": h.report() for h in handlers},
+            }
+
+    def wait(self, timeout=None):
+        """Block until every queued event has been handled (for tests and benchmarks)"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._active == 0, timeout)
+
+    def close(self, timeout=1.0):
+        """Give queued events a moment to go out, then let the workers go"""
+        self.wait(timeout)
+        with self._lock:
+            self._closed = True
+            self._watch.notify_all()
+            for _ in self._threads:
+                self._jobs.put(None)
+            self._threads = []
+
+    # ----- workers -----
+
+    def _submit(self, job):
+        # Called with the lock held
+        self._active += 1
+        self._queued += 1
+        self._jobs.put(job)
+        self._grow()
+
+    def _grow(self):
+        # Called with the lock held: a worker for every queued job no idle worker can take
+        if self._queued > self._idle_threads and len(self._threads) < self.workers + self._stuck:
+            thread = threading.Thread(target=self._run, name=f"events-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _run(self):
+        me = threading.current_thread()
+        while True:
+            with self._lock:
+                if me in self._threads and len(self._threads) > self.workers + self._stuck:
+                    # A hung handler came back: its stand-in isn't needed any more
+                    self._threads.remove(me)
+                    return
+                # Idle means waiting in get(), not merely between jobs
+                self._idle_threads += 1
+            job = self._jobs.get()
+            with self._lock:
+                self._idle_threads -= 1
+                if job is not None:
+                    self._queued -= 1
+            if job is None:
+                return
+            try:
+                job()
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    if self._active == 0:
+                        self._idle.notify_all()
+
+    def _dispatch(self):
+        """Hand queued events to their handlers, in order (only one of these runs at a time)"""
+        self.load_plugins()
+        with self._lock:
+            while self._inbox:
+                payload = self._inbox.popleft()
+                event = payload["event"]
+                for handler in self._handlers.get(event, []) + self._handlers.get("*", []):
+                    self._deliver(handler, payload)
+            self._dispatching = False
+
+    def _watch_timeouts(self):
+        """Watchdog: check each running handler when its timeout runs out"""
+        with self._lock:
+            while not self._closed:
+                now = self.clock()
+                due = [
+                    handler.running_since + handler.timeout
+                    for handlers in self._handlers.values() for handler in handlers
+                    if handler.running_since is not None and not handler.timed_out
+                ]
+                if due:
+                    self._watch.wait(max(0.0, min(due) - now) + 0.001)
+                    self._check_timeouts()
+                else:
+                    self._watch.wait()
+
+    def _check_timeouts(self):
+        # Called with the lock held
+        now = self.clock()
+        for handlers in self._handlers.values():
+            for handler in handlers:
+                if handler.timed_out or handler.running_since is None:
+                    continue
+                if now - handler.running_since > handler.timeout:
+                    handler.timed_out = True
+                    handler.timeouts += 1
+                    self._stuck += 1
+                    print(f"Event handler {handler.name} is over its {handler.timeout:g}s timeout; skipping it until it returns")
+                    self._grow()
+
+    def _deliver(self, handler, payload):
+        # Called with the lock held
+        if handler.timed_out:
+            handler.dropped += 1
+            return
+        if len(handler.pending) >= self.backlog:
+            handler.dropped += 1
+            return
+        handler.pending.append(payload)
+        if not handler.scheduled:
+            handler.scheduled = True
+            self._submit(lambda: self._drain(handler))
+
+    def _drain(self, handler):
+        while True:
+            with self._lock:
+                if not handler.pending:
+                    handler.scheduled = False
+                    return
+                payload = handler.pending.popleft()
+                begin = handler.running_since = self.clock()
+                if self._watchdog is None:
+                    self._watchdog = threading.Thread(target=self._watch_timeouts, name="events-watchdog", daemon=True)
+                    self._watchdog.start()
+                self._watch.notify()
+            try:
+                handler.fn(dict(payload))
+                failed = False
+            except Exception as e:
+                failed = True
+                print(f"Error in event handler {handler.name} ({payload['event']}): {e}")
+            elapsed = self.clock() - begin
+            with self._lock:
+                handler.running_since = None
+                handler.calls += 1
+                handler.errors += failed
+                handler.latencies.append(elapsed)
+                if handler.timed_out:
+                    handler.timed_out = False
+                    self._stuck -= 1
+                elif elapsed > handler.timeout:
+                    handler.timeouts += 1
@@ -0,0 +1,330 @@
+import bisect
+import csv
+import itertools
+import os
+import threading
+from contextlib import contextmanager
+
+from storage import atomic_write, file_lock
+
+
+def normalise(goal):
+    """Key used for de-duplication and search: trimmed, single-spaced, case-folded"""
+    return " ".join(goal.split()).casefold()
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _build_trigrams(keys):
+    trigrams = {}
+    for key in keys:
+        for gram in _trigrams(key):
+            found = trigrams.get(gram)
+            if found is None:
+                trigrams[gram] = {key}
+            else:
+                found.add(key)
+    return trigrams
+
+
+class GoalLibrary:
+    """Unbounded set of saved goals with prefix and fuzzy search
+
+    Goals are de-duplicated by their normalised key (a hash lookup), remembered in
+    most-recently-used order, and indexed two ways: a sorted key list for prefix
+    matches (bisect, O(log n)) and a trigram index for typo-tolerant matches. The
+    trigram index is only built the first time a fuzzy search needs it.
+
+    On disk it's a plain text file, one goal per line, oldest first. Adding or using a
+    goal appends a line; a later line for the same goal just moves it to the front.
+    The file is compacted when deletes happen or when it holds too many stale lines.
+    The desktop app and terminal mode share it: every write holds a lock file and first
+    catches up with lines another process wrote, so a compaction never drops them.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._goals = {}        # key -> display text, in least-recently-used order
+        self._sorted_keys = []  # for prefix search
+        self._trigrams = None   # trigram -> set of keys (built lazily)
+        # Bumped whenever the set of keys changes, so an index built in the background
+        # for an older set is thrown away instead of used
+        self._generation = 0
+        self._built = None
+        self._file_lines = 0
+        # (inode, size) of the file as of our last read or write
+        self._file_stamp = None
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self):
+        return len(self._goals)
+
+    def __contains__(self, goal):
+        return normalise(goal) in self._goals
+
+    def recent(self, limit=None):
+        """Goals, most recently used first"""
+        goals = []
+        for goal in reversed(self._goals.values()):
+            if limit is not None and len(goals) >= limit:
+                break
+            goals.append(goal)
+        return goals
+
+    # ----- changes -----
+
+    def add(self, goal):
+        """Add a goal (or mark an existing one as just used); returns True if it was new"""
+        with self._file_locked():
+            new = normalise(goal) not in self._goals
+            key = self._insert(goal)
+            if key is None:
+                return False
+            self._append_lines([goal])
+        return new
+
+    def remove(self, goal):
+        return self.remove_many([goal]) == 1
+
+    def remove_many(self, goals):
+        """Delete several goals with a single rewrite of the file"""
+        with self._file_locked():
+            return self._remove_keys(list(map(normalise, goals)))
+
+    def _remove_keys(self, wanted):
+        removed = [key for key in wanted if self._goals.pop(key, None) is not None]
+        if not removed:
+            return 0
+        self._generation += 1
+        if len(removed) > 64:
+            # Bulk delete: one filtering pass instead of a list deletion per goal
+            self._sorted_keys = [key for key in self._sorted_keys if key in self._goals]
+            self._trigrams = None
+        else:
+            for key in removed:
+                index = bisect.bisect_left(self._sorted_keys, key)
+                del self._sorted_keys[index]
+                if self._trigrams is not None:
+                    for gram in _trigrams(key):
+                        keys = self._trigrams.get(gram)
+                        keys.discard(key)
+                        if not keys:
+                            del self._trigrams[gram]
+        self._persist_removed(removed)
+        return len(removed)
+
+    def import_lines(self, lines):
+        """Add goals from an iterable of strings; returns (added, duplicates)"""
+        with self._file_locked():
+            return self._import_lines(lines)
+
+    def _import_lines(self, lines):
+        added = duplicates = 0
+        new_goals = []
+        for line in lines:
+            goal = " ".join(line.split())
+            if not goal:
+                continue
+            if normalise(goal) in self._goals:
+                duplicates += 1
+                continue
+            self._insert(goal, index=False)
+            new_goals.append(goal)
+            added += 1
+        if new_goals:
+            self._reindex()
+        self._append_lines(new_goals)
+        return added, duplicates
+
+    def import_file(self, path):
+        """Stream goals in from a .txt (one per line) or .csv (first column) file"""
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            if path.lower().endswith(".csv"):
+                rows = (row[0] for row in csv.reader(f) if row)
+                return self.import_lines(rows)
+            return self.import_lines(f)
+
+    def _insert(self, goal, index=True):
+        """Add to the dict; index=False leaves the indexes to a later _reindex()"""
+        goal = " ".join(goal.split())
+        key = normalise(goal)
+        if not key:
+            return None
+        if key in self._goals:
+            # Move to the most recently used end, keeping the first spelling
+            self._goals[key] = self._goals.pop(key)
+            return key
+        self._goals[key] = goal
+        self._generation += 1
+        if index:
+            bisect.insort(self._sorted_keys, key)
+            if self._trigrams is not None:
+                for gram in _trigrams(key):
+                    self._trigrams.setdefault(gram, set()).add(key)
+        return key
+
+    def _reindex(self):
+        """Rebuild the indexes in one go after a bulk load"""
+        self._sorted_keys = sorted(self._goals)
+        self._trigrams = None
+        self._generation += 1
+
+    def warm(self, background=False):
+        """Build the fuzzy index ahead of time
+
+        background=True builds it on a thread (seconds at 100k goals), so the first
+        fuzzy search doesn't have to; it's picked up if no goal was added or removed
+        in the meantime.
+        """
+        if self._trigrams is not None:
+            return
+        if not background:
+            self._trigram_index()
+            return
+        keys = list(self._goals)
+        generation = self._generation
+
+        def build():
+            self._built = (generation, _build_trigrams(keys))
+        threading.Thread(target=build, name="goal-index", daemon=True).start()
+
+    def _trigram_index(self):
+        if self._trigrams is None:
+            built, self._built = self._built, None
+            if built is not None and built[0] == self._generation:
+                self._trigrams = built[1]
+            else:
+                self._trigrams = _build_trigrams(self._goals)
+        return self._trigrams
+
+    # ----- search -----
+
+    def search(self, text, limit=15):
+        """Goals matching what's been typed: prefix matches first, then fuzzy ones"""
+        query = normalise(text)
+        if not query:
+            return self.recent(limit)
+
+        results = []
+        seen = set()
+        keys = self._sorted_keys
+        index = bisect.bisect_left(keys, query)
+        while index < len(keys) and len(results) < limit and keys[index].startswith(query):
+            seen.add(keys[index])
+            results.append(self._goals[keys[index]])
+            index += 1
+
+        if len(results) < limit and len(query) >= 2:
+            for key in self._fuzzy_keys(query, limit * 4):
+                if key not in seen:
+                    results.append(self._goals[key])
+                    if len(results) >= limit:
+                        break
+        return results
+
+    def _fuzzy_keys(self, query, limit, max_candidates=2000):
+        """Keys sharing the most trigrams with the query"""
+        index = self._trigram_index()
+        grams = _trigrams(query)
+        postings = sorted((index.get(gram, ()) for gram in grams), key=len)
+        postings = [keys for keys in postings if keys]
+        if not postings:
+            return []
+        # Gather candidates from the rarest trigrams first, and never more than
+        # max_candidates of them, to bound the work at 100k+ goals
+        candidates = set()
+        for keys in postings:
+            room = max_candidates - len(candidates)
+            if room <= 0:
+                break
+            candidates.update(itertools.islice(keys, room))
+        scored = []
+        for key in candidates:
+            score = sum(1 for keys in postings if key in keys)
+            scored.append((-score / len(grams), len(key), key))
+        scored.sort()
+        # Ignore candidates that only share a small part of the query
+        return [key for score, _, key in scored[:limit] if -score >= 0.5]
+
+    # ----- persistence -----
+
+    def save(self):
+        """Rewrite the file compactly (oldest first, so reading restores recency)"""
+        if not self.path:
+            return
+        with self._file_locked():
+            self._rewrite()
+
+    def _rewrite(self):
+        goals = list(self._goals.values())
+        atomic_write(self.path, lambda f: f.writelines(goal + "\n" for goal in goals))
+        self._file_lines = len(goals)
+        self._stamp(os.stat(self.path))
+
+    @contextmanager
+    def _file_locked(self):
+        """Hold the lock file and catch up with the goal file before changing it"""
+        if not self.path:
+            yield
+            return
+        with file_lock(self.path + ".lock"):
+            self._catch_up()
+            yield
+
+    def _catch_up(self):
+        """Take in lines another process wrote since our last read or write"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        stamp = self._file_stamp
+        if stamp is not None and stamp[0] == st.st_ino and stamp[1] <= st.st_size:
+            if stamp[1] == st.st_size:
+                return
+            # Only appended to: read just the new lines
+            with open(self.path, "rb") as f:
+                f.seek(stamp[1])
+                for line in f:
+                    self._file_lines += 1
+                    self._insert(line.decode("utf-8"))
+                self._stamp(os.fstat(f.fileno()), f.tell())
+        else:
+            # Rewritten (compacted) by the other process: the file is the whole truth,
+            # and everything this process added is already in it
+            self._goals = {}
+            self._file_lines = 0
+            self._load()
+
+    def _stamp(self, st, size=None):
+        self._file_stamp = (st.st_ino, st.st_size if size is None else size)
+
+    def _persist_removed(self, keys):
+        # A plain text file can't drop lines in place: rewrite it
+        if self.path:
+            self._rewrite()
+
+    def _append_lines(self, goals):
+        if not self.path or not goals:
+            return
+        # Too many stale lines from re-used goals: compact instead of appending
+        if self._file_lines + len(goals) > 2 * len(self._goals) + 100:
+            self._rewrite()
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(goal + "\n" for goal in goals)
+            f.flush()
+            self._stamp(os.fstat(f.fileno()))
+        self._file_lines += len(goals)
+
+    def _load(self):
+        with open(self.path, "rb") as f:
+            for line in f:
+                self._file_lines += 1
+                self._insert(line.decode("utf-8"), index=False)
+            # Up to what was read, in case the other process is appending right now
+            self._stamp(os.fstat(f.fileno()), f.tell())
+        self._reindex()
@@ -0,0 +1,214 @@
+import gzip
+import json
+import os
+
+from storage import atomic_write_json, file_lock
+
+
+class SessionLog:
+    """Append-only log of finished and abandoned sessions
+
+    Records are compact JSON lines written to numbered segment files. Once a segment
+    grows past `segment_bytes` it is gzipped and a new one is started. index.json keeps
+    the earliest/latest start time of every segment, so a date-range query only opens
+    the segments that can contain matching sessions.
+
+    The desktop app and terminal mode may append to the same folder at once: appends
+    hold a lock file and start from the index on disk, and reads pick up whatever
+    another process has appended since.
+    """
+
+    INDEX_NAME = "index.json"
+    LOCK_NAME = ".lock"
+
+    def __init__(self, directory, segment_bytes=256 * 1024):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, self.INDEX_NAME)
+        self.lock_path = os.path.join(directory, self.LOCK_NAME)
+        self._index_stamp = None
+        self.segments = self._load_index()
+
+    # ----- writing -----
+
+    def append(self, record):
+        """Add one session record (a dict with at least a numeric "start")"""
+        line = json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+        with file_lock(self.lock_path):
+            # Another process may have appended (or rotated) since we last looked
+            self.segments = self._load_index()
+            self._append_locked(record, line)
+
+    def _append_locked(self, record, line):
+        segment = self._active_segment()
+        path = self._path(segment)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            segment["bytes"] = f.tell()
+
+        start = record["start"]
+        if segment["count"] == 0:
+            segment["first"] = segment["last"] = start
+        else:
+            segment["first"] = min(segment["first"], start)
+            segment["last"] = max(segment["last"], start)
+        segment["count"] += 1
+
+        if segment["bytes"] >= self.segment_bytes:
+            self._rotate(segment)
+        self._save_index()
+
+    def _active_segment(self):
+        if self.segments and not self.segments[-1]["compressed"]:
+            return self.segments[-1]
+        number = self.segments[-1]["number"] + 1 if self.segments else 1
+        segment = {"number": number, "compressed": False, "first": None, "last": None, "count": 0, "bytes": 0}
+        self.segments.append(segment)
+        return segment
+
+    def _rotate(self, segment):
+        """Compress a full segment; the next append starts a new one"""
+        plain = self._path(segment)
+        segment["compressed"] = True
+        with open(plain, "rb") as src, gzip.open(self._path(segment), "wb") as dst:
+            dst.write(src.read())
+        # The index is saved right after, so a crash in between only leaves a stray file
+        os.unlink(plain)
+
+    # ----- reading -----
+
+    def records(self, since=None, until=None):
+        """Yield records whose start is in [since, until), in the order they were logged
+
+        since/until are Unix timestamps (or None for open-ended ranges). Sessions are
+        logged as they end, and two processes can log overlapping ones, so segments
+        aren't strictly in start order: each is checked against its own earliest and
+        latest start instead of stopping at the first one past the range.
+        """
+        self.refresh()
+        for segment in self.segments:
+            if not segment["count"]:
+                continue
+            if since is not None and segment["last"] < since:
+                continue
+            if until is not None and segment["first"] >= until:
+                continue
+            for record in self._read_segment(segment):
+                start = record["start"]
+                if (since is None or start >= since) and (until is None or start < until):
+                    yield record
+
+    def after(self, skip):
+        """Yield every record after the first `skip`, without opening skipped segments"""
+        self.refresh()
+        for segment in self.segments:
+            if skip >= segment["count"]:
+                skip -= segment["count"]
+                continue
+            for record in self._read_segment(segment):
+                if skip:
+                    skip -= 1
+                    continue
+                yield record
+
+    def __iter__(self):
+        return self.records()
+
+    def __len__(self):
+        self.refresh()
+        return sum(segment["count"] for segment in self.segments)
+
+    def refresh(self):
+        """Reload the index if another process has saved it since (one stat() otherwise)"""
+        if self._stamp() != self._index_stamp:
+            self.segments = self._load_index()
+
+    def _read_segment(self, segment):
+        path = self._path(segment)
+        opener = gzip.open if segment["compressed"] else open
+        try:
+            with opener(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # A torn last line from a crash; skip it
+                        continue
+        except FileNotFoundError:
+            return
+
+    # ----- index -----
+
+    def _path(self, segment):
+        suffix = ".jsonl.gz" if segment["compressed"] else ".jsonl"
+        return os.path.join(self.directory, "sessions-%06d%s" % (segment["number"], suffix))
+
+    def _save_index(self):
+        atomic_write_json(self.index_path, {"version": 1, "segments": self.segments})
+        self._index_stamp = self._stamp()
+
+    def _stamp(self):
+        try:
+            st = os.stat(self.index_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _load_index(self):
+        self._index_stamp = self._stamp()
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                segments = json.load(f)["segments"]
+        except (OSError, ValueError, KeyError):
+            return self._rebuild_index()
+
+        # The active segment may have been appended to after the index was last saved
+        if segments and not segments[-1]["compressed"]:
+            active = segments[-1]
+            try:
+                size = os.path.getsize(self._path(active))
+            except OSError:
+                size = 0
+            if size != active["bytes"]:
+                segments[-1] = self._scan_segment(active["number"], compressed=False)
+        return segments
+
+    def _rebuild_index(self):
+        """Recreate index.json by scanning the segment files"""
+        found = {}
+        for name in os.listdir(self.directory):
+            if not name.startswith("sessions-"):
+                continue
+            number_part, _, rest = name[len("sessions-"):].partition(".")
+            if not number_part.isdigit():
+                continue
+            compressed = rest == "jsonl.gz"
+            number = int(number_part)
+            # Prefer the compressed copy if a crash left both around
+            if compressed or number not in found:
+                found[number] = compressed
+        segments = [self._scan_segment(number, found[number]) for number in sorted(found)]
+        if segments:
+            self.segments = segments
+            self._save_index()
+        return segments
+
+    def _scan_segment(self, number, compressed):
+        segment = {"number": number, "compressed": compressed, "first": None, "last": None, "count": 0, "bytes": 0}
+        for record in self._read_segment(segment):
+            start = record["start"]
+            segment["first"] = start if segment["first"] is None else min(segment["first"], start)
+            segment["last"] = start if segment["last"] is None else max(segment["last"], start)
+            segment["count"] += 1
+        if not compressed:
+            try:
+                segment["bytes"] = os.path.getsize(self._path(segment))
+            except OSError:
+                pass
+        return segment
@@ -0,0 +1,25 @@
+"""PDA-friendly encouragement, shared by the Tk app and the terminal mode"""
+
+START_MESSAGES = (
+    "you're doing great",
+    "take your time",
+    "no pressure, just vibes",
+    "one step at a time",
+    "you've got this if you want",
+)
+
+BREAK_MESSAGES = (
+    "it's okay to pause",
+    "you're allowed to rest",
+    "breathe and reset 💜",
+    "gentle break time",
+    "rest is productive too",
+)
+
+END_MESSAGES = (
+    "working at your own pace",
+    "being here is enough",
+    "you did well ✨",
+    "that was great!",
+    "proud of you 💜",
+)
@@ -0,0 +1,311 @@
+"""Terminal mode: the same gentle work/break cycle on one line that redraws in place
+
+For tmux and remote boxes with no display. It never imports tkinter. The event loop
+is one asyncio task that sleeps until the next second boundary or a keypress,
+whichever comes first.
+
+    python src/pda_cli.py --goal "write report"
+    python src/pda_cli.py --work 50 --break 10 --auto --sessions 4
+
+Keys: space/p pause or resume, s skip to the next session, r reset, q quit.
+Settings, goals and history are shared with the desktop app (same files, same folder).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+from contextlib import contextmanager, nullcontext
+
+from messages import BREAK_MESSAGES, END_MESSAGES, START_MESSAGES
+from storage import GOALS_FILE, HISTORY_DIR, SETTINGS_FILE, STATS_FILE, open_store
+from timer_engine import PomodoroEngine
+
+
+def load_settings(store=None, path=SETTINGS_FILE):
+    if store is not None:
+        return store.load_settings()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class RawTerminal:
+    """Single keypresses without echo (cbreak mode) while active, restored afterwards"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.saved = None
+
+    def __enter__(self):
+        import termios
+        import tty
+        fd = self.stream.fileno()
+        self.saved = termios.tcgetattr(fd)
+        tty.setcbreak(fd)
+        return self
+
+    def __exit__(self, *exc):
+        import termios
+        termios.tcsetattr(self.stream.fileno(), termios.TCSADRAIN, self.saved)
+
+    @contextmanager
+    def cooked(self):
+        """Normal line editing for a moment (e.g. around input())"""
+        import tty
+        self.__exit__()
+        try:
+            yield
+        finally:
+            tty.setcbreak(self.stream.fileno())
+
+
+class TerminalTimer:
+    def __init__(self, engine, terminal=None, record=True, sessions=None, goal=None, out=sys.stdout, store=None):
+        self.engine = engine
+        self.store = store
+        self.terminal = terminal
+        self.keys_enabled = terminal is not None
+        self.record = record
+        self.sessions = sessions
+        self.default_goal = goal
+        self.last_goal = goal or ""
+        self.out = out
+        self.completed = 0
+        self.message = ""
+        self.keys = None
+        self._history = None
+        self._stats = None
+        self._goal_library = None
+
+    # ----- shared state (loaded only when a session needs it) -----
+
+    @property
+    def goal_library(self):
+        if self._goal_library is None:
+            if self.store is not None:
+                from sqlite_store import SQLiteGoalLibrary
+                self._goal_library = SQLiteGoalLibrary(self.store)
+            else:
+                from goals import GoalLibrary
+                self._goal_library = GoalLibrary(GOALS_FILE)
+        return self._goal_library
+
+    def log_session(self, completed):
+        """Append the current session to the shared history (if it was ever started)"""
+        record = self.engine.session_record(completed)
+        if record is None or not self.record:
+            return
+        try:
+            if self._history is None:
+                from stats import StatsRollup
+                if self.store is not None:
+                    from sqlite_store import SQLiteSessionLog
+                    self._history = SQLiteSessionLog(self.store)
+                else:
+                    from history import SessionLog
+                    self._history = SessionLog(HISTORY_DIR)
+                self._stats = StatsRollup(STATS_FILE)
+            self._history.append(record)
+            # Picks up sessions the desktop app logged meanwhile, then this one
+            self._stats.sync(self._history)
+        except Exception as e:
+            self.print_line(f"Error writing session history: {e}")
+
+    # ----- output -----
+
+    def status_line(self):
+        countdown = self.engine.countdown
+        left = countdown.seconds_left()
+        fraction = countdown.remaining() / max(1, self.engine.session_length)
+        filled = round(fraction * 10)
+        kind = "work " if self.engine.is_work_session else "break"
+        paused = "" if self.engine.is_running else "  (paused)"
+        goal = f"  📌 {self.engine.goal}" if self.engine.goal else ""
+        message = f"  · {self.message}" if self.message else ""
+        return f"⏳ {kind} {left // 60:02d}:{left % 60:02d} [{'▓' * filled}{'░' * (10 - filled)}]{paused}{goal}{message}"
+
+    def draw(self):
+        # Leave a little room for double-width emoji
+        width = shutil.get_terminal_size().columns - 2
+        self.out.write("\r\x1b[2K" + self.status_line()[:width])
+        self.out.flush()
+
+    def print_line(self, text):
+        """A line that stays in the scrollback, above the live status line"""
+        self.out.write("\r\x1b[2K" + text + "\n")
+        self.out.flush()
+
+    # ----- actions -----
+
+    def ask_for_goal(self):
+        """Prompt for the work session's goal (blocking: nothing is running meanwhile)"""
+        recent = self.goal_library.recent(5)
+        self.out.write("\r\x1b[2K")
+        for number, goal in enumerate(recent, 1):
+            self.out.write(f"  {number}. {goal}\n")
+        loop = asyncio.get_running_loop()
+        loop.remove_reader(sys.stdin.fileno())
+        try:
+            answer = input("What's this session for? (number, text, or Enter to skip) ").strip()
+        except EOFError:
+            answer = ""
+        finally:
+            loop.add_reader(sys.stdin.fileno(), self.on_key)
+        if answer.isdigit() and 1 <= int(answer) <= len(recent):
+            answer = recent[int(answer) - 1]
+        if answer:
+            self.goal_library.add(answer)
+        return answer
+
+    def start(self):
+        goal = None
+        if self.engine.is_work_session and self.engine.started_at is None:
+            if self.default_goal is not None:
+                goal = self.default_goal
+            elif self.keys_enabled:
+                with self.terminal.cooked():
+                    goal = self.ask_for_goal()
+            self.last_goal = goal or ""
+        self.engine.start(goal)
+        messages = START_MESSAGES if self.engine.is_work_session else BREAK_MESSAGES
+        self.message = random.choice(messages)
+
+    def toggle(self):
+        if self.engine.is_running:
+            self.engine.pause()
+        else:
+            self.start()
+
+    def skip(self):
+        self.log_session(completed=False)
+        self.engine.switch_session()
+        if self.engine.is_running:
+            self.message = random.choice(START_MESSAGES if self.engine.is_work_session else BREAK_MESSAGES)
+        else:
+            self.message = "press space when you feel like it"
+
+    def reset(self):
+        self.log_session(completed=False)
+        self.engine.reset()
+        self.message = "fresh start, no rush"
+
+    def finished(self):
+        """The countdown hit zero: log it, chime, and move on to the other session"""
+        goal = self.engine.goal
+        self.log_session(completed=True)
+        was_work = self.engine.advance()
+        if load_settings(self.store).get("sound_enabled", True):
+            self.out.write("\a")
+        kind = "work" if was_work else "break"
+        self.print_line(f"✓ {kind} done{f'  📌 {goal}' if goal else ''}  · {random.choice(END_MESSAGES)}")
+        if was_work:
+            self.completed += 1
+        if self.engine.is_running:
+            # Auto-continue: the last goal carries over to the next work session
+            if self.engine.is_work_session:
+                self.engine.goal = self.last_goal
+            self.message = random.choice(START_MESSAGES if self.engine.is_work_session else BREAK_MESSAGES)
+        else:
+            self.message = "press space when you feel like it"
+
+    def on_key(self):
+        key = os.read(sys.stdin.fileno(), 32).decode("utf-8", "ignore")
+        if not key:
+            # stdin closed: stop listening, keep the timer going
+            asyncio.get_running_loop().remove_reader(sys.stdin.fileno())
+            self.keys_enabled = False
+            return
+        for char in key:
+            self.keys.put_nowait(char.lower())
+
+    # ----- event loop -----
+
+    async def run(self):
+        self.keys = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        if self.keys_enabled:
+            loop.add_reader(sys.stdin.fileno(), self.on_key)
+        try:
+            self.start()
+            while True:
+                countdown = self.engine.countdown
+                if self.engine.is_running:
+                    countdown.check_clock_jump()
+                    if countdown.finished():
+                        self.finished()
+                        if self.sessions is not None and self.completed >= self.sessions:
+                            # Done; don't log the break that just auto-started as abandoned
+                            self.engine.reset()
+                            break
+                        if not self.engine.is_running and not self.keys_enabled:
+                            # Nobody can press a key to carry on
+                            break
+                        continue
+                self.draw()
+                timeout = countdown.next_wake_ms() / 1000 if self.engine.is_running else None
+                try:
+                    key = await asyncio.wait_for(self.keys.get(), timeout)
+                except asyncio.TimeoutError:
+                    continue
+                if key in (" ", "p", "\n"):
+                    self.toggle()
+                elif key == "s":
+                    self.skip()
+                elif key == "r":
+                    self.reset()
+                elif key == "q":
+                    break
+        finally:
+            if self.keys_enabled:
+                loop.remove_reader(sys.stdin.fileno())
+            # Quitting part-way still counts as an (abandoned) session
+            self.log_session(completed=False)
+            self.out.write("\r\x1b[2K")
+            self.out.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="A gentle, low-pressure Pomodoro timer for the terminal")
+    parser.add_argument("--work", type=float, help="work minutes (default: from settings, or 25)")
+    parser.add_argument("--break", dest="break_minutes", type=float, help="break minutes (default: from settings, or 5)")
+    parser.add_argument("--goal", help="goal for the work sessions (otherwise you're asked)")
+    parser.add_argument("--auto", action="store_true", help="roll straight into the next session")
+    parser.add_argument("--sessions", type=int, help="stop after this many work sessions")
+    parser.add_argument("--no-history", action="store_true", help="don't log sessions to the history")
+    parser.add_argument("--store", choices=["json", "sqlite"], help="where settings, goals and history live")
+    args = parser.parse_args(argv)
+
+    store = open_store(args.store)
+    settings = load_settings(store)
+    work = args.work if args.work is not None else settings.get("work_minutes", 25)
+    rest = args.break_minutes if args.break_minutes is not None else settings.get("break_minutes", 5)
+
+    # Keys need a POSIX tty; without one, sessions just follow each other
+    keys = sys.stdin.isatty() and os.name == "posix"
+    engine = PomodoroEngine(round(work * 60), round(rest * 60), auto_continue=args.auto or not keys)
+
+    # Ctrl-C can come before the timer exists (while the terminal is being set up)
+    timer = None
+    try:
+        with (RawTerminal(sys.stdin) if keys else nullcontext()) as terminal:
+            timer = TerminalTimer(
+                engine, terminal, record=not args.no_history, sessions=args.sessions, goal=args.goal, store=store
+            )
+            asyncio.run(timer.run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if store is not None:
+            store.close()
+    completed = timer.completed if timer is not None else 0
+    plural = "s" if completed != 1 else ""
+    print(f"{completed} work session{plural} this time · being here is enough 💜")
+
+
+if __name__ == "__main__":
+    main()
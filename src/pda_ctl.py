@@ -0,0 +1,38 @@
+"""Control the running desktop timer from scripts and window-manager keybindings
+
+    python src/pda_ctl.py start "write report"
+    python src/pda_ctl.py pause
+    python src/pda_ctl.py status --json
+
+Only talks to the control socket (see control.py), so it returns in a few
+milliseconds. Exits 1 when the timer isn't running or the command failed.
+"""
+import argparse
+import json
+import sys
+
+import control
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Send a command to the running Dreamy Timer")
+    parser.add_argument("command", choices=control.COMMANDS)
+    parser.add_argument("goal", nargs="?", help="goal for start")
+    parser.add_argument("--json", action="store_true", help="print the raw reply")
+    parser.add_argument("--socket", metavar="PATH", help="control socket (default: the per-user one)")
+    args = parser.parse_args(argv)
+
+    if not control.available():
+        sys.exit("The control socket needs a Unix-like system")
+    try:
+        reply = control.send(args.command, args.goal, path=args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        sys.exit("Dreamy Timer isn't running")
+    except OSError as e:
+        sys.exit(f"Couldn't reach Dreamy Timer: {e}")
+    print(json.dumps(reply) if args.json else control.describe(reply))
+    return 0 if reply.get("ok") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""Export session history to CSV, JSON Lines or iCalendar, for time trackers and calendars
+
+    python src/pda_export.py csv -o focus.csv
+    python src/pda_export.py ics --from 2026-01-01 --to 2026-03-31 --type work -o q1.ics
+    python src/pda_export.py jsonl --since-last --name tracker >> tracker.jsonl
+
+Records stream from the history (the log segments or the SQLite store) through a
+generator per format straight to the output, one line at a time. Memory stays flat
+however long the history is.
+
+--since-last only exports sessions added since the previous --since-last run with
+the same --name. Each position belongs to one set of --from/--to/--type filters, so
+sessions a filter left out are still there for an export without it. The default
+name is the format plus the filters (e.g. "csv type=work"). The position is saved in
+pomodoro_history/exports.json once the export has been written out completely.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from storage import HISTORY_DIR, atomic_write_json, open_store
+
+EXPORTS_FILE = os.path.join(HISTORY_DIR, "exports.json")
+CSV_COLUMNS = ("start", "end", "type", "goal", "focus_minutes", "pauses", "completed")
+
+
+def local_iso(timestamp):
+    return datetime.fromtimestamp(timestamp).astimezone().isoformat(timespec="seconds")
+
+
+# ----- formats (each a generator of text chunks) -----
+
+class _LastLine:
+    """File-like target that keeps only the last thing written (csv.writer writes a row at a time)"""
+
+    def write(self, text):
+        self.text = text
+
+
+def csv_lines(records):
+    line = _LastLine()
+    writer = csv.writer(line, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    yield line.text
+    for record in records:
+        writer.writerow((
+            local_iso(record["start"]),
+            local_iso(record["end"]),
+            record.get("type", ""),
+            record.get("goal", ""),
+            round(record.get("focus", record["end"] - record["start"]) / 60, 1),
+            record.get("pauses", 0),
+            "yes" if record.get("completed") else "no",
+        ))
+        yield line.text
+
+
+def jsonl_lines(records):
+    for record in records:
+        yield json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+def ics_text(text):
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def ics_fold(line):
+    """Content lines are at most 75 octets; longer ones continue after CRLF + space"""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts = []
+    limit = 75
+    while data:
+        cut = min(limit, len(data))
+        # Don't split a UTF-8 sequence
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+        limit = 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def ics_time(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def ics_lines(records):
+    yield "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//pda-pomodoro//session export//EN\r\nCALSCALE:GREGORIAN\r\n"
+    stamp = ics_time(time.time())
+    for record in records:
+        kind = record.get("type", "work")
+        goal = record.get("goal") or ""
+        summary = f"🍅 {goal}" if goal else ("🍅 Focus" if kind == "work" else "☕ Break")
+        focus = round(record.get("focus", record["end"] - record["start"]) / 60, 1)
+        status = "completed" if record.get("completed") else "stopped early"
+        description = f"{kind}, {focus} min focused, {record.get('pauses', 0)} pauses, {status}"
+        yield "BEGIN:VEVENT\r\n"
+        # Stable UIDs, so importing an overlapping export updates events instead of duplicating them
+        yield f"UID:{record['start']:.3f}-{kind}@pda-pomodoro\r\n"
+        yield f"DTSTAMP:{stamp}\r\n"
+        yield f"DTSTART:{ics_time(record['start'])}\r\n"
+        yield f"DTEND:{ics_time(record['end'])}\r\n"
+        yield ics_fold(f"SUMMARY:{ics_text(summary)}")
+        yield ics_fold(f"DESCRIPTION:{ics_text(description)}")
+        yield f"CATEGORIES:{kind.upper()}\r\n"
+        yield "TRANSP:TRANSPARENT\r\nEND:VEVENT\r\n"
+    yield "END:VCALENDAR\r\n"
+
+
+FORMATS = {"csv": csv_lines, "jsonl": jsonl_lines, "ics": ics_lines}
+
+
+# ----- selecting records -----
+
+def day_start(day):
+    """Unix time of local midnight at the start of a date"""
+    return datetime.combine(day, datetime.min.time()).timestamp()
+
+
+def within(records, since=None, until=None):
+    for record in records:
+        start = record["start"]
+        if (since is None or start >= since) and (until is None or start < until):
+            yield record
+
+
+class Counted:
+    """Passes records through, counting them"""
+
+    def __init__(self, records):
+        self.records = records
+        self.count = 0
+
+    def __iter__(self):
+        for record in self.records:
+            self.count += 1
+            yield record
+
+
+def load_cursors(path=EXPORTS_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["cursors"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def save_cursors(cursors, path=EXPORTS_FILE):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    atomic_write_json(path, {"version": 1, "cursors": cursors})
+
+
+def parse_day(text):
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, got {text!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export pomodoro session history")
+    parser.add_argument("format", choices=sorted(FORMATS))
+    parser.add_argument("-o", "--output", metavar="PATH", help="write here instead of stdout")
+    parser.add_argument("--from", dest="first", type=parse_day, metavar="YYYY-MM-DD", help="first day (local, inclusive)")
+    parser.add_argument("--to", dest="last", type=parse_day, metavar="YYYY-MM-DD", help="last day (local, inclusive)")
+    parser.add_argument("--type", choices=["work", "break"], help="only this kind of session")
+    parser.add_argument("--since-last", action="store_true", help="only sessions added since the last --since-last export")
+    parser.add_argument("--name", help="which --since-last position to use and advance (default: the format)")
+    parser.add_argument("--store", choices=["json", "sqlite"], help="where the history lives")
+    args = parser.parse_args(argv)
+
+    store = open_store(args.store)
+    if store is not None:
+        from sqlite_store import SQLiteSessionLog
+        history = SQLiteSessionLog(store)
+    else:
+        from history import SessionLog
+        history = SessionLog(HISTORY_DIR)
+
+    since = day_start(args.first) if args.first else None
+    until = day_start(args.last + timedelta(days=1)) if args.last else None
+    filters = {
+        key: value for key, value in
+        (("from", args.first and args.first.isoformat()), ("to", args.last and args.last.isoformat()), ("type", args.type))
+        if value
+    }
+    name = args.name or " ".join([args.format] + [f"{key}={value}" for key, value in filters.items()])
+    cursors = load_cursors() if args.since_last else {}
+    if args.since_last:
+        cursor = cursors.get(name, {})
+        # The position skips past what these filters left out; it means nothing for others
+        if cursor and cursor.get("filters", {}) != filters:
+            parser.error(f"--name {name!r} was last used with other filters ({cursor.get('filters') or 'none'})")
+        skip = cursor.get("records", 0)
+        if skip > len(history):
+            # The history was pruned or replaced since: export it all again
+            print(f"History is shorter than at the last {name!r} export; starting over", file=sys.stderr)
+            skip = 0
+        # The log is in append order, so only records added since are read. Advancing by
+        # what was actually read (not len() up front) means a session logged mid-export
+        # is neither skipped nor exported twice.
+        read = Counted(history.after(skip))
+        records = within(read, since, until)
+    else:
+        # The history skips whole segments outside the range
+        records = history.records(since, until)
+    if args.type:
+        records = (r for r in records if r.get("type") == args.type)
+    records = Counted(records)
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        out.writelines(FORMATS[args.format](records))
+        out.flush()
+    except BrokenPipeError:
+        # Piped into head or similar: stop quietly, and don't advance the --since-last position
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    finally:
+        if args.output:
+            out.close()
+        if store is not None:
+            store.close()
+
+    if args.since_last:
+        cursors[name] = {"records": skip + read.count, "filters": filters, "exported_at": round(time.time(), 3)}
+        save_cursors(cursors)
+    print(f"Exported {records.count} session{'s' if records.count != 1 else ''}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,79 +1,573 @@
+# Imported first so the startup clock includes loading everything else
+from startup import HotPathProfiler, StartupTimer
+
 import tkinter as tk
-from tkinter import ttk, font, messagebox
+from tkinter import ttk, font, messagebox, filedialog
+import argparse
 import json
 import os
+import platform
 import random
-import winsound
-from datetime import datetime
+import sys
+import weakref
+from datetime import datetime, timedelta
+
+import control
+from audio import AudioEngine
+from events import EventBus
+from messages import BREAK_MESSAGES, END_MESSAGES, START_MESSAGES
+from pixel_art import (
+    GLYPH_HEIGHT, SandGauge, background_photo_data, compile_glyph, compile_sprite, role_colour
+)
+from scheduler import CallbackScheduler
+from storage import GOALS_FILE, HISTORY_DIR, SETTINGS_FILE, STATS_FILE, SettingsWriter, open_store
+from themes import THEMES, Palette, get_palette
+from timer_engine import PomodoroEngine
+
+
+def draw_sprite(canvas, name, base_x, base_y, scale, theme):
+    """Draw a compiled pixel-art sprite as a handful of merged rectangles"""
+    for role, x0, y0, x1, y1 in compile_sprite(name):
+        canvas.create_rectangle(
+            base_x + x0*scale, base_y + y0*scale,
+            base_x + x1*scale, base_y + y1*scale,
+            fill=role_colour(theme, role), outline="", tags=(name, role)
+        )
+
+
+class ThemeBinder:
+    """Remembers which palette role each widget option and canvas item uses
+
+    Widgets are registered with {option: role}; canvas items carry their role as a tag.
+    apply() then recolours the whole live UI in one pass, with no widgets rebuilt.
+    """
+
+    def __init__(self, palette):
+        self.palette = palette
+        self.widgets = []
+        self.canvases = []
+        self._prune_at = 256
+
+    def bind(self, widget, roles):
+        widget.configure(**{option: self.palette[role] for option, role in roles.items()})
+        self.widgets.append((widget, roles))
+        # Popups come and go all day; drop destroyed ones now and then
+        if len(self.widgets) >= self._prune_at:
+            self.widgets = [(w, r) for w, r in self.widgets if w.winfo_exists()]
+            self._prune_at = max(256, 2 * len(self.widgets))
+        return widget
+
+    def bind_canvas(self, canvas):
+        if canvas not in self.canvases:
+            self.canvases.append(canvas)
+
+    def apply(self, palette):
+        self.palette = palette
+        alive = []
+        for widget, roles in self.widgets:
+            try:
+                widget.configure(**{option: palette[role] for option, role in roles.items()})
+            except tk.TclError:
+                # Widget was destroyed since it was bound
+                continue
+            alive.append((widget, roles))
+        self.widgets = alive
+
+        canvases = []
+        for canvas in self.canvases:
+            try:
+                for role in Palette.ROLES:
+                    canvas.itemconfigure(role, fill=palette[role])
+            except tk.TclError:
+                continue
+            canvases.append(canvas)
+        self.canvases = canvases
+
+
+class RenderCache:
+    """Remembers what each widget last showed, so a tick only configures what changed
+
+    Counts the configure() calls made and the ones avoided (reset per session).
+    """
+
+    def __init__(self):
+        self.rendered = weakref.WeakKeyDictionary()  # widget -> {option: value}
+        self.pushed = 0
+        self.avoided = 0
+
+    def set(self, widget, **options):
+        shown = self.rendered.get(widget)
+        if shown is None:
+            shown = self.rendered[widget] = {}
+        changed = {option: value for option, value in options.items() if shown.get(option, self) != value}
+        if changed:
+            widget.configure(**changed)
+            shown.update(changed)
+            self.pushed += 1
+        else:
+            self.avoided += 1
+
+    def take_counts(self):
+        """(pushed, avoided) since the last call"""
+        counts = (self.pushed, self.avoided)
+        self.pushed = self.avoided = 0
+        return counts
+
+
+class VirtualList(tk.Frame):
+    """A list of any length that only puts the rows on screen into its Listbox
+
+    Scrolling re-renders the visible window of `items`; the selection is kept as a
+    set of item indexes, so it survives scrolling. Ctrl+A selects everything.
+    """
+
+    def __init__(self, master, **listbox_options):
+        super().__init__(master)
+        self.items = []
+        self.offset = 0
+        self.rows = 10
+        self.selected = set()
+        self.listbox = tk.Listbox(
+            self, selectmode="extended", exportselection=False, activestyle="none", **listbox_options
+        )
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.listbox.pack(side="left", fill="both", expand=True)
+        self.line_height = font.Font(font=self.listbox.cget("font")).metrics("linespace") + 1
+        
+        self.listbox.bind("<Configure>", self.on_resize)
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll_by(-3 if e.delta > 0 else 3))
+        self.listbox.bind("<Button-4>", lambda e: self.scroll_by(-3))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll_by(3))
+        self.listbox.bind("<Control-a>", self.select_all)
+    
+    def set_items(self, items):
+        self.items = items
+        self.selected.clear()
+        self.offset = 0
+        self.render()
+    
+    def selection(self):
+        return [self.items[i] for i in sorted(self.selected)]
+    
+    def remove_selected(self):
+        """Drop the selected items from the list (one pass, however many there are)"""
+        selected = self.selected
+        self.items = [item for i, item in enumerate(self.items) if i not in selected]
+        self.selected = set()
+        self.scroll_to(self.offset)
+    
+    def render(self):
+        listbox = self.listbox
+        listbox.delete(0, tk.END)
+        visible = self.items[self.offset:self.offset + self.rows]
+        if visible:
+            listbox.insert(tk.END, *visible)
+        for row in range(len(visible)):
+            if self.offset + row in self.selected:
+                listbox.selection_set(row)
+        total = max(1, len(self.items))
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.rows) / total))
+    
+    def scroll_to(self, offset):
+        self.offset = max(0, min(int(offset), len(self.items) - self.rows))
+        self.render()
+    
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+        return "break"
+    
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * len(self.items))
+        elif unit == "pages":
+            self.scroll_by(int(amount) * self.rows)
+        else:
+            self.scroll_by(int(amount))
+    
+    def on_resize(self, event):
+        rows = max(1, (event.height - 4) // self.line_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.scroll_to(self.offset)
+    
+    def on_select(self, event):
+        # Sync the on-screen rows into the selection; rows scrolled away keep theirs
+        on_screen = set(self.listbox.curselection())
+        for row in range(min(self.rows, len(self.items) - self.offset)):
+            if row in on_screen:
+                self.selected.add(self.offset + row)
+            else:
+                self.selected.discard(self.offset + row)
+    
+    def select_all(self, event=None):
+        self.selected = set(range(len(self.items)))
+        self.render()
+        return "break"
+
+
+class GlyphDisplay(tk.Frame):
+    """Timer text built from cached glyph images, one Label per character
+
+    Glyphs are rendered once per (colour, scale) and shared by every display, so a
+    tick only swaps the image of the characters that changed (usually one). Takes
+    text=, fg= and bg= through configure() like a Label, so themed() and the
+    RenderCache work with it unchanged.
+    """
+
+    glyph_cache = {}  # (interpreter, colour, scale) -> {char: PhotoImage}
+
+    def __init__(self, master, scale, text="", **options):
+        super().__init__(master, **options)
+        self.scale = scale
+        self.colour = "#000000"
+        self.glyphs = None
+        self.slots = []
+        self.text = ""
+        self.set_text(text)
+
+    def configure(self, cnf=None, **options):
+        options = dict(cnf or {}, **options)
+        if not options:
+            return super().configure()
+        colour = options.pop("fg", options.pop("foreground", None))
+        text = options.pop("text", None)
+        if options:
+            super().configure(**options)
+            background = options.get("bg", options.get("background"))
+            if background is not None:
+                for slot in self.slots:
+                    slot.configure(bg=background)
+        if colour is not None and colour != self.colour:
+            self.colour = colour
+            self.glyphs = None
+            # Every slot needs its image in the new colour
+            if text is None:
+                text = self.text
+            self.text = ""
+        if text is not None:
+            self.set_text(text)
+
+    config = configure
+
+    def glyph_images(self):
+        key = (self.tk, self.colour, self.scale)
+        glyphs = self.glyph_cache.get(key)
+        if glyphs is None:
+            glyphs = self.glyph_cache[key] = {}
+        return glyphs
+
+    def glyph(self, char):
+        if self.glyphs is None:
+            self.glyphs = self.glyph_images()
+        image = self.glyphs.get(char)
+        if image is None:
+            width, rects = compile_glyph(char)
+            scale = self.scale
+            image = tk.PhotoImage(master=self, width=width * scale, height=GLYPH_HEIGHT * scale)
+            for _, x0, y0, x1, y1 in rects:
+                image.put(self.colour, to=(x0 * scale, y0 * scale, x1 * scale, y1 * scale))
+            self.glyphs[char] = image
+        return image
+
+    def set_text(self, text):
+        if len(text) != len(self.slots):
+            # Only when the number of characters changes (e.g. past 99 minutes)
+            for slot in self.slots:
+                slot.destroy()
+            self.slots = [
+                tk.Label(self, bd=0, padx=self.scale // 2, pady=0, bg=self.cget("bg"))
+                for _ in text
+            ]
+            for slot in self.slots:
+                slot.pack(side="left")
+            self.text = ""
+        for index, char in enumerate(text):
+            if index >= len(self.text) or self.text[index] != char:
+                self.slots[index].configure(image=self.glyph(char))
+        self.text = text
+
+
+class SandAnimation:
+    """Sand grains of a sprite as canvas items that are only touched when they change"""
+
+    def __init__(self, canvas, name, base_x, base_y, scale, theme):
+        self.canvas = canvas
+        self.gauge = SandGauge(name)
+        # One item per grain, created once; ticks only flip their state
+        self.items = [
+            canvas.create_rectangle(
+                base_x + x*scale, base_y + y*scale,
+                base_x + x*scale + scale, base_y + y*scale + scale,
+                fill=role_colour(theme, role), outline="", state="hidden", tags=(name, "sand", role)
+            )
+            for (x, y), role in zip(self.gauge.cells, self.gauge.roles)
+        ]
+
+    def set_fraction(self, fraction):
+        """Show the sand for this fraction of time left (0..1)"""
+        for index, visible in self.gauge.update(fraction):
+            self.canvas.itemconfigure(self.items[index], state="normal" if visible else "hidden")
+
+
+def count_widgets(root):
+    """Tk widgets under root by class, and items on every canvas"""
+    by_class = {}
+    canvas_items = {}
+    pending = [root]
+    while pending:
+        widget = pending.pop()
+        name = widget.winfo_class()
+        by_class[name] = by_class.get(name, 0) + 1
+        if isinstance(widget, tk.Canvas):
+            canvas_items[str(widget)] = len(widget.find_all())
+        pending.extend(widget.winfo_children())
+    return {
+        "widgets": sum(by_class.values()),
+        "by_class": dict(sorted(by_class.items())),
+        "canvas_items": sum(canvas_items.values()),
+        "canvas_items_by_canvas": canvas_items,
+    }
+
+
+def profile_run(app, seconds, output):
+    """Let the timer tick for a while, sweep a whole session through the display, report"""
+    root = app.root
+    app.engine.start(goal="profile")
+    app.update_timer()
+
+    def sweep():
+        # Every second of a session through update_display (covers all sand steps)
+        app.engine.pause()
+        for left in range(app.engine.session_length, -1, -1):
+            app.engine.set_time_left(left)
+            app.update_display()
+        root.update_idletasks()
+
+        report = {
+            "python": platform.python_version(),
+            "tk": root.tk.call("info", "patchlevel"),
+            "platform": sys.platform,
+            "startup": app.startup.report(),
+            "ticks": app.profiler.report(),
+            "pending_callbacks": app.scheduler.keys(),
+            "render": {"pushed": app.view.pushed, "avoided": app.view.avoided},
+            "settings": {"writes": app.settings_writer.writes, "coalesced": app.settings_writer.coalesced},
+            "events": app.events.metrics(),
+            "ui": count_widgets(root),
+        }
+        text = json.dumps(report, indent=2)
+        if output:
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        root.destroy()
+
+    app.scheduler.schedule("profile_sweep", seconds * 1000, sweep)
+
 
 class PomodoroTimer:
-    def __init__(self, root):
+    # Rendered background images, keyed by (interpreter, top colour, bottom colour, width, height)
+    background_cache = {}
+
+    def __init__(self, root, profiler=None, store=None):
         self.root = root
+        # --profile: time every tick-path call (instance attributes shadow the methods)
+        self.profiler = profiler
+        if profiler is not None:
+            self.update_timer = profiler.wrap("update_timer", self.update_timer)
+            self.update_display = profiler.wrap("update_display", self.update_display)
         self.root.title("✨ Dreamy Timer ✨")
+        # The image caches are shared by every Tk root (benchmarks build many)
+        self.root.bind("<Destroy>", self.forget_cached_images, add="+")
         self.root.geometry("450x680")
         
+        # Only what the first frame needs happens here; the rest warms up afterwards
+        self.startup = StartupTimer()
+        # Every after() callback goes through here, keyed, so none can pile up
+        self.scheduler = CallbackScheduler(self.root)
+        # Session events for plugins; handlers run on worker threads, never this one
+        self.events = EventBus()
+        
         # Load custom font and sound
-        self.load_custom_resources()
+        with self.startup.phase("load_custom_resources"):
+            self.load_custom_resources()
         
         # Load settings
-        self.settings_file = "pomodoro_settings.json"
-        self.load_settings()
+        self.settings_file = SETTINGS_FILE
+        with self.startup.phase("load_settings"):
+            self.store = open_store(store)
+            self.load_settings()
+        # Saves are batched and written atomically (at most once a second, and on exit)
+        self.settings_writer = SettingsWriter(
+            self.settings_file, lambda ms, callback: self.scheduler.schedule("save_settings", ms, callback),
+            write=self.store.save_settings if self.store else None
+        )
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Goal library, history and stats are loaded on first use (see warm_up)
+        self._goal_library = None
+        self._history = None
+        self._stats = None
         
         # Apply current theme
-        self.apply_theme()
+        self.theme_binder = None
+        with self.startup.phase("apply_theme"):
+            self.apply_theme()
+        
+        # Timer state lives in the UI-free engine (load durations from settings)
+        self.engine = PomodoroEngine(
+            self.settings.get("work_minutes", 25) * 60,
+            self.settings.get("break_minutes", 5) * 60
+        )
         
-        # Timer settings (load from settings)
-        self.work_time = self.settings.get("work_minutes", 25) * 60
-        self.break_time = self.settings.get("break_minutes", 5) * 60
-        self.time_left = self.work_time
-        self.is_running = False
-        self.is_work_session = True
-        self.current_goal = ""
-        self.session_count = 0
-        
-        # PDA-friendly messages (expanded)
-        self.start_messages = [
-            "you're doing great",
-            "take your time",
-            "no pressure, just vibes",
-            "one step at a time",
-            "you've got this if you want"
-        ]
-        self.break_messages = [
-            "it's okay to pause",
-            "you're allowed to rest",
-            "breathe and reset 💜",
-            "gentle break time",
-            "rest is productive too"
-        ]
-        self.end_messages = [
-            "working at your own pace",
-            "being here is enough",
-            "you did well ✨",
-            "that was great!",
-            "proud of you 💜"
-        ]
+        # PDA-friendly messages (shared with the terminal mode)
+        self.start_messages = list(START_MESSAGES)
+        self.break_messages = list(BREAK_MESSAGES)
+        self.end_messages = list(END_MESSAGES)
+        
+        # Widget properties as last rendered, so ticks only push changes
+        self.view = RenderCache()
         
         # Center the window on screen
-        self.center_window()
+        with self.startup.phase("center_window"):
+            self.center_window()
         
         # Crate background canvas FIRST
-        self.create_background()
+        with self.startup.phase("create_background"):
+            self.create_background()
         
         # Create main UI
-        self.create_widgets()
+        with self.startup.phase("create_widgets"):
+            self.create_widgets()
         
         # Mini window (initially hidden)
         self.mini_window = None
+        # Control socket for later launches and pda_ctl.py (set up by main())
+        self.control = None
+        # Dialogs: built once (in warm-up or on first use), then hidden and reused
+        self.settings_window = None
+        self.goal_window = None
+        self.popup = None
+        
+        # Keep "Sessions today" right when the day changes with the app open
+        self.schedule_midnight_refresh()
         
         # Show start message
         self.show_message(random.choice(self.start_messages))
+        
+        # Once the first frame is up, load the rest in small steps
+        self.scheduler.schedule("first_frame", 0, self.root.after_idle, self.on_first_frame)
+    
+    def on_first_frame(self):
+        self.startup.mark_first_frame()
+        self.warm_up_steps = [
+            lambda: self.history,
+            lambda: self.stats,
+            self.update_session_counter,
+            lambda: self.goal_library,
+            # The fuzzy index is built off the Tk thread, ready before the first search
+            lambda: self.goal_library.warm(background=True),
+            self.audio.preload,
+            # Dialogs are built while idle, so opening them later is instant
+            self.build_popup,
+            self.build_goal_window,
+            self.build_settings_window,
+        ]
+        self.scheduler.schedule("warm_up", 1, self.warm_up)
+    
+    def warm_up(self):
+        """Run one deferred startup step, then yield to the event loop before the next"""
+        if self.warm_up_steps:
+            step = self.warm_up_steps.pop(0)
+            try:
+                step()
+            except Exception as e:
+                print(f"Error during warm-up: {e}")
+            self.scheduler.schedule("warm_up", 1, self.warm_up)
+        else:
+            self.startup.mark_warm()
+    
+    @property
+    def goal_library(self):
+        """All goals ever used (settings only keeps the 10 most recent, for older versions)"""
+        if self._goal_library is None:
+            if self.store:
+                from sqlite_store import SQLiteGoalLibrary
+                self._goal_library = SQLiteGoalLibrary(self.store)
+            else:
+                from goals import GoalLibrary
+                self._goal_library = GoalLibrary(GOALS_FILE)
+            if not len(self._goal_library) and self.settings.get("saved_goals"):
+                self._goal_library.import_lines(reversed(self.settings["saved_goals"]))
+        return self._goal_library
+    
+    @property
+    def history(self):
+        """Every finished or abandoned session"""
+        if self._history is None:
+            from history import SessionLog
+            if self.store:
+                from sqlite_store import SQLiteSessionLog
+                self._history = SQLiteSessionLog(self.store)
+            else:
+                self._history = SessionLog(HISTORY_DIR)
+        return self._history
+    
+    @property
+    def stats(self):
+        """Daily/weekly/goal totals, kept up to date per session instead of recounted"""
+        if self._stats is None:
+            from stats import StatsRollup
+            stats = StatsRollup(STATS_FILE)
+            stats.sync(self.history)
+            self._stats = stats
+        return self._stats
     
+    # Timer state is read through to the engine so the UI code stays as it was
+    @property
+    def countdown(self):
+        return self.engine.countdown
+
+    @property
+    def work_time(self):
+        return self.engine.work_time
+
+    @property
+    def break_time(self):
+        return self.engine.break_time
+
+    @property
+    def session_count(self):
+        return self.engine.session_count
+
+    @property
+    def is_work_session(self):
+        return self.engine.is_work_session
+
+    @property
+    def is_running(self):
+        return self.engine.is_running
+
+    @property
+    def current_goal(self):
+        return self.engine.goal
+
+    @current_goal.setter
+    def current_goal(self, goal):
+        self.engine.goal = goal
+
+    @property
+    def time_left(self):
+        """Whole seconds left in the current session (worked out from the deadline)"""
+        return self.countdown.seconds_left()
+
     def load_custom_resources(self):
-        """Load custom font and sound files"""
+        """Load the custom sound file"""
         import os
         import sys
-        from tkinter import font as tkfont
         
         # Get the directory where the script/exe is running
         if getattr(sys, 'frozen', False):
@@ -83,29 +577,19 @@ class PomodoroTimer:
             # Running as script
             application_path = os.path.dirname(os.path.abspath(__file__))
         
-        # Load custom font
-        self.minecraft_font_path = os.path.join(application_path, "Minecraft.ttf")
-        self.custom_font_loaded = False
+        # No font to load: the timer digits are cached pixel glyphs (see GlyphDisplay)
         
-        try:
-            # Try to load the font
-            if os.path.exists(self.minecraft_font_path):
-                # For Windows, we need to use pyglet or register the font
-                # Simple approach: just reference it by path
-                self.pixel_font = ("Minecraft", 56, "bold")
-                self.custom_font_loaded = True
-            else:
-                # Fallback to Courier New
-                self.pixel_font = ("Courier New", 56, "bold")
-        except:
-            # Fallback to Courier New
-            self.pixel_font = ("Courier New", 56, "bold")
-        
-        # Load sound file
+        # Load sound file (falling back to the one bundled in assets/)
         self.sound_path = os.path.join(application_path, "Bomberman_93_Password.mp3")
+        if not os.path.exists(self.sound_path):
+            bundled = os.path.join(application_path, "..", "assets", "notification.mp3")
+            if os.path.exists(bundled):
+                self.sound_path = os.path.normpath(bundled)
+        # Backend pick and decoding happen on the audio worker, never on the Tk thread
+        self.audio = AudioEngine(self.sound_path)
         
     def load_settings(self):
-        """Load settings from JSON file"""
+        """Load settings from the store or the JSON file, filling in defaults"""
         default_settings = {
             "saved_goals": [],
             "current_theme": "purple",
@@ -117,91 +601,69 @@ class PomodoroTimer:
             "break_minutes": 5
         }
         
+        self.settings = self.store.load_settings() if self.store else self.read_settings_file()
+        # Add anything missing (for backwards compatibility)
+        for key, value in default_settings.items():
+            self.settings.setdefault(key, value)
+        # Reset session count if it's a new day
+        today = datetime.now().strftime("%Y-%m-%d")
+        if self.settings.get("last_session_date") != today:
+            self.settings["total_sessions_today"] = 0
+            self.settings["last_session_date"] = today
+            self.settings["sessions_before_history"] = 0
+    
+    def read_settings_file(self):
+        if not os.path.exists(self.settings_file):
+            return {}
         try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    self.settings = json.load(f)
-                # Reset session count if it's a new day
-                today = datetime.now().strftime("%Y-%m-%d")
-                if self.settings.get("last_session_date") != today:
-                    self.settings["total_sessions_today"] = 0
-                    self.settings["last_session_date"] = today
-                # Add work/break minutes if not present (for backwards compatibility)
-                if "work_minutes" not in self.settings:
-                    self.settings["work_minutes"] = 25
-                if "break_minutes" not in self.settings:
-                    self.settings["break_minutes"] = 5
-            else:
-                self.settings = default_settings
-        except:
-            self.settings = default_settings
+            with open(self.settings_file, "r", encoding="utf-8") as f:
+                settings = json.load(f)
+            if not isinstance(settings, dict):
+                raise ValueError("not a JSON object")
+            return settings
+        except (OSError, ValueError) as e:
+            # Set the broken file aside rather than overwrite it with defaults on the next save
+            backup = f"{self.settings_file}.unreadable-{datetime.now():%Y%m%d-%H%M%S}"
+            try:
+                os.replace(self.settings_file, backup)
+            except OSError:
+                backup = self.settings_file
+            print(f"Couldn't read {self.settings_file} ({e}), starting from defaults; the old file is at {backup}")
+            return {}
     
     def save_settings(self):
-        """Save settings to JSON file"""
-        try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
-        except Exception as e:
-            print(f"Error saving settings: {e}")
+        """Save settings to JSON file (write-behind, see SettingsWriter)"""
+        self.settings_writer.save(self.settings)
+    
+    def on_close(self):
+        """Flush anything unsaved before the window goes away"""
+        self.settings_writer.flush()
+        self.scheduler.cancel_all()
+        if self.control:
+            self.control.close()
+        if self.store:
+            self.store.close()
+        self.events.close()
+        self.audio.close()
+        self.root.destroy()
     
     def apply_theme(self):
-        """Apply color theme"""
-        themes = {
-            "purple": {
-                "bg": "#e6dcf5",
-                "primary": "#6b5b95",
-                "secondary": "#8e7cc3",
-                "accent1": "#c8b6e2",
-                "accent2": "#d4c5f0",
-                "accent3": "#b19cd9",
-                "gradient_top": "#efe9ff",
-                "gradient_bottom": "#d6d0f5"
-            },
-            "pink": {
-                "bg": "#fce4ec",
-                "primary": "#c2185b",
-                "secondary": "#e91e63",
-                "accent1": "#f8bbd0",
-                "accent2": "#f48fb1",
-                "accent3": "#f06292",
-                "gradient_top": "#fff0f5",
-                "gradient_bottom": "#fce4ec"
-            },
-            "blue": {
-                "bg": "#e3f2fd",
-                "primary": "#1565c0",
-                "secondary": "#1976d2",
-                "accent1": "#90caf9",
-                "accent2": "#64b5f6",
-                "accent3": "#42a5f5",
-                "gradient_top": "#f0f8ff",
-                "gradient_bottom": "#e3f2fd"
-            },
-            "mint": {
-                "bg": "#e0f2f1",
-                "primary": "#00695c",
-                "secondary": "#00897b",
-                "accent1": "#80cbc4",
-                "accent2": "#4db6ac",
-                "accent3": "#26a69a",
-                "gradient_top": "#f0fff4",
-                "gradient_bottom": "#e0f2f1"
-            },
-            "peach": {
-                "bg": "#fff3e0",
-                "primary": "#e65100",
-                "secondary": "#f57c00",
-                "accent1": "#ffcc80",
-                "accent2": "#ffb74d",
-                "accent3": "#ffa726",
-                "gradient_top": "#fffaf0",
-                "gradient_bottom": "#fff3e0"
-            }
-        }
-        
-        theme_name = self.settings.get("current_theme", "purple")
-        self.theme = themes.get(theme_name, themes["purple"])
-        self.root.configure(bg=self.theme["bg"])
+        """Apply color theme (live: everything already on screen is recoloured in place)"""
+        self.theme = get_palette(self.settings.get("current_theme", "purple"))
+        if self.theme_binder is None:
+            self.theme_binder = ThemeBinder(self.theme)
+            self.themed(self.root, bg="bg")
+            return
+        
+        self.theme_binder.apply(self.theme)
+        self.bg_image = self.get_background_image(self.bg_canvas, 450, 680)
+        self.bg_canvas.itemconfigure("background", image=self.bg_image)
+        if self.mini_window and self.mini_window.winfo_exists():
+            self.mini_window.theme = self.theme
+    
+    def themed(self, widget, **roles):
+        """Colour a widget from the current palette and keep it in sync on theme changes"""
+        return self.theme_binder.bind(widget, roles)
         
     def center_window(self):
         self.root.update_idletasks()
@@ -212,190 +674,164 @@ class PomodoroTimer:
         self.root.geometry(f'{width}x{height}+{x}+{y}')
     
     def create_background(self):
-        """Simple dreamy gradient background with moon and sparkles"""
+        """Simple dreamy gradient background with moon and sparkles (one cached image)"""
         self.bg_canvas = tk.Canvas(self.root, width=450, height=680, highlightthickness=0)
         self.bg_canvas.place(x=0, y=0)
 
+        self.bg_image = self.get_background_image(self.bg_canvas, 450, 680)
+        self.bg_canvas.create_image(0, 0, image=self.bg_image, anchor="nw", tags=("background",))
+
+    def forget_cached_images(self, event):
+        """Drop this interpreter's cached images once its root is destroyed"""
+        # <Destroy> on the root also fires for every widget inside it
+        if event.widget is not self.root:
+            return
+        interpreter = self.root.tk
+        for cache in (PomodoroTimer.background_cache, GlyphDisplay.glyph_cache):
+            for key in [key for key in cache if key[0] is interpreter]:
+                del cache[key]
+    
+    def get_background_image(self, canvas, width, height):
+        """Return the background as a PhotoImage, rendering it only once per theme and size"""
         # Gradient colours (top -> bottom)
         top_color = self.theme.get("gradient_top", "#efe9ff")  # soft lavender
         bottom_color = self.theme.get("gradient_bottom", "#d6d0f5")  # dusk purple
 
-        self._draw_vertical_gradient(self.bg_canvas, 450, 680, top_color, bottom_color)
-
-        # Moon
-        self.bg_canvas.create_oval(300, 40, 360, 100, fill="#fff8dc", outline="")
-
-        # Sparkles
-        for x, y in [(80, 120), (120, 90), (200, 140), (350, 180)]:
-            self.bg_canvas.create_oval(x, y, x+4, y+4, fill="#ffd700", outline="")
-        
-        # Add some extra tiny stars
-        for x, y in [(50, 200), (400, 150), (100, 500), (380, 450), (150, 350)]:
-            self.bg_canvas.create_oval(x, y, x+2, y+2, fill="#ffffff", outline="")
-    
-    def _draw_vertical_gradient(self, canvas, width, height, start, end):
-        """Helper to draw vertical gradient"""
-        r1, g1, b1 = canvas.winfo_rgb(start)
-        r2, g2, b2 = canvas.winfo_rgb(end)
-
-        r_ratio = (r2 - r1) / height
-        g_ratio = (g2 - g1) / height
-        b_ratio = (b2 - b1) / height
+        key = (canvas.tk, top_color, bottom_color, width, height)
+        image = self.background_cache.get(key)
+        if image is None:
+            image = tk.PhotoImage(width=width, height=height)
+            # One bulk pixel write instead of a canvas line per row
+            image.put(background_photo_data(width, height, canvas.winfo_rgb(top_color), canvas.winfo_rgb(bottom_color)))
+            self.background_cache[key] = image
+        return image
 
-        for i in range(height):
-            color = "#%04x%04x%04x" % (
-                int(r1 + r_ratio * i),
-                int(g1 + g_ratio * i),
-                int(b1 + b_ratio * i)
-            )
-            canvas.create_line(0, i, width, i, fill=color)
-
-        
     def create_widgets(self):
         # Make widgets use canvas as parent or use a transparent approach
         # We'll place widgets directly on the root and the canvas will be behind them
         
         # Top frame for settings
-        top_frame = tk.Frame(self.root, bg=self.theme["gradient_top"], highlightthickness=0)
+        top_frame = self.themed(tk.Frame(self.root, highlightthickness=0), bg="gradient_top")
         top_frame.pack(fill="x", padx=10, pady=5)
         
         # Settings button (left)
-        settings_btn = tk.Button(
+        settings_btn = self.themed(tk.Button(
             top_frame,
             text="⚙️ Settings",
             command=self.show_settings,
-            bg=self.theme["accent2"],
-            fg=self.theme["primary"],
             font=("Courier New", 9),
             relief="flat",
             cursor="hand2"
-        )
+        ), bg="accent2", fg="primary")
         settings_btn.pack(side="left")
         
         # Minimize button (right)
-        self.minimize_button = tk.Button(
+        self.minimize_button = self.themed(tk.Button(
             top_frame,
             text="➖ Minimize",
             command=self.create_mini_window,
-            bg=self.theme["accent2"],
-            fg=self.theme["primary"],
             font=("Courier New", 9),
             relief="flat",
             cursor="hand2"
-        )
+        ), bg="accent2", fg="primary")
         self.minimize_button.pack(side="right", padx=5)
         
         # Session counter (right, before minimize)
-        self.session_counter_label = tk.Label(
+        self.session_counter_label = self.themed(tk.Label(
             top_frame,
+            # Settings hold today's count until the stats have warmed up
             text=f"Sessions today: {self.settings.get('total_sessions_today', 0)}",
-            font=("Courier New", 9),
-            fg=self.theme["primary"],
-            bg=self.theme["gradient_top"]
-        )
+            font=("Courier New", 9)
+        ), fg="primary", bg="gradient_top")
         self.session_counter_label.pack(side="right", padx=10)
         
         # Title with sparkles
-        title_frame = tk.Frame(self.root, bg=self.theme["gradient_top"])
+        title_frame = self.themed(tk.Frame(self.root), bg="gradient_top")
         title_frame.pack(pady=10)
         
-        self.title_label = tk.Label(
+        self.title_label = self.themed(tk.Label(
             title_frame,
             text="✨ Work Time ✨",
-            font=("Courier New", 18, "bold"),
-            fg=self.theme["primary"],
-            bg=self.theme["gradient_top"]
-        )
+            font=("Courier New", 18, "bold")
+        ), fg="primary", bg="gradient_top")
         self.title_label.pack()
         
         # Message label (for PDA-friendly messages)
-        self.message_label = tk.Label(
+        self.message_label = self.themed(tk.Label(
             self.root,
             text="",
             font=("Courier New", 10),
-            fg=self.theme["secondary"],
-            bg=self.theme["gradient_top"],
             wraplength=400
-        )
+        ), fg="secondary", bg="gradient_top")
         self.message_label.pack(pady=5)
         
         # Current goal label (above hourglass)
-        self.goal_label = tk.Label(
+        self.goal_label = self.themed(tk.Label(
             self.root,
             text="",
             font=("Courier New", 11, "bold"),
-            fg=self.theme["primary"],
-            bg=self.theme["bg"],
             wraplength=400,
             height=3
-        )
+        ), fg="primary", bg="bg")
         self.goal_label.pack(pady=10)
         
         # Hourglass canvas
-        self.hourglass_canvas = tk.Canvas(
+        self.hourglass_canvas = self.themed(tk.Canvas(
             self.root,
             width=200,
             height=220,
-            bg=self.theme["bg"],
             highlightthickness=0
-        )
+        ), bg="bg")
         self.hourglass_canvas.pack(pady=10)
-        self.draw_hourglass()
+        with self.startup.phase("draw_hourglass"):
+            self.draw_hourglass()
         
-        # Timer display (pixel style font)
-        self.timer_label = tk.Label(
+        # Timer display (cached pixel glyphs, 8px per glyph pixel = 56px tall digits)
+        self.timer_label = self.themed(GlyphDisplay(
             self.root,
-            text="25:00",
-            font=self.pixel_font,
-            fg=self.theme["primary"],
-            bg=self.theme["gradient_bottom"]
-        )
+            scale=8,
+            text="25:00"
+        ), fg="primary", bg="gradient_bottom")
         self.timer_label.pack(pady=15)
         
         # Buttons with dreamy colors
-        button_frame = tk.Frame(self.root, bg=self.theme["gradient_bottom"])
+        button_frame = self.themed(tk.Frame(self.root), bg="gradient_bottom")
         button_frame.pack(pady=10)
         
-        self.start_button = tk.Button(
+        self.start_button = self.themed(tk.Button(
             button_frame,
             text="Start",
             command=self.start_timer,
-            bg=self.theme["accent1"],
-            fg=self.theme["primary"],
             font=("Courier New", 11, "bold"),
             width=8,
             height=1,
             relief="flat",
             cursor="hand2"
-        )
+        ), bg="accent1", fg="primary")
         self.start_button.grid(row=0, column=0, padx=5, pady=5)
         
-        self.pause_button = tk.Button(
+        self.pause_button = self.themed(tk.Button(
             button_frame,
             text="Pause",
             command=self.pause_timer,
-            bg=self.theme["accent2"],
-            fg=self.theme["primary"],
             font=("Courier New", 11, "bold"),
             width=8,
             height=1,
             relief="flat",
             cursor="hand2"
-        )
+        ), bg="accent2", fg="primary")
         self.pause_button.grid(row=0, column=1, padx=5, pady=5)
         
-        self.reset_button = tk.Button(
+        self.reset_button = self.themed(tk.Button(
             button_frame,
             text="Reset",
             command=self.reset_timer,
-            bg=self.theme["accent3"],
-            fg=self.theme["primary"],
             font=("Courier New", 11, "bold"),
             width=8,
             height=1,
             relief="flat",
             cursor="hand2"
-        )
+        ), bg="accent3", fg="primary")
         self.reset_button.grid(row=0, column=2, padx=5, pady=5)
         
         # Background canvas is already behind because we created it first with .place()
@@ -406,282 +842,217 @@ class PomodoroTimer:
         c = self.hourglass_canvas
         c.delete("all")
         
-        # Use theme colors
-        rim_color = self.theme["accent3"]
-        glass_color = self.theme["accent1"]
-        sand_color = self.theme["accent2"]
-        
-        # Scale factor for pixel art
-        scale = 8
-        base_x = 50
-        base_y = 10
-        
-        # Draw sparkles
-        sparkle_coords = [
-            (1, 3), (0, 4), (2, 4),  # top left
-            (18, 5), (19, 6),  # top right
-            (2, 15), (1, 16),  # bottom left
-            (17, 14), (18, 15)  # bottom right
-        ]
-        for x, y in sparkle_coords:
-            c.create_rectangle(
-                base_x + x*scale, base_y + y*scale,
-                base_x + x*scale + scale, base_y + y*scale + scale,
-                fill="#ffd700", outline=""
-            )
-        
-        # Top rim
-        self.draw_pixels(c, base_x, base_y, [(5,2), (6,2), (7,2), (8,2), (9,2), (10,2), (11,2), (12,2), (13,2), (14,2)], rim_color, scale)
-        self.draw_pixels(c, base_x, base_y, [(4,3), (5,3), (6,3), (7,3), (8,3), (9,3), (10,3), (11,3), (12,3), (13,3), (14,3), (15,3)], rim_color, scale)
-        
-        # Glass outline top
-        self.draw_pixels(c, base_x, base_y, [(6,4), (7,4), (8,4), (9,4), (10,4), (11,4), (12,4), (13,4)], self.theme["secondary"], scale)
-        self.draw_pixels(c, base_x, base_y, [(7,5), (8,5), (9,5), (10,5), (11,5), (12,5)], self.theme["secondary"], scale)
-        self.draw_pixels(c, base_x, base_y, [(8,6), (9,6), (10,6), (11,6)], self.theme["secondary"], scale)
-        self.draw_pixels(c, base_x, base_y, [(9,7), (10,7)], self.theme["secondary"], scale)
-        
-        # Sand in top
-        self.draw_pixels(c, base_x, base_y, [(7,5), (8,5), (9,5), (10,5), (11,5), (12,5)], glass_color, scale)
-        self.draw_pixels(c, base_x, base_y, [(8,6), (9,6), (10,6), (11,6)], sand_color, scale)
-        
-        # Middle
-        self.draw_pixels(c, base_x, base_y, [(9,8), (10,8), (9,9), (10,9)], self.theme["bg"], scale)
-        
-        # Glass outline bottom
-        self.draw_pixels(c, base_x, base_y, [(9,10), (10,10)], self.theme["secondary"], scale)
-        self.draw_pixels(c, base_x, base_y, [(8,11), (9,11), (10,11), (11,11)], self.theme["secondary"], scale)
-        self.draw_pixels(c, base_x, base_y, [(7,12), (8,12), (9,12), (10,12), (11,12), (12,12)], self.theme["secondary"], scale)
-        self.draw_pixels(c, base_x, base_y, [(6,13), (7,13), (8,13), (9,13), (10,13), (11,13), (12,13), (13,13)], self.theme["secondary"], scale)
-        self.draw_pixels(c, base_x, base_y, [(6,14), (7,14), (8,14), (9,14), (10,14), (11,14), (12,14), (13,14)], self.theme["secondary"], scale)
-        self.draw_pixels(c, base_x, base_y, [(6,15), (7,15), (8,15), (9,15), (10,15), (11,15), (12,15), (13,15)], self.theme["secondary"], scale)
-        
-        # Sand in bottom
-        self.draw_pixels(c, base_x, base_y, [(8,14), (9,14), (10,14), (11,14)], glass_color, scale)
-        self.draw_pixels(c, base_x, base_y, [(8,15), (9,15), (10,15), (11,15)], glass_color, scale)
-        
-        # Bottom rim
-        self.draw_pixels(c, base_x, base_y, [(4,16), (5,16), (6,16), (7,16), (8,16), (9,16), (10,16), (11,16), (12,16), (13,16), (14,16), (15,16)], rim_color, scale)
-        self.draw_pixels(c, base_x, base_y, [(5,17), (6,17), (7,17), (8,17), (9,17), (10,17), (11,17), (12,17), (13,17), (14,17)], rim_color, scale)
-        
-    def draw_pixels(self, canvas, base_x, base_y, coords, color, scale):
-        """Helper to draw pixel blocks"""
-        for x, y in coords:
-            canvas.create_rectangle(
-                base_x + x*scale, base_y + y*scale,
-                base_x + x*scale + scale, base_y + y*scale + scale,
-                fill=color, outline=""
-            )
+        # Scale factor for pixel art (sprite layout lives in pixel_art.SPRITES)
+        draw_sprite(c, "hourglass", base_x=50, base_y=10, scale=8, theme=self.theme)
+        self.theme_binder.bind_canvas(c)
+        self.sand = SandAnimation(c, "hourglass", base_x=50, base_y=10, scale=8, theme=self.theme)
+        self.sand.set_fraction(self.sand_fraction())
+    
+    def sand_fraction(self):
+        """How full the top of the hourglass should be (share of the session left)"""
+        return self.countdown.remaining() / max(1, self.engine.session_length)
+    
+    def dialog(self, title, width, height):
+        """A hidden, centred Toplevel that is kept for reuse (closing it only hides it)"""
+        window = tk.Toplevel(self.root)
+        window.withdraw()
+        window.title(title)
+        self.themed(window, bg="bg")
+        x = (window.winfo_screenwidth() // 2) - width // 2
+        y = (window.winfo_screenheight() // 2) - height // 2
+        window.geometry(f'{width}x{height}+{x}+{y}')
+        window.protocol("WM_DELETE_WINDOW", window.withdraw)
+        return window
+    
+    def present(self, window):
+        window.deiconify()
+        window.lift()
     
     def show_settings(self):
-        """Show settings window"""
-        settings_window = tk.Toplevel(self.root)
-        settings_window.title("⚙️ Settings")
-        settings_window.geometry("400x650")
-        settings_window.configure(bg=self.theme["bg"])
-        
-        # Center settings window
-        settings_window.update_idletasks()
-        x = (settings_window.winfo_screenwidth() // 2) - 200
-        y = (settings_window.winfo_screenheight() // 2) - 325
-        settings_window.geometry(f'400x650+{x}+{y}')
+        """Show settings window (built once, refreshed each time it opens)"""
+        self.build_settings_window()
+        self.sound_var.set(self.settings.get("sound_enabled", True))
+        self.work_minutes_var.set(str(self.settings.get("work_minutes", 25)))
+        self.break_minutes_var.set(str(self.settings.get("break_minutes", 5)))
+        self.refresh_goals_list(self.goals_list)
+        self.present(self.settings_window)
+    
+    def build_settings_window(self):
+        if self.settings_window is not None:
+            return
+        settings_window = self.settings_window = self.dialog("⚙️ Settings", 400, 650)
         
         # Title
-        title = tk.Label(
+        title = self.themed(tk.Label(
             settings_window,
             text="⚙️ Settings ⚙️",
-            font=("Courier New", 16, "bold"),
-            fg=self.theme["primary"],
-            bg=self.theme["bg"]
-        )
+            font=("Courier New", 16, "bold")
+        ), fg="primary", bg="bg")
         title.pack(pady=15)
         
         # Theme selection
-        theme_frame = tk.LabelFrame(
+        theme_frame = self.themed(tk.LabelFrame(
             settings_window,
             text="Color Theme",
-            font=("Courier New", 11, "bold"),
-            fg=self.theme["primary"],
-            bg=self.theme["bg"]
-        )
+            font=("Courier New", 11, "bold")
+        ), fg="primary", bg="bg")
         theme_frame.pack(pady=10, padx=20, fill="x")
         
-        themes = ["purple", "pink", "blue", "mint", "peach"]
-        for theme in themes:
-            btn = tk.Button(
+        for theme in THEMES:
+            btn = self.themed(tk.Button(
                 theme_frame,
                 text=theme.capitalize(),
-                command=lambda t=theme: self.change_theme(t, settings_window),
-                bg=self.theme["accent1"],
-                fg=self.theme["primary"],
+                command=lambda t=theme: self.change_theme(t),
                 font=("Courier New", 10),
                 relief="flat",
                 cursor="hand2",
                 width=12
-            )
+            ), bg="accent1", fg="primary")
             btn.pack(pady=3)
         
         # Sound toggle
-        sound_frame = tk.LabelFrame(
+        sound_frame = self.themed(tk.LabelFrame(
             settings_window,
             text="Sound",
-            font=("Courier New", 11, "bold"),
-            fg=self.theme["primary"],
-            bg=self.theme["bg"]
-        )
+            font=("Courier New", 11, "bold")
+        ), fg="primary", bg="bg")
         sound_frame.pack(pady=10, padx=20, fill="x")
         
         self.sound_var = tk.BooleanVar(value=self.settings.get("sound_enabled", True))
-        sound_check = tk.Checkbutton(
+        sound_check = self.themed(tk.Checkbutton(
             sound_frame,
             text="Enable notification sound",
             variable=self.sound_var,
             command=self.toggle_sound,
-            font=("Courier New", 10),
-            fg=self.theme["primary"],
-            bg=self.theme["bg"],
-            selectcolor=self.theme["accent1"]
-        )
+            font=("Courier New", 10)
+        ), fg="primary", bg="bg", selectcolor="accent1")
         sound_check.pack(pady=5)
         
         # Timer Duration Settings
-        duration_frame = tk.LabelFrame(
+        duration_frame = self.themed(tk.LabelFrame(
             settings_window,
             text="Timer Duration (minutes)",
-            font=("Courier New", 11, "bold"),
-            fg=self.theme["primary"],
-            bg=self.theme["bg"]
-        )
+            font=("Courier New", 11, "bold")
+        ), fg="primary", bg="bg")
         duration_frame.pack(pady=10, padx=20, fill="x")
         
         # Work duration
-        work_duration_frame = tk.Frame(duration_frame, bg=self.theme["bg"])
+        work_duration_frame = self.themed(tk.Frame(duration_frame), bg="bg")
         work_duration_frame.pack(pady=5, padx=10, fill="x")
         
-        tk.Label(
+        self.themed(tk.Label(
             work_duration_frame,
             text="Work session:",
-            font=("Courier New", 10),
-            fg=self.theme["primary"],
-            bg=self.theme["bg"]
-        ).pack(side="left", padx=5)
+            font=("Courier New", 10)
+        ), fg="primary", bg="bg").pack(side="left", padx=5)
         
         self.work_minutes_var = tk.StringVar(value=str(self.settings.get("work_minutes", 25)))
-        work_entry = tk.Entry(
+        work_entry = self.themed(tk.Entry(
             work_duration_frame,
             textvariable=self.work_minutes_var,
             font=("Courier New", 10),
-            width=5,
-            bg=self.theme["bg"],
-            fg=self.theme["primary"]
-        )
+            width=5
+        ), bg="bg", fg="primary")
         work_entry.pack(side="left", padx=5)
         
-        tk.Label(
+        self.themed(tk.Label(
             work_duration_frame,
             text="minutes",
-            font=("Courier New", 10),
-            fg=self.theme["secondary"],
-            bg=self.theme["bg"]
-        ).pack(side="left", padx=5)
+            font=("Courier New", 10)
+        ), fg="secondary", bg="bg").pack(side="left", padx=5)
         
         # Break duration
-        break_duration_frame = tk.Frame(duration_frame, bg=self.theme["bg"])
+        break_duration_frame = self.themed(tk.Frame(duration_frame), bg="bg")
         break_duration_frame.pack(pady=5, padx=10, fill="x")
         
-        tk.Label(
+        self.themed(tk.Label(
             break_duration_frame,
             text="Break session:",
-            font=("Courier New", 10),
-            fg=self.theme["primary"],
-            bg=self.theme["bg"]
-        ).pack(side="left", padx=5)
+            font=("Courier New", 10)
+        ), fg="primary", bg="bg").pack(side="left", padx=5)
         
         self.break_minutes_var = tk.StringVar(value=str(self.settings.get("break_minutes", 5)))
-        break_entry = tk.Entry(
+        break_entry = self.themed(tk.Entry(
             break_duration_frame,
             textvariable=self.break_minutes_var,
             font=("Courier New", 10),
-            width=5,
-            bg=self.theme["bg"],
-            fg=self.theme["primary"]
-        )
+            width=5
+        ), bg="bg", fg="primary")
         break_entry.pack(side="left", padx=5)
         
-        tk.Label(
+        self.themed(tk.Label(
             break_duration_frame,
             text="minutes",
-            font=("Courier New", 10),
-            fg=self.theme["secondary"],
-            bg=self.theme["bg"]
-        ).pack(side="left", padx=5)
+            font=("Courier New", 10)
+        ), fg="secondary", bg="bg").pack(side="left", padx=5)
         
         # Save duration button
-        save_duration_btn = tk.Button(
+        save_duration_btn = self.themed(tk.Button(
             duration_frame,
             text="Save Timer Settings",
             command=self.save_timer_duration,
-            bg=self.theme["accent1"],
-            fg=self.theme["primary"],
             font=("Courier New", 9),
             relief="flat",
             cursor="hand2"
-        )
+        ), bg="accent1", fg="primary")
         save_duration_btn.pack(pady=8)
         
         # Saved goals management
-        goals_frame = tk.LabelFrame(
+        goals_frame = self.themed(tk.LabelFrame(
             settings_window,
             text="Saved Goals",
-            font=("Courier New", 11, "bold"),
-            fg=self.theme["primary"],
-            bg=self.theme["bg"]
-        )
+            font=("Courier New", 11, "bold")
+        ), fg="primary", bg="bg")
         goals_frame.pack(pady=10, padx=20, fill="both", expand=True)
         
-        # Listbox for saved goals
-        goals_list = tk.Listbox(
+        # Saved goals list (filled in by show_settings; only the visible rows are real)
+        goals_list = self.goals_list = self.themed(VirtualList(
             goals_frame,
-            font=("Courier New", 9),
-            bg=self.theme["bg"],
-            fg=self.theme["primary"],
-            selectbackground=self.theme["accent1"]
-        )
+            font=("Courier New", 9)
+        ), bg="bg")
+        self.themed(goals_list.listbox, bg="bg", fg="primary", selectbackground="accent1")
+        self.themed(goals_list.scrollbar, bg="accent1", troughcolor="bg")
         goals_list.pack(pady=5, padx=5, fill="both", expand=True)
         
-        for goal in self.settings.get("saved_goals", []):
-            goals_list.insert(tk.END, goal)
+        goal_buttons = self.themed(tk.Frame(goals_frame), bg="bg")
+        goal_buttons.pack(pady=5)
         
-        delete_btn = tk.Button(
-            goals_frame,
-            text="Delete Selected Goal",
+        delete_btn = self.themed(tk.Button(
+            goal_buttons,
+            text="Delete Selected",
             command=lambda: self.delete_goal(goals_list),
-            bg=self.theme["accent3"],
-            fg=self.theme["primary"],
             font=("Courier New", 9),
             relief="flat",
             cursor="hand2"
-        )
-        delete_btn.pack(pady=5)
+        ), bg="accent3", fg="primary")
+        delete_btn.pack(side="left", padx=5)
+        
+        import_btn = self.themed(tk.Button(
+            goal_buttons,
+            text="Import Goals...",
+            command=lambda: self.import_goals(goals_list),
+            font=("Courier New", 9),
+            relief="flat",
+            cursor="hand2"
+        ), bg="accent1", fg="primary")
+        import_btn.pack(side="left", padx=5)
         
         # Close button
-        close_btn = tk.Button(
+        close_btn = self.themed(tk.Button(
             settings_window,
             text="Close",
-            command=settings_window.destroy,
-            bg=self.theme["accent1"],
-            fg=self.theme["primary"],
+            command=settings_window.withdraw,
             font=("Courier New", 11, "bold"),
             relief="flat",
             cursor="hand2"
-        )
+        ), bg="accent1", fg="primary")
         close_btn.pack(pady=15)
     
-    def change_theme(self, theme_name, settings_window):
-        """Change color theme"""
+    def change_theme(self, theme_name):
+        """Change color theme, right away"""
         self.settings["current_theme"] = theme_name
         self.save_settings()
-        messagebox.showinfo("Theme Changed", f"Theme changed to {theme_name.capitalize()}!\nRestart the timer to see the full effect.")
-        settings_window.destroy()
+        self.apply_theme()
     
     def toggle_sound(self):
         """Toggle sound on/off"""
@@ -702,15 +1073,8 @@ class PomodoroTimer:
                 self.settings["break_minutes"] = break_mins
                 self.save_settings()
                 
-                # Update the timer
-                self.work_time = work_mins * 60
-                self.break_time = break_mins * 60
-                
-                # Reset current timer to new duration
-                if self.is_work_session:
-                    self.time_left = self.work_time
-                else:
-                    self.time_left = self.break_time
+                # Update the timer and reset the current session to its new duration
+                self.engine.set_durations(work_mins * 60, break_mins * 60)
                 
                 self.update_display()
                 
@@ -721,197 +1085,246 @@ class PomodoroTimer:
             messagebox.showwarning("Invalid Input", "Please enter valid numbers")
     
     def delete_goal(self, goals_list):
-        """Delete selected goal from saved goals"""
-        try:
-            selection = goals_list.curselection()
-            if selection:
-                index = selection[0]
-                goal = goals_list.get(index)
-                self.settings["saved_goals"].remove(goal)
-                self.save_settings()
-                goals_list.delete(index)
-                messagebox.showinfo("Deleted", f"Deleted: {goal}")
-        except:
+        """Delete the selected goals (any number) with one write of the goal library"""
+        goals = goals_list.selection()
+        if not goals:
             messagebox.showwarning("No Selection", "Please select a goal to delete")
+            return
+        try:
+            self.goal_library.remove_many(goals)
+        except OSError as e:
+            messagebox.showwarning("Not Deleted", f"Couldn't update the goal library:\n{e}")
+            return
+        self.settings["saved_goals"] = self.goal_library.recent(10)
+        self.save_settings()
+        # A big delete drops the fuzzy index; rebuild it off the Tk thread
+        self.goal_library.warm(background=True)
+        goals_list.remove_selected()
+        if len(goals) == 1:
+            messagebox.showinfo("Deleted", f"Deleted: {goals[0]}")
+        else:
+            messagebox.showinfo("Deleted", f"Deleted {len(goals)} goals")
+    
+    def import_goals(self, goals_list):
+        """Bulk-import goals from a text file (one per line) or a CSV (first column)"""
+        path = filedialog.askopenfilename(
+            title="Import goals",
+            filetypes=[("Text or CSV", "*.txt *.csv"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            added, duplicates = self.goal_library.import_file(path)
+        except (OSError, UnicodeDecodeError) as e:
+            messagebox.showwarning("Import Failed", f"Couldn't read that file:\n{e}")
+            return
+        self.goal_library.warm(background=True)
+        self.refresh_goals_list(goals_list)
+        messagebox.showinfo("Goals Imported", f"Added {added} goals ({duplicates} already saved)")
+    
+    def refresh_goals_list(self, goals_list):
+        goals_list.set_items(self.goal_library.recent())
     
     def show_message(self, message):
         """Display a PDA-friendly message"""
         self.message_label.config(text=message)
-        # Clear message after 4 seconds
-        self.root.after(4000, lambda: self.message_label.config(text=""))
+        # Clear message after 4 seconds (replacing the timer of any earlier message)
+        self.scheduler.schedule("clear_message", 4000, self.message_label.config, {"text": ""})
     
     def ask_for_goal(self):
-        """Show popup to ask for session goal"""
-        goal_window = tk.Toplevel(self.root)
-        goal_window.title("✨ Set Your Intention ✨")
-        goal_window.geometry("400x300")
-        goal_window.configure(bg=self.theme["bg"])
-        
-        # Center window
-        goal_window.update_idletasks()
-        x = (goal_window.winfo_screenwidth() // 2) - 200
-        y = (goal_window.winfo_screenheight() // 2) - 150
-        goal_window.geometry(f'400x300+{x}+{y}')
-        
-        # Make it modal
+        """Show popup to ask for session goal (built once, refreshed each time it opens)"""
+        self.build_goal_window()
+        self.goal_var.set("")
+        self.goal_entry.delete(0, tk.END)
+        
+        # Dropdown for saved goals, only when there are some
+        saved_goals = self.goal_library.recent(10)
+        if saved_goals:
+            self.goal_dropdown["values"] = saved_goals
+            for widget in self.goal_dropdown_widgets:
+                widget.pack(pady=5, before=self.goal_entry_label)
+        else:
+            for widget in self.goal_dropdown_widgets:
+                widget.pack_forget()
+        
+        self.present(self.goal_window)
+        # Make it modal (the grab needs the window to be mapped first)
+        self.goal_window.update_idletasks()
+        try:
+            self.goal_window.grab_set()
+        except tk.TclError:
+            self.scheduler.schedule("goal_grab", 20, self.goal_window.grab_set)
+        self.goal_entry.focus()
+    
+    def build_goal_window(self):
+        if self.goal_window is not None:
+            return
+        goal_window = self.goal_window = self.dialog("✨ Set Your Intention ✨", 400, 300)
         goal_window.transient(self.root)
-        goal_window.grab_set()
+        goal_window.protocol("WM_DELETE_WINDOW", self.hide_goal_window)
         
         # Title
-        title = tk.Label(
+        title = self.themed(tk.Label(
             goal_window,
             text="What's this session for?",
-            font=("Courier New", 13, "bold"),
-            fg=self.theme["primary"],
-            bg=self.theme["bg"]
-        )
+            font=("Courier New", 13, "bold")
+        ), fg="primary", bg="bg")
         title.pack(pady=20)
         
-        # Dropdown for saved goals
-        saved_goals = self.settings.get("saved_goals", [])
+        # Dropdown for saved goals (autocompletes from the whole library as you type)
+        dropdown_label = self.themed(tk.Label(
+            goal_window,
+            text="Pick a recent goal:",
+            font=("Courier New", 10)
+        ), fg="secondary", bg="bg")
         
-        if saved_goals:
-            dropdown_label = tk.Label(
-                goal_window,
-                text="Pick a recent goal:",
-                font=("Courier New", 10),
-                fg=self.theme["secondary"],
-                bg=self.theme["bg"]
-            )
-            dropdown_label.pack(pady=5)
-            
-            goal_var = tk.StringVar()
-            dropdown = ttk.Combobox(
-                goal_window,
-                textvariable=goal_var,
-                values=saved_goals,
-                font=("Courier New", 10),
-                width=35
-            )
-            dropdown.pack(pady=5)
-            
-            or_label = tk.Label(
-                goal_window,
-                text="- or -",
-                font=("Courier New", 10),
-                fg=self.theme["secondary"],
-                bg=self.theme["bg"]
-            )
-            or_label.pack(pady=5)
-        else:
-            goal_var = tk.StringVar()
+        self.goal_var = tk.StringVar()
+        dropdown = self.goal_dropdown = ttk.Combobox(
+            goal_window,
+            textvariable=self.goal_var,
+            font=("Courier New", 10),
+            width=35
+        )
+        
+        def autocomplete(event):
+            # Arrow keys and Enter move through / pick from the current list
+            if event.keysym in ("Up", "Down", "Return", "Escape"):
+                return
+            dropdown["values"] = self.goal_library.search(self.goal_var.get())
+        
+        dropdown.bind("<KeyRelease>", autocomplete)
+        
+        or_label = self.themed(tk.Label(
+            goal_window,
+            text="- or -",
+            font=("Courier New", 10)
+        ), fg="secondary", bg="bg")
+        # Packed by ask_for_goal when there are saved goals
+        self.goal_dropdown_widgets = (dropdown_label, dropdown, or_label)
         
         # Text entry for custom goal
-        entry_label = tk.Label(
+        entry_label = self.goal_entry_label = self.themed(tk.Label(
             goal_window,
             text="Type a new goal:",
-            font=("Courier New", 10),
-            fg=self.theme["secondary"],
-            bg=self.theme["bg"]
-        )
+            font=("Courier New", 10)
+        ), fg="secondary", bg="bg")
         entry_label.pack(pady=5)
         
-        goal_entry = tk.Entry(
+        goal_entry = self.goal_entry = self.themed(tk.Entry(
             goal_window,
             font=("Courier New", 11),
-            width=35,
-            bg=self.theme["bg"],
-            fg=self.theme["primary"]
-        )
+            width=35
+        ), bg="bg", fg="primary")
         goal_entry.pack(pady=5)
         
-        def set_goal():
-            # Get goal from either dropdown or text entry
-            goal = goal_entry.get().strip() or goal_var.get().strip()
-            
-            if goal:
-                self.current_goal = goal
-                self.goal_label.config(text=f"📌 {goal}")
-                
-                # Save to recent goals if new
-                if goal not in self.settings["saved_goals"]:
-                    self.settings["saved_goals"].insert(0, goal)
-                    # Keep only last 10 goals
-                    self.settings["saved_goals"] = self.settings["saved_goals"][:10]
-                    self.save_settings()
-                
-                goal_window.destroy()
-                # Actually start the timer now
-                self.is_running = True
-                self.update_timer()
-            else:
-                self.current_goal = ""
-                self.goal_label.config(text="")
-                goal_window.destroy()
-                # Start anyway without a goal
-                self.is_running = True
-                self.update_timer()
-        
         # Buttons
-        button_frame = tk.Frame(goal_window, bg=self.theme["bg"])
+        button_frame = self.themed(tk.Frame(goal_window), bg="bg")
         button_frame.pack(pady=20)
         
-        start_btn = tk.Button(
+        start_btn = self.themed(tk.Button(
             button_frame,
             text="Start ✨",
-            command=set_goal,
-            bg=self.theme["accent1"],
-            fg=self.theme["primary"],
+            command=self.set_goal,
             font=("Courier New", 11, "bold"),
             relief="flat",
             cursor="hand2",
             width=12
-        )
+        ), bg="accent1", fg="primary")
         start_btn.pack(side="left", padx=10)
         
-        skip_btn = tk.Button(
+        skip_btn = self.themed(tk.Button(
             button_frame,
             text="Skip",
-            command=lambda: (goal_window.destroy(), setattr(self, 'is_running', True), self.update_timer()),
-            bg=self.theme["accent2"],
-            fg=self.theme["primary"],
+            command=lambda: (self.hide_goal_window(), self.begin_countdown()),
             font=("Courier New", 11, "bold"),
             relief="flat",
             cursor="hand2",
             width=12
-        )
+        ), bg="accent2", fg="primary")
         skip_btn.pack(side="left", padx=10)
         
         # Bind Enter key to set goal
-        goal_entry.bind('<Return>', lambda e: set_goal())
+        goal_entry.bind('<Return>', lambda e: self.set_goal())
+    
+    def hide_goal_window(self):
+        self.scheduler.cancel("goal_grab")
+        self.goal_window.grab_release()
+        self.goal_window.withdraw()
+    
+    def set_goal(self):
+        # Get goal from either dropdown or text entry
+        self.choose_goal(self.goal_entry.get().strip() or self.goal_var.get().strip())
+    
+    def choose_goal(self, goal):
+        """Start the session with this goal (or none)"""
+        if goal:
+            self.current_goal = goal
+            self.goal_label.config(text=f"📌 {goal}")
+            
+            # Save to the goal library (or bump it to most recent)
+            try:
+                self.goal_library.add(goal)
+            except OSError as e:
+                print(f"Error saving goal: {e}")
+            self.settings["saved_goals"] = self.goal_library.recent(10)
+            self.save_settings()
+        else:
+            # Start anyway without a goal
+            self.current_goal = ""
+            self.goal_label.config(text="")
         
-        # Focus on text entry
-        goal_entry.focus()
+        if self.goal_window is not None:
+            self.hide_goal_window()
+        # Actually start the timer now
+        self.begin_countdown()
     
     def start_timer(self):
         if not self.is_running:
+            # Started during the pause after a session ended: move on to the next one first
+            self.scheduler.flush("switch_session")
             # Show goal popup first
             self.ask_for_goal()
     
+    def begin_countdown(self):
+        """Start (or resume) the deadline and kick off the tick loop"""
+        self.engine.start()
+        self.events.emit("start", **self.snapshot())
+        self.update_timer()
+    
     def pause_timer(self):
-        self.is_running = False
+        self.engine.pause()
+        self.scheduler.cancel("tick")
+        self.events.emit("pause", **self.snapshot())
+        self.update_display()
     
     def reset_timer(self):
-        self.is_running = False
-        if self.is_work_session:
-            self.time_left = self.work_time
-        else:
-            self.time_left = self.break_time
-        self.current_goal = ""
+        # A session that was started and is now thrown away still counts as history
+        self.log_session(completed=False)
+        self.events.emit("reset", **self.snapshot())
+        self.engine.reset()
+        self.scheduler.cancel("tick")
+        self.scheduler.cancel("switch_session")
         self.goal_label.config(text="")
         self.update_display()
     
     def update_timer(self):
-        if self.is_running and self.time_left > 0:
-            self.time_left -= 1
-            self.update_display()
-            self.root.after(1000, self.update_timer)
-        elif self.is_running and self.time_left == 0:
+        """Wake up, redraw from the deadline and sleep until the displayed second changes"""
+        if not self.is_running:
+            return
+        # Count time the machine spent asleep (the monotonic clock may not)
+        self.countdown.check_clock_jump()
+        self.update_display()
+        if self.countdown.finished():
             self.timer_finished()
+        else:
+            # Keyed, so a quick Start/Pause/Start can't leave two tick chains running
+            self.scheduler.schedule("tick", self.countdown.next_wake_ms(), self.update_timer)
     
     def timer_finished(self):
         """Called when timer reaches 0"""
-        self.is_running = False
+        self.log_session(completed=True)
+        work_completed = self.engine.finish()
+        self.events.emit("finished", finished="work" if work_completed else "break", **self.snapshot())
         
         # Play custom notification sound if enabled
         if self.settings.get("sound_enabled", True):
@@ -920,110 +1333,113 @@ class PomodoroTimer:
         # Show end message
         self.show_message(random.choice(self.end_messages))
         
-        # Increment session counter if work session completed
-        if self.is_work_session:
-            self.settings["total_sessions_today"] = self.settings.get("total_sessions_today", 0) + 1
+        # Update session counter if work session completed (counted on the day it ended)
+        if work_completed:
+            self.settings["total_sessions_today"] = self.sessions_today()
             self.settings["last_session_date"] = datetime.now().strftime("%Y-%m-%d")
             self.save_settings()
-            self.session_counter_label.config(text=f"Sessions today: {self.settings['total_sessions_today']}")
+            self.update_session_counter()
         
         # Show popup
         self.show_popup()
         
         # Switch session
-        self.root.after(2000, self.switch_session)
+        self.scheduler.schedule("switch_session", 2000, self.switch_session)
+    
+    def log_session(self, completed):
+        """Append the current session to the history log (if it was ever started)"""
+        record = self.engine.session_record(completed)
+        if record is None:
+            return
+        try:
+            self.history.append(record)
+            # Also picks up sessions logged meanwhile by another process (terminal mode)
+            self.stats.sync(self.history)
+        except Exception as e:
+            print(f"Error writing session history: {e}")
+        pushed, avoided = self.view.take_counts()
+        if self.profiler is not None:
+            print(f"Display: {pushed} widget updates, {avoided} unchanged ones skipped this session")
+    
+    def sessions_today(self):
+        """Completed work sessions today, from the stats (or the old settings counter)"""
+        count = self.stats.sessions_on(datetime.now().date())
+        if self.settings.get("last_session_date") != datetime.now().strftime("%Y-%m-%d"):
+            return count
+        # Sessions finished today before the history log existed only live in the old
+        # counter: whatever it has beyond the stats, worked out once and then added on
+        if "sessions_before_history" not in self.settings:
+            self.settings["sessions_before_history"] = max(0, self.settings.get("total_sessions_today", 0) - count)
+        return count + self.settings["sessions_before_history"]
+    
+    def update_session_counter(self):
+        self.session_counter_label.config(text=f"Sessions today: {self.sessions_today()}")
+    
+    def schedule_midnight_refresh(self):
+        """Refresh the session counter just after the next local midnight"""
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        delay_ms = int((midnight - now).total_seconds() * 1000) + 1000
+        self.scheduler.schedule("midnight", delay_ms, self.on_new_day)
+    
+    def on_new_day(self):
+        self.update_session_counter()
+        self.schedule_midnight_refresh()
     
     def play_notification_sound(self):
-        """Play the custom notification sound"""
-        import os
-        
-        # Check if custom sound exists
-        if os.path.exists(self.sound_path):
-            try:
-                # Try using pygame for mp3 support
-                import pygame
-                pygame.mixer.init()
-                pygame.mixer.music.load(self.sound_path)
-                pygame.mixer.music.play()
-            except:
-                try:
-                    # Fallback to playsound library
-                    from playsound import playsound
-                    playsound(self.sound_path, False)
-                except:
-                    # Final fallback to system beep
-                    try:
-                        winsound.MessageBeep(winsound.MB_ICONASTERISK)
-                    except:
-                        print('\a')
-        else:
-            # No custom sound, use system beep
-            try:
-                winsound.MessageBeep(winsound.MB_ICONASTERISK)
-            except:
-                print('\a')
+        """Play the custom notification sound (queued to the audio worker)"""
+        self.audio.play()
     
     def show_popup(self):
-        """Show a gentle popup reminder"""
-        popup = tk.Toplevel(self.root)
-        popup.title("✨ Timer Complete ✨")
-        popup.geometry("300x150")
-        popup.configure(bg=self.theme["bg"])
-        
-        # Center popup
-        popup.update_idletasks()
-        x = (popup.winfo_screenwidth() // 2) - 150
-        y = (popup.winfo_screenheight() // 2) - 75
-        popup.geometry(f'300x150+{x}+{y}')
-        
+        """Show a gentle popup reminder (one window, reused)"""
+        self.build_popup()
         if self.is_work_session:
             message = "Work session complete!\nTime for a break ☕"
         else:
             message = "Break complete!\nReady when you are 💜"
+        self.popup_label.config(text=message)
+        self.present(self.popup)
         
-        label = tk.Label(
+        # Auto close after 5 seconds
+        self.scheduler.schedule("close_popup", 5000, self.popup.withdraw)
+    
+    def build_popup(self):
+        if self.popup is not None:
+            return
+        popup = self.popup = self.dialog("✨ Timer Complete ✨", 300, 150)
+        
+        self.popup_label = self.themed(tk.Label(
             popup,
-            text=message,
-            font=("Courier New", 12),
-            fg=self.theme["primary"],
-            bg=self.theme["bg"]
-        )
-        label.pack(pady=30)
+            font=("Courier New", 12)
+        ), fg="primary", bg="bg")
+        self.popup_label.pack(pady=30)
         
-        button = tk.Button(
+        button = self.themed(tk.Button(
             popup,
             text="Okay ✨",
-            command=popup.destroy,
-            bg=self.theme["accent1"],
-            fg=self.theme["primary"],
+            command=self.close_popup,
             font=("Courier New", 11, "bold"),
             relief="flat",
             cursor="hand2"
-        )
+        ), bg="accent1", fg="primary")
         button.pack()
-        
-        # Auto close after 5 seconds
-        popup.after(5000, popup.destroy)
+    
+    def close_popup(self):
+        self.scheduler.cancel("close_popup")
+        self.popup.withdraw()
     
     def switch_session(self):
         """Switch between work and break"""
+        self.engine.switch_session()
+        self.goal_label.config(text="")
         if self.is_work_session:
-            # Switch to break
-            self.is_work_session = False
-            self.time_left = self.break_time
-            self.title_label.config(text="✨ Break Time ✨")
-            self.current_goal = ""
-            self.goal_label.config(text="")
-            self.show_message(random.choice(self.break_messages))
-        else:
-            # Switch to work
-            self.is_work_session = True
-            self.time_left = self.work_time
             self.title_label.config(text="✨ Work Time ✨")
-            self.current_goal = ""
-            self.goal_label.config(text="")
             self.show_message(random.choice(self.start_messages))
+        else:
+            self.title_label.config(text="✨ Break Time ✨")
+            self.show_message(random.choice(self.break_messages))
         
+        self.events.emit("switch", **self.snapshot())
         self.update_display()
     
     def update_display(self):
@@ -1031,11 +1447,15 @@ class PomodoroTimer:
         minutes = self.time_left // 60
         seconds = self.time_left % 60
         time_string = f"{minutes:02d}:{seconds:02d}"
-        self.timer_label.config(text=time_string)
+        self.view.set(self.timer_label, text=time_string)
         
-        # Update mini window if it exists
-        if self.mini_window and self.mini_window.winfo_exists():
-            self.mini_window.update_mini_display(time_string, self.current_goal)
+        # Let the sand fall (only grains that moved get redrawn)
+        fraction = self.sand_fraction()
+        self.sand.set_fraction(fraction)
+        
+        # Update mini window if it exists (it clears mini_window when destroyed)
+        if self.mini_window is not None:
+            self.mini_window.update_mini_display(time_string, self.current_goal, fraction)
     
     def create_mini_window(self):
         """Create or show the mini always-on-top window"""
@@ -1046,6 +1466,54 @@ class PomodoroTimer:
         
         # Minimize main window
         self.root.iconify()
+    
+    # ----- control socket (single instance, see control.py) -----
+    
+    def handle_control(self, request):
+        """Run a command forwarded by another launch or pda_ctl.py, and reply"""
+        command = request["command"]
+        running = self.is_running
+        if command == "start":
+            goal = request.get("goal")
+            if goal and not running:
+                self.scheduler.flush("switch_session")
+                self.choose_goal(goal)
+            elif not running:
+                # Same as pressing Start: the goal popup comes up, so bring the window up too
+                self.show_window()
+                self.start_timer()
+        elif command == "pause":
+            if running:
+                self.pause_timer()
+        elif command == "reset":
+            self.reset_timer()
+        elif command == "mini":
+            self.create_mini_window()
+        elif command == "show":
+            self.show_window()
+        return {"ok": True, "changed": self.is_running != running or command == "reset", "state": self.snapshot()}
+    
+    def snapshot(self):
+        """Timer state as plain data, for control replies and plugin events"""
+        return {
+            "session": "work" if self.is_work_session else "break",
+            "running": self.is_running,
+            "goal": self.current_goal,
+            "remaining": round(self.countdown.remaining(), 3),
+            "session_length": self.engine.session_length,
+            "session_count": self.session_count,
+            # Before warm-up, the settings count: loading the stats here would stall the
+            # Tk thread for a launch command or an early event
+            "sessions_today": (
+                self.sessions_today() if self._stats is not None
+                else self.settings.get("total_sessions_today", 0)
+            ),
+        }
+    
+    def show_window(self):
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
 
 
 class MiniWindow(tk.Toplevel):
@@ -1054,11 +1522,12 @@ class MiniWindow(tk.Toplevel):
         
         self.parent_timer = parent_timer
         self.theme = theme
+        self.bind("<Destroy>", self.on_destroy)
         
         # Window setup
         self.title("⏳")
         self.geometry("180x160")  # Increased from 140 to 160 to fit button
-        self.configure(bg=theme["bg"])
+        self.themed(self, bg="bg")
         self.attributes('-topmost', True)
         self.resizable(False, False)
         
@@ -1076,51 +1545,47 @@ class MiniWindow(tk.Toplevel):
         self.bind('<Configure>', self.save_position)
         
         # Goal label
-        self.goal_label = tk.Label(
+        self.goal_label = self.themed(tk.Label(
             self,
             text="",
             font=("Courier New", 8),
-            fg=theme["primary"],
-            bg=theme["bg"],
             wraplength=160,
             height=2
-        )
+        ), fg="primary", bg="bg")
         self.goal_label.pack(pady=3)
         
         # Tiny hourglass
-        self.canvas = tk.Canvas(
+        self.canvas = self.themed(tk.Canvas(
             self,
             width=40,
             height=50,
-            bg=theme["bg"],
             highlightthickness=0
-        )
+        ), bg="bg")
         self.canvas.pack(pady=3)
         self.draw_tiny_hourglass()
         
         # Timer text
-        self.time_label = tk.Label(
+        self.time_label = self.themed(GlyphDisplay(
             self,
-            text="25:00",
-            font=("Courier New", 16, "bold"),
-            fg=theme["primary"],
-            bg=theme["bg"]
-        )
+            scale=3,
+            text="25:00"
+        ), fg="primary", bg="bg")
         self.time_label.pack()
         
         # Restore button
-        restore_btn = tk.Button(
+        restore_btn = self.themed(tk.Button(
             self,
             text="Restore",
             command=self.restore_main,
-            bg=theme["accent1"],
-            fg=theme["primary"],
             font=("Courier New", 8),
             relief="flat",
             cursor="hand2"
-        )
+        ), bg="accent1", fg="primary")
         restore_btn.pack(pady=3)
         
+    def themed(self, widget, **roles):
+        return self.parent_timer.themed(widget, **roles)
+    
     def save_position(self, event):
         """Save mini window position"""
         if event.widget == self:
@@ -1129,50 +1594,22 @@ class MiniWindow(tk.Toplevel):
         
     def draw_tiny_hourglass(self):
         """Draw a tiny version of the hourglass"""
-        c = self.canvas
-        scale = 3
-        base_x = 8
-        base_y = 5
-        
-        rim_color = self.theme["accent3"]
-        sand_color = self.theme["accent1"]
-        
-        # Simplified tiny hourglass
-        coords_rim_top = [(2,1), (3,1), (4,1), (5,1), (6,1), (7,1)]
-        coords_glass_top = [(3,2), (4,2), (5,2), (6,2), (4,3), (5,3)]
-        coords_middle = [(4,4), (5,4)]
-        coords_glass_bottom = [(4,5), (5,5), (3,6), (4,6), (5,6), (6,6)]
-        coords_rim_bottom = [(2,7), (3,7), (4,7), (5,7), (6,7), (7,7)]
-        
-        # Draw all parts
-        for x, y in coords_rim_top + coords_rim_bottom:
-            c.create_rectangle(
-                base_x + x*scale, base_y + y*scale,
-                base_x + x*scale + scale, base_y + y*scale + scale,
-                fill=rim_color, outline=""
-            )
-        
-        for x, y in coords_glass_top + coords_middle + coords_glass_bottom:
-            c.create_rectangle(
-                base_x + x*scale, base_y + y*scale,
-                base_x + x*scale + scale, base_y + y*scale + scale,
-                fill=sand_color, outline=""
-            )
-        
-        # Sparkle
-        c.create_rectangle(
-            base_x + 1*scale, base_y + 2*scale,
-            base_x + 1*scale + scale, base_y + 2*scale + scale,
-            fill="#ffd700", outline=""
-        )
+        draw_sprite(self.canvas, "tiny_hourglass", base_x=8, base_y=5, scale=3, theme=self.theme)
+        self.parent_timer.theme_binder.bind_canvas(self.canvas)
+        self.sand = SandAnimation(self.canvas, "tiny_hourglass", base_x=8, base_y=5, scale=3, theme=self.theme)
+        self.sand.set_fraction(self.parent_timer.sand_fraction())
     
-    def update_mini_display(self, time_string, goal):
-        """Update the mini window's time and goal display"""
-        self.time_label.config(text=time_string)
-        if goal:
-            self.goal_label.config(text=f"📌 {goal}")
-        else:
-            self.goal_label.config(text="")
+    def update_mini_display(self, time_string, goal, fraction):
+        """Update the mini window's time, sand and goal display"""
+        view = self.parent_timer.view
+        view.set(self.time_label, text=time_string)
+        self.sand.set_fraction(fraction)
+        view.set(self.goal_label, text=f"📌 {goal}" if goal else "")
+    
+    def on_destroy(self, event):
+        # <Destroy> also fires for every child widget
+        if event.widget is self and self.parent_timer.mini_window is self:
+            self.parent_timer.mini_window = None
     
     def restore_main(self):
         """Restore the main window"""
@@ -1180,8 +1617,84 @@ class MiniWindow(tk.Toplevel):
         self.destroy()
 
 
-# Create and run the app
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="A gentle, low-pressure Pomodoro timer")
+    parser.add_argument(
+        "--startup-check", action="store_true",
+        help="start, print startup timings as JSON once warmed up, and exit (1 if over budget)"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="time startup phases and timer ticks, count widgets and canvas items, print JSON and exit"
+    )
+    parser.add_argument(
+        "--store", choices=["json", "sqlite"],
+        help="where settings, goals and history live (default: sqlite once pomodoro.db exists, else json)"
+    )
+    parser.add_argument("--profile-seconds", type=float, default=3.0, help="how long to let the timer tick (default 3)")
+    parser.add_argument("--profile-output", metavar="PATH", help="write the profile JSON here instead of stdout")
+    parser.add_argument(
+        "--standalone", action="store_true",
+        help="don't hand over to (or act as) the single running instance"
+    )
+    parser.add_argument(
+        "command", nargs="?", choices=control.COMMANDS,
+        help="send to the running instance (or, for start/mini/show, run once started)"
+    )
+    parser.add_argument("goal", nargs="?", help="goal for start")
+    args = parser.parse_args(argv)
+    
+    # A second launch hands its command to the first and exits before Tk is loaded
+    server = None
+    if not (args.standalone or args.profile or args.startup_check) and control.available():
+        server = control.ControlServer()
+        if not server.claim():
+            try:
+                reply = control.send(args.command or "show", args.goal, path=server.path)
+            except OSError as e:
+                sys.exit(f"Another instance holds {server.path}.lock but isn't answering ({e})")
+            print(control.describe(reply))
+            sys.exit(0 if reply.get("ok") else 1)
+        if args.command in ("status", "pause", "reset"):
+            server.close()
+            sys.exit("Dreamy Timer isn't running")
+    
     root = tk.Tk()
-    app = PomodoroTimer(root)
+    profiler = HotPathProfiler() if args.profile else None
+    app = PomodoroTimer(root, profiler=profiler, store=args.store)
+    
+    if server is not None:
+        app.control = server
+        server.attach(
+            app.handle_control,
+            lambda sock, callback: root.tk.createfilehandler(sock, tk.READABLE, lambda *_: callback()),
+            root.tk.deletefilehandler,
+        )
+        if args.command:
+            request = {"command": args.command, "goal": args.goal}
+            app.scheduler.schedule("launch_command", 0, app.handle_control, request)
+    
+    if args.profile:
+        def wait_for_warm_up():
+            if app.startup.warm_up_ms is None:
+                app.scheduler.schedule("profile_wait", 20, wait_for_warm_up)
+                return
+            profile_run(app, args.profile_seconds, args.profile_output)
+        app.scheduler.schedule("profile_wait", 20, wait_for_warm_up)
+    
+    if args.startup_check:
+        def finish_check():
+            if app.startup.warm_up_ms is None:
+                app.scheduler.schedule("startup_check", 20, finish_check)
+                return
+            print(json.dumps(app.startup.report(), indent=2))
+            root.destroy()
+            sys.exit(1 if app.startup.over_budget else 0)
+        app.scheduler.schedule("startup_check", 20, finish_check)
+    
     root.mainloop()
+
+
+# Create and run the app
+if __name__ == "__main__":
+    main()
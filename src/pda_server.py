@@ -0,0 +1,299 @@
+"""Shared team timer: one pomodoro, broadcast to everyone over Server-Sent Events
+
+    python src/pda_server.py                     # http://127.0.0.1:8765
+    python src/pda_server.py --host 0.0.0.0      # whole LAN (there is no auth!)
+
+Endpoints:
+    GET  /state                  current state as JSON
+    GET  /events                 SSE stream: a "state" event now and on every change
+    POST /start[?goal=...]       also accepts a JSON body {"goal": "..."}
+    POST /pause, /reset, /skip
+
+There are no per-second ticks. A state carries the wall-clock deadline, so clients
+count down on their own. The server only sends when something changes (start,
+pause, reset, skip, end of a session), plus an optional keep-alive comment. Each
+message is encoded once and written to every subscriber's buffer. Between
+transitions, connected clients cost nothing but an idle socket each.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from messages import BREAK_MESSAGES, END_MESSAGES, START_MESSAGES
+from timer_engine import PomodoroEngine
+
+# Subscribers that stop reading get dropped rather than buffered forever
+MAX_BUFFERED_BYTES = 64 * 1024
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class TimerServer:
+    def __init__(self, engine, history_dir=None, heartbeat=15.0):
+        self.engine = engine
+        self.history_dir = history_dir
+        self.heartbeat = heartbeat
+        self.subscribers = set()
+        self.version = 0
+        self.broadcasts = 0
+        self.dropped = 0
+        self.message = START_MESSAGES[0]
+        self._transition = None
+        self._history = None
+
+    # ----- timer state -----
+
+    def state(self):
+        engine = self.engine
+        now = time.time()
+        remaining = engine.countdown.remaining()
+        return {
+            "version": self.version,
+            "session": "work" if engine.is_work_session else "break",
+            "running": engine.is_running,
+            "goal": engine.goal,
+            "remaining": round(remaining, 3),
+            # Wall-clock deadline; clients should correct by (their clock - server_time)
+            "deadline": round(now + remaining, 3) if engine.is_running else None,
+            "session_length": engine.session_length,
+            "session_count": engine.session_count,
+            "message": self.message,
+            "server_time": round(now, 3),
+            "subscribers": len(self.subscribers),
+        }
+
+    def changed(self):
+        """Re-arm the one transition timer and tell every subscriber about the new state"""
+        self.version += 1
+        if self._transition is not None:
+            self._transition.cancel()
+            self._transition = None
+        if self.engine.is_running:
+            loop = asyncio.get_running_loop()
+            self._transition = loop.call_later(self.engine.countdown.remaining(), self.on_deadline)
+        self.broadcast("state", self.state())
+
+    def on_deadline(self):
+        self._transition = None
+        countdown = self.engine.countdown
+        countdown.check_clock_jump()
+        if not countdown.finished():
+            # Woken early (or the deadline moved): just re-arm
+            self._transition = asyncio.get_running_loop().call_later(countdown.remaining(), self.on_deadline)
+            return
+        self.log_session(completed=True)
+        self.engine.advance()
+        self.message = random.choice(END_MESSAGES)
+        self.changed()
+
+    def command(self, name, goal=None):
+        engine = self.engine
+        if name == "start":
+            if engine.is_running:
+                return False
+            engine.start(goal)
+            self.message = random.choice(START_MESSAGES if engine.is_work_session else BREAK_MESSAGES)
+        elif name == "pause":
+            if not engine.is_running:
+                return False
+            engine.pause()
+        elif name == "reset":
+            self.log_session(completed=False)
+            engine.reset()
+        elif name == "skip":
+            self.log_session(completed=False)
+            engine.switch_session()
+        else:
+            raise KeyError(name)
+        self.changed()
+        return True
+
+    def log_session(self, completed):
+        record = self.engine.session_record(completed)
+        if record is None or not self.history_dir:
+            return
+        try:
+            if self._history is None:
+                from history import SessionLog
+                self._history = SessionLog(self.history_dir)
+            self._history.append(record)
+        except Exception as e:
+            print(f"Error writing session history: {e}")
+
+    # ----- fan-out -----
+
+    def broadcast(self, event, data):
+        payload = f"event: {event}\nid: {self.version}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+        self._write_all(payload)
+        self.broadcasts += 1
+
+    def _write_all(self, payload):
+        slow = []
+        for writer in self.subscribers:
+            transport = writer.transport
+            if transport.is_closing() or transport.get_write_buffer_size() > MAX_BUFFERED_BYTES:
+                slow.append(writer)
+                continue
+            transport.write(payload)
+        for writer in slow:
+            self.subscribers.discard(writer)
+            writer.transport.abort()
+            self.dropped += 1
+
+    async def keep_alive(self):
+        # Keeps proxies from timing out idle streams; also a chance to spot clock jumps
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            if self.subscribers:
+                self._write_all(b": ping\n\n")
+            if self.engine.is_running and self.engine.countdown.check_clock_jump():
+                self.changed()
+
+    # ----- HTTP -----
+
+    async def handle(self, reader, writer):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        try:
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            self.respond(writer, 400, {"error": "bad request"})
+            return
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+
+        if method == "GET" and url.path == "/events":
+            await self.stream(reader, writer)
+        elif method == "GET" and url.path == "/state":
+            self.respond(writer, 200, self.state())
+        elif url.path.strip("/") in ("start", "pause", "reset", "skip"):
+            if method != "POST":
+                self.respond(writer, 405, {"error": "use POST"})
+                return
+            goal = query.get("goal", [None])[0]
+            try:
+                length = int(headers.get("content-length") or 0)
+                if length < 0:
+                    raise ValueError(length)
+            except ValueError:
+                self.respond(writer, 400, {"error": "bad Content-Length"})
+                return
+            if length:
+                try:
+                    body = await reader.readexactly(length)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    writer.close()
+                    return
+                try:
+                    goal = json.loads(body).get("goal", goal)
+                except (ValueError, AttributeError):
+                    self.respond(writer, 400, {"error": "body must be a JSON object"})
+                    return
+            if goal is not None and not isinstance(goal, str):
+                # It ends up in the history and the stats, keyed by goal
+                self.respond(writer, 400, {"error": "goal must be a string"})
+                return
+            changed = self.command(url.path.strip("/"), goal)
+            self.respond(writer, 200, dict(self.state(), changed=changed))
+        else:
+            self.respond(writer, 404, {"error": "not found"})
+
+    def respond(self, writer, status, data):
+        body = json.dumps(data).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            "Connection: close\r\n\r\n".encode() + body
+        )
+        writer.close()
+
+    async def stream(self, reader, writer):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Access-Control-Allow-Origin: *\r\n"
+            b"Connection: keep-alive\r\n\r\n"
+            + f"event: state\nid: {self.version}\ndata: {json.dumps(self.state(), separators=(',', ':'))}\n\n".encode()
+        )
+        self.subscribers.add(writer)
+        try:
+            # Nothing more is expected from the client; this just waits for it to hang up
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+
+def raise_file_limit():
+    """Allow as many open sockets as the system permits (10k clients need 10k fds)"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    # An unlimited hard limit still has a ceiling (macOS refuses more than OPEN_MAX,
+    # 10240), so try from big to small and keep the first one the kernel accepts
+    for target in (hard, 1 << 20, 65536, 10240):
+        if target == resource.RLIM_INFINITY or target <= soft:
+            continue
+        if hard != resource.RLIM_INFINITY and target > hard:
+            continue
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+            return
+        except (ValueError, OSError):
+            continue
+
+
+async def serve(args):
+    engine = PomodoroEngine(round(args.work * 60), round(args.break_minutes * 60), auto_continue=args.auto)
+    timer = TimerServer(engine, history_dir=args.history, heartbeat=args.heartbeat)
+    server = await asyncio.start_server(timer.handle, args.host, args.port, backlog=4096)
+    print(f"Shared timer on http://{args.host}:{args.port}/  (events at /events)", flush=True)
+    # Keep a reference so the task isn't garbage collected
+    keep_alive = asyncio.create_task(timer.keep_alive()) if args.heartbeat > 0 else None
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if keep_alive is not None:
+            keep_alive.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared pomodoro timer over Server-Sent Events")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--work", type=float, default=25, help="work minutes (default 25)")
+    parser.add_argument("--break", dest="break_minutes", type=float, default=5, help="break minutes (default 5)")
+    parser.add_argument("--auto", action="store_true", help="roll straight into the next session")
+    parser.add_argument("--heartbeat", type=float, default=15.0, help="seconds between keep-alive comments (0 = off)")
+    parser.add_argument("--history", metavar="DIR", help="log the shared sessions to this history folder")
+    args = parser.parse_args(argv)
+
+    raise_file_limit()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Pixel data for the canvas artwork, built without touching Tk
+
+Everything here returns plain Python data so it can be computed once and cached;
+the Tk side only has to turn the result into a single image or a few canvas items.
+"""
+import math
+
+
+# Moon and sparkles on the background, as (x0, y0, x1, y1, colour) ovals
+BACKGROUND_MOON = [(300, 40, 360, 100, "#fff8dc")]
+BACKGROUND_SPARKLES = [(x, y, x + 4, y + 4, "#ffd700") for x, y in [(80, 120), (120, 90), (200, 140), (350, 180)]]
+BACKGROUND_STARS = [(x, y, x + 2, y + 2, "#ffffff") for x, y in [(50, 200), (400, 150), (100, 500), (380, 450), (150, 350)]]
+BACKGROUND_OVALS = BACKGROUND_MOON + BACKGROUND_SPARKLES + BACKGROUND_STARS
+
+
+def _oval_spans(ovals):
+    """Rasterise ovals into {row: [(start_x, end_x, colour), ...]} in drawing order"""
+    spans = {}
+    for x0, y0, x1, y1, colour in ovals:
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        rx, ry = (x1 - x0) / 2, (y1 - y0) / 2
+        for y in range(y0, y1):
+            # Use pixel centres, like Tk does when it fills an oval
+            dy = (y + 0.5 - cy) / ry
+            if dy * dy > 1:
+                continue
+            half = rx * (1 - dy * dy) ** 0.5
+            start = max(x0, int(round(cx - half)))
+            end = min(x1, int(round(cx + half)))
+            if start < end:
+                spans.setdefault(y, []).append((start, end, colour))
+    return spans
+
+
+def background_photo_data(width, height, top_rgb, bottom_rgb, ovals=BACKGROUND_OVALS):
+    """Build the gradient + moon + sparkles as PhotoImage.put() data (one row per brace group)
+
+    top_rgb/bottom_rgb are 16-bit (r, g, b) tuples, as returned by winfo_rgb().
+    """
+    r1, g1, b1 = top_rgb
+    r2, g2, b2 = bottom_rgb
+    r_ratio = (r2 - r1) / height
+    g_ratio = (g2 - g1) / height
+    b_ratio = (b2 - b1) / height
+
+    spans = _oval_spans(ovals)
+    rows = []
+    for i in range(height):
+        colour = "#%02x%02x%02x" % (
+            int(r1 + r_ratio * i) >> 8,
+            int(g1 + g_ratio * i) >> 8,
+            int(b1 + b_ratio * i) >> 8
+        )
+        row = [colour] * width
+        for start, end, fill in spans.get(i, ()):
+            row[start:end] = [fill] * (end - start)
+        rows.append("{" + " ".join(row) + "}")
+    return " ".join(rows)
+
+
+# Sprites are lists of (role, pixels) layers in painting order; later layers paint over
+# earlier ones. Roles are theme keys, apart from "sparkle" which is always gold.
+SPARKLE_COLOR = "#ffd700"
+
+def _row(y, x0, x1):
+    return [(x, y) for x in range(x0, x1 + 1)]
+
+SPRITES = {
+    "hourglass": [
+        ("sparkle", [(1, 3), (0, 4), (2, 4), (18, 5), (19, 6), (2, 15), (1, 16), (17, 14), (18, 15)]),
+        # Top rim
+        ("accent3", _row(2, 5, 14) + _row(3, 4, 15)),
+        # Glass outline top (the sand itself is animated, see SAND_CELLS)
+        ("secondary", _row(4, 6, 13) + _row(5, 7, 12) + _row(6, 8, 11) + _row(7, 9, 10)),
+        # Middle
+        ("bg", [(9, 8), (10, 8), (9, 9), (10, 9)]),
+        # Glass outline bottom
+        ("secondary", _row(10, 9, 10) + _row(11, 8, 11) + _row(12, 7, 12) + _row(13, 6, 13) + _row(14, 6, 13) + _row(15, 6, 13)),
+        # Bottom rim
+        ("accent3", _row(16, 4, 15) + _row(17, 5, 14)),
+    ],
+    "tiny_hourglass": [
+        ("accent3", _row(1, 2, 7) + _row(7, 2, 7)),
+        # Neck (the chambers are animated, see SAND_CELLS)
+        ("accent1", [(4, 4), (5, 4)]),
+        ("sparkle", [(1, 2)]),
+    ],
+}
+
+
+
+def _centre_out(cells, centre):
+    return sorted(cells, key=lambda xy: abs(xy[0] + 0.5 - centre))
+
+def _grains(role, cells):
+    return [(role, xy) for xy in cells]
+
+# Sand grains per sprite as (role, (x, y)): (top chamber in draining order, bottom
+# chamber in filling order). Drawn over the glass, every grain together gives the
+# original static picture. The chambers needn't hold the same number of grains; each
+# shows its share of the time left.
+SAND_CELLS = {
+    "hourglass": (
+        _grains("accent1", _row(5, 7, 12)) + _grains("accent2", _row(6, 8, 11)),
+        _grains("accent1", _centre_out(_row(15, 8, 11), 10) + _centre_out(_row(14, 8, 11), 10)),
+    ),
+    "tiny_hourglass": (
+        _grains("accent1", _row(2, 3, 6) + [(4, 3), (5, 3)]),
+        _grains("accent1", [(4, 5), (5, 5)] + _centre_out(_row(6, 3, 6), 5)),
+    ),
+}
+
+
+class SandGauge:
+    """Works out which sand grains are showing for a fraction of time left
+
+    update() only reports the grains that changed since the previous call, so the
+    caller can touch just those canvas items on each tick.
+    """
+
+    def __init__(self, name):
+        self.top, self.bottom = SAND_CELLS[name]
+        # Cells are indexed top chamber first, then bottom chamber
+        grains = self.top + self.bottom
+        self.cells = [xy for _, xy in grains]
+        self.roles = [role for role, _ in grains]
+        self.level = None  # (grains in the top chamber, grains in the bottom one)
+
+    def levels_for(self, fraction):
+        def share(grains, part):
+            return min(grains, max(0, int(math.ceil(part * grains - 1e-9))))
+        return share(len(self.top), fraction), len(self.bottom) - share(len(self.bottom), fraction)
+
+    def update(self, fraction):
+        """Return [(cell_index, visible), ...] for grains whose visibility changed"""
+        level = self.levels_for(fraction)
+        old = self.level
+        if level == old:
+            return []
+        self.level = level
+        top, bottom = level
+        grains = len(self.top)
+        if old is None:
+            # First frame: everything needs a state
+            drained, landed = range(grains), range(len(self.bottom))
+        else:
+            drained = range(grains - max(top, old[0]), grains - min(top, old[0]))
+            landed = range(min(bottom, old[1]), max(bottom, old[1]))
+        # The top drains from its first grain on, the bottom fills from its first grain on
+        updates = [(index, index >= grains - top) for index in drained]
+        updates.extend((grains + index, index < bottom) for index in landed)
+        return updates
+
+
+def flatten_layers(layers):
+    """Resolve overdraw: {(x, y): role} with the last layer to paint a pixel winning"""
+    pixels = {}
+    for role, coords in layers:
+        for xy in coords:
+            pixels[xy] = role
+    return pixels
+
+
+def merge_pixels(pixels):
+    """Merge a {(x, y): role} map into as few rectangles as a greedy pass allows
+
+    Each row is cut into horizontal runs of one role, then runs with the same role and
+    span on consecutive rows are stacked into one rectangle. Returns a list of
+    (role, x0, y0, x1, y1) in pixel units with exclusive end coordinates.
+    """
+    runs_by_row = {}
+    for y in sorted({y for _, y in pixels}):
+        xs = sorted(x for x, py in pixels if py == y)
+        runs = []
+        for x in xs:
+            role = pixels[(x, y)]
+            if runs and runs[-1][1] == x and runs[-1][2] == role:
+                runs[-1][1] = x + 1
+            else:
+                runs.append([x, x + 1, role])
+        runs_by_row[y] = runs
+
+    rects = []
+    open_rects = {}  # (x0, x1, role) -> rect still growing downwards
+    for y in sorted(runs_by_row):
+        still_open = {}
+        for x0, x1, role in runs_by_row[y]:
+            rect = open_rects.get((x0, x1, role))
+            if rect is not None and rect[4] == y:
+                rect[4] = y + 1
+            else:
+                rect = [role, x0, y, x1, y + 1]
+                rects.append(rect)
+            still_open[(x0, x1, role)] = rect
+        open_rects = still_open
+    return [tuple(rect) for rect in rects]
+
+
+def expand_rects(rects):
+    """Inverse of merge_pixels, used to check that merging is lossless"""
+    pixels = {}
+    for role, x0, y0, x1, y1 in rects:
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                pixels[(x, y)] = role
+    return pixels
+
+
+_compiled_sprites = {}
+
+def compile_sprite(name):
+    """Merged rectangles for a named sprite (compiled once, then cached)"""
+    rects = _compiled_sprites.get(name)
+    if rects is None:
+        rects = merge_pixels(flatten_layers(SPRITES[name]))
+        _compiled_sprites[name] = rects
+    return rects
+
+
+def role_colour(theme, role):
+    return SPARKLE_COLOR if role == "sparkle" else theme[role]
+
+
+# Timer digits in the style of the Minecraft font (5x7, colon 1x7), "#" = ink
+GLYPHS = {
+    "0": (".###.", "#...#", "#..##", "#.#.#", "##..#", "#...#", ".###."),
+    "1": ("..#..", ".##..", "..#..", "..#..", "..#..", "..#..", "#####"),
+    "2": (".###.", "#...#", "....#", "..##.", ".#...", "#...#", "#####"),
+    "3": (".###.", "#...#", "....#", "..##.", "....#", "#...#", ".###."),
+    "4": ("...##", "..#.#", ".#..#", "#...#", "#####", "....#", "....#"),
+    "5": ("#####", "#....", "####.", "....#", "....#", "#...#", ".###."),
+    "6": ("..##.", ".#...", "#....", "####.", "#...#", "#...#", ".###."),
+    "7": ("#####", "#...#", "....#", "...#.", "..#..", "..#..", "..#.."),
+    "8": (".###.", "#...#", "#...#", ".###.", "#...#", "#...#", ".###."),
+    "9": (".###.", "#...#", "#...#", ".####", "....#", "...#.", ".##.."),
+    ":": (".", "#", "#", ".", ".", "#", "#"),
+}
+GLYPH_HEIGHT = 7
+
+_compiled_glyphs = {}
+
+def compile_glyph(char):
+    """(width, merged ink rectangles) for a timer glyph, in glyph pixels (cached)"""
+    glyph = _compiled_glyphs.get(char)
+    if glyph is None:
+        rows = GLYPHS[char]
+        ink = {(x, y): "ink" for y, row in enumerate(rows) for x, cell in enumerate(row) if cell == "#"}
+        glyph = _compiled_glyphs[char] = (len(rows[0]), merge_pixels(ink))
+    return glyph
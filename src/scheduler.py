@@ -0,0 +1,61 @@
+class CallbackScheduler:
+    """Keyed after() callbacks: at most one pending callback per key
+
+    Scheduling a key that is already pending replaces the old callback, so a chain
+    like the timer tick can never run twice in parallel and a newer message can't be
+    cleared by an older timer. `widget` is anything with Tk's after/after_cancel.
+    """
+
+    def __init__(self, widget):
+        self.widget = widget
+        self._pending = {}  # key -> (after id, callback, args)
+        self.scheduled = 0
+        self.replaced = 0
+        self.cancelled = 0
+
+    def __len__(self):
+        """Callbacks waiting to run"""
+        return len(self._pending)
+
+    def __contains__(self, key):
+        return key in self._pending
+
+    def keys(self):
+        return list(self._pending)
+
+    def schedule(self, key, delay_ms, callback, *args):
+        """Run callback(*args) after delay_ms, replacing anything pending under key"""
+        if key in self._pending:
+            self.widget.after_cancel(self._pending.pop(key)[0])
+            self.replaced += 1
+        after_id = self.widget.after(max(0, int(delay_ms)), self._fire, key)
+        self._pending[key] = (after_id, callback, args)
+        self.scheduled += 1
+        return key
+
+    def cancel(self, key):
+        """Drop a pending callback; returns True if there was one"""
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return False
+        self.widget.after_cancel(entry[0])
+        self.cancelled += 1
+        return True
+
+    def flush(self, key):
+        """Run a pending callback right now instead of waiting for it"""
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return False
+        self.widget.after_cancel(entry[0])
+        entry[1](*entry[2])
+        return True
+
+    def cancel_all(self):
+        for key in list(self._pending):
+            self.cancel(key)
+
+    def _fire(self, key):
+        entry = self._pending.pop(key, None)
+        if entry is not None:
+            entry[1](*entry[2])
@@ -0,0 +1,240 @@
+"""Optional SQLite storage: settings, goals and session history in one database
+
+Selected with --store sqlite (or PDA_POMODORO_STORE=sqlite). Once pomodoro.db exists
+it is used by default. The first open imports pomodoro_settings.json, the goal file
+and the session history in a single transaction. The old files are left untouched.
+
+The database runs in WAL mode, so readers never block the writer. Every write is a
+short BEGIN IMMEDIATE transaction, and other processes wait (busy timeout) rather
+than fail. Settings are stored one row per key and only changed keys are written.
+Two instances that change different settings therefore don't undo each other,
+which the whole-file JSON store couldn't avoid.
+"""
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+
+from goals import GoalLibrary, normalise
+from storage import DB_FILE
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL, updated REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS goals (key TEXT PRIMARY KEY, goal TEXT NOT NULL, used INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS goals_used ON goals (used);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    start REAL NOT NULL,
+    end REAL,
+    type TEXT,
+    goal TEXT,
+    pauses INTEGER,
+    focus INTEGER,
+    completed INTEGER
+);
+CREATE INDEX IF NOT EXISTS sessions_start ON sessions (start);
+"""
+
+SESSION_COLUMNS = "start, end, type, goal, pauses, focus, completed"
+
+
+def _session_row(record):
+    return (
+        record["start"], record.get("end"), record.get("type"), record.get("goal"),
+        record.get("pauses"), record.get("focus"), int(bool(record.get("completed"))),
+    )
+
+
+def _session_record(row):
+    start, end, kind, goal, pauses, focus, completed = row
+    return {
+        "start": start, "end": end, "type": kind, "goal": goal,
+        "pauses": pauses, "focus": focus, "completed": bool(completed),
+    }
+
+
+class SQLiteStore:
+    def __init__(self, path=DB_FILE, busy_timeout_ms=5000):
+        self.path = path
+        # Autocommit mode: transactions are opened explicitly by transaction()
+        self.db = sqlite3.connect(path, timeout=busy_timeout_ms / 1000, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL can't corrupt the database; a power cut may lose the last commit
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self._saved_settings = {}  # key -> JSON text as last read or written
+
+    def close(self):
+        self.db.close()
+
+    @contextmanager
+    def transaction(self):
+        """Take the write lock up front, so a transaction never fails half-way on a busy database"""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.db
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def _meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    # ----- migration -----
+
+    def migrate(self, settings_file, goals_file, history_dir):
+        """Import the JSON settings, goal file and history log once; returns True if it did"""
+        if self._meta("migrated") is not None:
+            return False
+        with self.transaction() as db:
+            # Another process may have migrated while we waited for the lock
+            if self._meta("migrated") is not None:
+                return False
+            if os.path.exists(settings_file):
+                try:
+                    with open(settings_file, "r", encoding="utf-8") as f:
+                        settings = json.load(f)
+                    if not isinstance(settings, dict):
+                        raise ValueError("not a JSON object")
+                except (OSError, ValueError) as e:
+                    # Start from defaults rather than refuse to open at all
+                    print(f"Not importing unreadable {settings_file}: {e}", file=sys.stderr)
+                    settings = {}
+                self._write_settings(db, settings)
+            if os.path.exists(goals_file):
+                goals = list(reversed(GoalLibrary(goals_file).recent()))
+                self._touch_goals(db, goals)
+            if os.path.isdir(history_dir):
+                from history import SessionLog
+                rows = (_session_row(record) for record in SessionLog(history_dir).after(0))
+                db.executemany(f"INSERT INTO sessions ({SESSION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            db.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [
+                ("migrated", str(time.time())),
+                ("schema_version", str(SCHEMA_VERSION)),
+            ])
+        return True
+
+    # ----- settings -----
+
+    def load_settings(self):
+        rows = self.db.execute("SELECT key, value FROM settings").fetchall()
+        self._saved_settings = dict(rows)
+        return {key: json.loads(value) for key, value in rows}
+
+    def save_settings(self, settings):
+        """Write the keys whose values changed since they were last loaded or saved"""
+        changed = {}
+        for key, value in settings.items():
+            encoded = json.dumps(value, sort_keys=True)
+            if self._saved_settings.get(key) != encoded:
+                changed[key] = value
+        if changed:
+            with self.transaction() as db:
+                self._write_settings(db, changed)
+        return len(changed)
+
+    def _write_settings(self, db, settings):
+        now = time.time()
+        rows = [(key, json.dumps(value, sort_keys=True), now) for key, value in settings.items()]
+        db.executemany("INSERT OR REPLACE INTO settings (key, value, updated) VALUES (?, ?, ?)", rows)
+        self._saved_settings.update((key, value) for key, value, _ in rows)
+
+    # ----- goals -----
+
+    def goals(self):
+        """Every goal, least recently used first"""
+        return [goal for goal, in self.db.execute("SELECT goal FROM goals ORDER BY used")]
+
+    def touch_goals(self, goals):
+        """Add goals, or mark existing ones as just used"""
+        with self.transaction() as db:
+            self._touch_goals(db, goals)
+
+    def _touch_goals(self, db, goals):
+        used = db.execute("SELECT COALESCE(MAX(used), 0) FROM goals").fetchone()[0]
+        rows = []
+        for goal in goals:
+            key = normalise(goal)
+            if key:
+                used += 1
+                rows.append((key, " ".join(goal.split()), used))
+        # Keep the first spelling of a goal, like GoalLibrary does
+        db.executemany(
+            "INSERT INTO goals (key, goal, used) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET used = excluded.used",
+            rows
+        )
+
+    def remove_goals(self, keys):
+        with self.transaction() as db:
+            db.executemany("DELETE FROM goals WHERE key = ?", ((key,) for key in keys))
+
+    # ----- sessions -----
+
+    def append_session(self, record):
+        with self.transaction() as db:
+            db.execute(f"INSERT INTO sessions ({SESSION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", _session_row(record))
+
+    def session_count(self):
+        return self.db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def sessions(self, since=None, until=None):
+        query = f"SELECT {SESSION_COLUMNS} FROM sessions WHERE start >= ? AND start < ? ORDER BY start, id"
+        bounds = (float("-inf") if since is None else since, float("inf") if until is None else until)
+        return map(_session_record, self.db.execute(query, bounds))
+
+    def sessions_after(self, skip):
+        query = f"SELECT {SESSION_COLUMNS} FROM sessions ORDER BY id LIMIT -1 OFFSET ?"
+        return map(_session_record, self.db.execute(query, (skip,)))
+
+
+class SQLiteGoalLibrary(GoalLibrary):
+    """GoalLibrary whose changes are rows in the store instead of lines in a text file"""
+
+    def __init__(self, store):
+        super().__init__(None)
+        self.store = store
+        for goal in store.goals():
+            self._insert(goal, index=False)
+        self._reindex()
+
+    def save(self):
+        # Every change is already committed row by row; there's nothing to compact
+        pass
+
+    def _append_lines(self, goals):
+        if goals:
+            self.store.touch_goals(goals)
+
+    def _persist_removed(self, keys):
+        self.store.remove_goals(keys)
+
+
+class SQLiteSessionLog:
+    """The SessionLog interface on top of the store's sessions table"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def append(self, record):
+        self.store.append_session(record)
+
+    def records(self, since=None, until=None):
+        """Yield records whose start is in [since, until), oldest first"""
+        return self.store.sessions(since, until)
+
+    def after(self, skip):
+        return self.store.sessions_after(skip)
+
+    def __iter__(self):
+        return self.records()
+
+    def __len__(self):
+        return self.store.session_count()
@@ -0,0 +1,85 @@
+import time
+from contextlib import contextmanager
+
+# Taken as early as possible, so the report includes interpreter + import time
+PROCESS_START = time.perf_counter()
+
+# Time from launch until the main window is first drawn; over this is a regression
+FIRST_FRAME_BUDGET_MS = 400
+
+
+class StartupTimer:
+    """Records how long each startup phase takes, measured against a first-frame budget"""
+
+    def __init__(self, budget_ms=FIRST_FRAME_BUDGET_MS, clock=time.perf_counter):
+        self.budget_ms = budget_ms
+        self.clock = clock
+        self.phases = []
+        self.first_frame_ms = None
+        self.warm_up_ms = None
+
+    def _since_start(self):
+        return (self.clock() - PROCESS_START) * 1000
+
+    @contextmanager
+    def phase(self, name):
+        begin = self.clock()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (self.clock() - begin) * 1000))
+
+    def mark_first_frame(self):
+        self.first_frame_ms = self._since_start()
+
+    def mark_warm(self):
+        self.warm_up_ms = self._since_start()
+
+    @property
+    def over_budget(self):
+        return self.first_frame_ms is not None and self.first_frame_ms > self.budget_ms
+
+    def report(self):
+        return {
+            "budget_ms": self.budget_ms,
+            "first_frame_ms": round(self.first_frame_ms, 1) if self.first_frame_ms is not None else None,
+            "warm_ms": round(self.warm_up_ms, 1) if self.warm_up_ms is not None else None,
+            "over_budget": self.over_budget,
+            "phases_ms": {name: round(ms, 2) for name, ms in self.phases},
+        }
+
+
+class HotPathProfiler:
+    """Per-call timings for functions on the tick path (only installed by --profile)"""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.samples = {}
+
+    def wrap(self, name, fn):
+        samples = self.samples.setdefault(name, [])
+        clock = self.clock
+
+        def timed(*args, **kwargs):
+            begin = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                samples.append(clock() - begin)
+        return timed
+
+    def report(self):
+        report = {}
+        for name, samples in self.samples.items():
+            ordered = sorted(samples)
+            if not ordered:
+                report[name] = {"calls": 0}
+                continue
+            report[name] = {
+                "calls": len(ordered),
+                "mean_us": round(sum(ordered) / len(ordered) * 1e6, 1),
+                "p50_us": round(ordered[len(ordered) // 2] * 1e6, 1),
+                "p95_us": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e6, 1),
+                "max_us": round(ordered[-1] * 1e6, 1),
+            }
+        return report
@@ -0,0 +1,236 @@
+import json
+import os
+import time
+from datetime import date, timedelta
+
+from storage import atomic_write_json, file_lock
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+DAY = 86400
+
+
+def day_number(d):
+    """Local calendar day as a day count since 1970-01-01"""
+    return d.toordinal() - EPOCH_ORDINAL
+
+
+def week_number(day):
+    """Monday-based week count since 1970 (1970-01-01 was a Thursday)"""
+    return (day + 3) // 7
+
+
+class StatsRollup:
+    """Focus time and completed sessions per day, week and goal
+
+    Totals are kept materialised and updated in O(1) per session record, so the UI
+    never has to re-read the history. Focus time is attributed to the local days it
+    actually fell on, so a session running over midnight is split between both days;
+    a completed session counts on the day it ended.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        # key -> [focus_seconds, completed_sessions]
+        self.days = {}
+        self.weeks = {}
+        self.goals = {}
+        # How many history records are already folded in (used to catch up on load)
+        self.records_applied = 0
+        self._offsets = {}
+        if path:
+            self._load()
+
+    # ----- updates -----
+
+    def add(self, record):
+        """Fold one history record into the rollups"""
+        self.add_many((record,))
+
+    def add_many(self, records):
+        """Fold records into the rollups (the hot loop is kept flat on purpose)"""
+        days = self.days
+        weeks = self.weeks
+        goals = self.goals
+        # History is chronological, so consecutive records mostly fall on the same local
+        # day. Its bounds in Unix time are worked out once (DST included), after which
+        # placing a session is two comparisons: no per-record offset or division.
+        day_start = day_end = 0.0
+        day = day_totals = week_totals = None
+        applied = 0
+        for record in records:
+            applied += 1
+            if record.get("type") != "work":
+                continue
+            end = record["end"]
+            focus = record.get("focus")
+            if focus is None:
+                focus = end - record["start"]
+            completed = 1 if record.get("completed") else 0
+
+            if not day_start <= end < day_end:
+                day, day_start, day_end = self._day_bounds(end)
+                day_totals = days.get(day)
+                if day_totals is None:
+                    day_totals = days[day] = [0, 0]
+                week = (day + 3) // 7
+                week_totals = weeks.get(week)
+                if week_totals is None:
+                    week_totals = weeks[week] = [0, 0]
+
+            if end - focus >= day_start:
+                # Whole session on one day (by far the common case)
+                day_totals[0] += focus
+                day_totals[1] += completed
+                week_totals[0] += focus
+                week_totals[1] += completed
+            else:
+                self._add_across_midnight(end, focus, completed)
+
+            goal = record.get("goal")
+            if goal:
+                totals = goals.get(goal)
+                if totals is None:
+                    goals[goal] = [focus, completed]
+                else:
+                    totals[0] += focus
+                    totals[1] += completed
+        self.records_applied += applied
+
+    @staticmethod
+    def _day_bounds(timestamp):
+        """(day number, first second, end) of the local day containing a timestamp"""
+        d = date.fromtimestamp(timestamp)
+        following = d + timedelta(days=1)
+        start = time.mktime((d.year, d.month, d.day, 0, 0, 0, 0, 0, -1))
+        end = time.mktime((following.year, following.month, following.day, 0, 0, 0, 0, 0, -1))
+        return day_number(d), start, end
+
+    def _add_across_midnight(self, end, focus, completed):
+        """Split focus time over the local days it fell on, walking back from the end"""
+        end_day = self.local_day(end)
+        day = end_day
+        remaining = focus
+        while remaining > 0:
+            day_start = day * DAY - self._offset(end - 1)
+            part = min(remaining, end - day_start)
+            count = completed if day == end_day else 0
+            self._bump(self.days, day, part, count)
+            self._bump(self.weeks, week_number(day), part, count)
+            remaining -= part
+            end = day_start
+            day -= 1
+
+    @staticmethod
+    def _bump(table, key, seconds, sessions):
+        totals = table.get(key)
+        if totals is None:
+            table[key] = [seconds, sessions]
+        else:
+            totals[0] += seconds
+            totals[1] += sessions
+
+    def local_day(self, timestamp):
+        return int((timestamp + self._offset(timestamp)) // DAY)
+
+    def _offset(self, timestamp):
+        # UTC offset changes at most on the hour, so cache it per hour
+        hour = timestamp // 3600
+        offset = self._offsets.get(hour)
+        if offset is None:
+            offset = time.localtime(timestamp).tm_gmtoff
+            self._offsets[hour] = offset
+        return offset
+
+    # ----- queries -----
+
+    def day(self, d):
+        """(focus_minutes, completed_sessions) for a date"""
+        return self._minutes(self.days.get(day_number(d)))
+
+    def week(self, d):
+        """(focus_minutes, completed_sessions) for the Monday-based week containing a date"""
+        return self._minutes(self.weeks.get(week_number(day_number(d))))
+
+    def goal(self, goal):
+        return self._minutes(self.goals.get(goal))
+
+    def between(self, first, last):
+        """(focus_minutes, completed_sessions) summed over a range of dates (inclusive)"""
+        seconds = sessions = 0
+        days = self.days
+        for day in range(day_number(first), day_number(last) + 1):
+            totals = days.get(day)
+            if totals:
+                seconds += totals[0]
+                sessions += totals[1]
+        return self._minutes([seconds, sessions])
+
+    def sessions_on(self, d):
+        return self.day(d)[1]
+
+    @staticmethod
+    def _minutes(totals):
+        if not totals:
+            return 0, 0
+        return round(totals[0] / 60, 1), totals[1]
+
+    # ----- persistence -----
+
+    def catch_up(self, history):
+        """Fold in history records written since the rollups were last saved"""
+        skip = self.records_applied
+        if skip > len(history):
+            # The rollups are ahead of the history (history was pruned): start over
+            self.days, self.weeks, self.goals = {}, {}, {}
+            self.records_applied = skip = 0
+        added = 0
+        for record in history.after(skip):
+            self.add(record)
+            added += 1
+        return added
+
+    def sync(self, history):
+        """Catch up with the history and save, safely when other processes share the files
+
+        Another process (the terminal mode next to the desktop app) may have saved newer
+        rollups since ours were loaded; starting from the file on disk means neither
+        side's sessions are lost or counted twice.
+        """
+        if not self.path:
+            self.catch_up(history)
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with file_lock(self.path + ".lock"):
+            self._load()
+            if self.catch_up(history):
+                self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        # The history folder may not exist when history lives in the SQLite store
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        atomic_write_json(self.path, {
+            "version": 1,
+            "records_applied": self.records_applied,
+            # JSON keys must be strings
+            "days": {str(k): v for k, v in self.days.items()},
+            "weeks": {str(k): v for k, v in self.weeks.items()},
+            "goals": self.goals,
+        })
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.days = {int(k): v for k, v in data["days"].items()}
+            self.weeks = {int(k): v for k, v in data["weeks"].items()}
+            self.goals = data["goals"]
+            self.records_applied = data["records_applied"]
+        except (OSError, ValueError, KeyError) as e:
+            # Rebuilt from the history by catch_up()
+            print(f"Error loading stats, rebuilding: {e}")
+            self.days, self.weeks, self.goals = {}, {}, {}
+            self.records_applied = 0
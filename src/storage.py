@@ -0,0 +1,137 @@
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+# Where the desktop app, terminal mode and export all look (relative to the working folder)
+SETTINGS_FILE = "pomodoro_settings.json"
+GOALS_FILE = "pomodoro_goals.txt"
+HISTORY_DIR = "pomodoro_history"
+STATS_FILE = os.path.join(HISTORY_DIR, "stats.json")
+DB_FILE = "pomodoro.db"
+
+
+def open_store(kind=None):
+    """The SQLite store if it's chosen (or already in use), else None for the JSON files"""
+    kind = kind or os.environ.get("PDA_POMODORO_STORE") or ("sqlite" if os.path.exists(DB_FILE) else "json")
+    if kind != "sqlite":
+        return None
+    from sqlite_store import SQLiteStore
+    store = SQLiteStore(DB_FILE)
+    # First run on SQLite: bring the JSON settings, goals and history along
+    if store.migrate(SETTINGS_FILE, GOALS_FILE, HISTORY_DIR):
+        # stderr: the export may be writing its data to stdout
+        print(f"Moved settings, goals and history into {DB_FILE}", file=sys.stderr)
+    return store
+
+
+def atomic_write(path, write):
+    """Replace a file so it is either the old version or the new one, never half of each
+
+    `write` is called with a text file object for the new contents.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    # Make the rename itself durable where the platform allows it
+    if hasattr(os, "O_DIRECTORY"):
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+
+def atomic_write_json(path, data):
+    atomic_write(path, lambda f: json.dump(data, f, indent=2))
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive lock across processes (the desktop app and terminal mode share files)
+
+    `path` is a separate lock file; it's created if needed and never deleted.
+    """
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            # Retries for up to 10 s, then raises OSError
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class SettingsWriter:
+    """Write-behind for the settings file
+
+    save() only marks the settings dirty; the file is rewritten at most once per
+    interval (and on flush(), e.g. at exit). `schedule` is a callable taking
+    (delay_ms, callback), such as Tk's root.after, so the writer never needs a thread.
+    `write` replaces the atomic JSON write (e.g. with a database store's save).
+    """
+
+    def __init__(self, path, schedule, interval_ms=1000, write=None):
+        self.path = path
+        self.write = write if write is not None else (lambda settings: atomic_write_json(path, settings))
+        self.schedule = schedule
+        self.interval_ms = interval_ms
+        self.settings = None
+        self.pending = False
+        self.save_requests = 0
+        self.writes = 0
+        self.errors = 0
+
+    @property
+    def coalesced(self):
+        """How many save() calls were folded into another write"""
+        return self.save_requests - self.writes - (1 if self.pending else 0)
+
+    def save(self, settings):
+        self.settings = settings
+        self.save_requests += 1
+        if not self.pending:
+            self.pending = True
+            self.schedule(self.interval_ms, self._flush_scheduled)
+
+    def _flush_scheduled(self):
+        # Already written by an explicit flush()
+        if self.pending:
+            self.flush()
+
+    def flush(self):
+        """Write now if anything is waiting"""
+        if not self.pending:
+            return
+        self.pending = False
+        try:
+            self.write(self.settings)
+            self.writes += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"Error saving settings: {e}")
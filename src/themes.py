@@ -0,0 +1,87 @@
+class Palette:
+    """A colour theme, built once at import time
+
+    Widgets and canvas items refer to colours by role ("bg", "primary", ...), so a
+    theme switch is just looking the same roles up in a different palette.
+    """
+
+    ROLES = ("bg", "primary", "secondary", "accent1", "accent2", "accent3", "gradient_top", "gradient_bottom")
+    __slots__ = ("name",) + ROLES
+
+    def __init__(self, name, **colours):
+        self.name = name
+        for role in self.ROLES:
+            setattr(self, role, colours[role])
+
+    # Dict-style access, so code written against the old theme dicts keeps working
+    def __getitem__(self, role):
+        try:
+            return getattr(self, role)
+        except AttributeError:
+            raise KeyError(role)
+
+    def get(self, role, default=None):
+        return getattr(self, role, default)
+
+
+THEMES = {
+    "purple": Palette(
+        "purple",
+        bg="#e6dcf5",
+        primary="#6b5b95",
+        secondary="#8e7cc3",
+        accent1="#c8b6e2",
+        accent2="#d4c5f0",
+        accent3="#b19cd9",
+        gradient_top="#efe9ff",
+        gradient_bottom="#d6d0f5"
+    ),
+    "pink": Palette(
+        "pink",
+        bg="#fce4ec",
+        primary="#c2185b",
+        secondary="#e91e63",
+        accent1="#f8bbd0",
+        accent2="#f48fb1",
+        accent3="#f06292",
+        gradient_top="#fff0f5",
+        gradient_bottom="#fce4ec"
+    ),
+    "blue": Palette(
+        "blue",
+        bg="#e3f2fd",
+        primary="#1565c0",
+        secondary="#1976d2",
+        accent1="#90caf9",
+        accent2="#64b5f6",
+        accent3="#42a5f5",
+        gradient_top="#f0f8ff",
+        gradient_bottom="#e3f2fd"
+    ),
+    "mint": Palette(
+        "mint",
+        bg="#e0f2f1",
+        primary="#00695c",
+        secondary="#00897b",
+        accent1="#80cbc4",
+        accent2="#4db6ac",
+        accent3="#26a69a",
+        gradient_top="#f0fff4",
+        gradient_bottom="#e0f2f1"
+    ),
+    "peach": Palette(
+        "peach",
+        bg="#fff3e0",
+        primary="#e65100",
+        secondary="#f57c00",
+        accent1="#ffcc80",
+        accent2="#ffb74d",
+        accent3="#ffa726",
+        gradient_top="#fffaf0",
+        gradient_bottom="#fff3e0"
+    ),
+}
+
+
+def get_palette(name):
+    return THEMES.get(name, THEMES["purple"])
@@ -0,0 +1,334 @@
+import heapq
+import itertools
+import math
+import time
+
+
+def _suspend_aware_clock():
+    """Return a clock that keeps counting while the machine is asleep, if there is one"""
+    # CLOCK_BOOTTIME (Linux) keeps ticking through suspend and ignores wall-clock changes,
+    # which is exactly what we need to tell a sleep gap apart from a wall-clock jump
+    if hasattr(time, "CLOCK_BOOTTIME"):
+        try:
+            time.clock_gettime(time.CLOCK_BOOTTIME)
+            return lambda: time.clock_gettime(time.CLOCK_BOOTTIME)
+        except OSError:
+            pass
+    return None
+
+
+class DeadlineTimer:
+    """Countdown that stores an absolute monotonic deadline instead of decrementing a counter
+
+    With track_clock_jumps (the default) it remembers the clocks at every wake so that
+    check_clock_jump() can tell a suspend from a wall-clock change. Pass False when the
+    clock given is the only time source (simulations, TimerManager): check_clock_jump()
+    then does nothing and no extra clocks are read.
+    """
+
+    # Anything smaller than this between two wakes is just scheduling noise
+    JUMP_TOLERANCE = 2.0
+
+    def __init__(self, duration, clock=time.monotonic, wall_clock=time.time, sleep_clock=None,
+                 track_clock_jumps=True):
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.track_clock_jumps = track_clock_jumps
+        if sleep_clock is None and track_clock_jumps:
+            sleep_clock = _suspend_aware_clock()
+        self.sleep_clock = sleep_clock
+        self.duration = duration
+        self.deadline = None
+        self.paused_remaining = float(duration)
+        # Last detected clock events (in seconds), handy for logging and the UI
+        self.last_sleep_gap = 0.0
+        self.last_wall_jump = 0.0
+        self._anchor = None
+
+    @property
+    def running(self):
+        return self.deadline is not None
+
+    def start(self, at=None):
+        """Start (or resume) counting down from whatever is left
+
+        `at` lets a caller chain sessions off the previous deadline instead of "now",
+        so lateness in handling one transition doesn't push back the next one.
+        """
+        if self.running:
+            return
+        self.deadline = (self.clock() if at is None else at) + self.paused_remaining
+        self._set_anchor()
+
+    def pause(self):
+        """Freeze the countdown, keeping the time that is left"""
+        if not self.running:
+            return
+        self.paused_remaining = self.remaining()
+        self.deadline = None
+        self._anchor = None
+
+    def reset(self, duration=None):
+        """Stop and go back to a full countdown (optionally with a new duration)"""
+        if duration is not None:
+            self.duration = duration
+        self.deadline = None
+        self.paused_remaining = float(self.duration)
+        self._anchor = None
+
+    def remaining(self):
+        """Exact seconds left, never negative"""
+        if self.deadline is None:
+            return self.paused_remaining
+        return max(0.0, self.deadline - self.clock())
+
+    def seconds_left(self):
+        """Whole seconds left, as shown on the display (rounded up like a kitchen timer)"""
+        return int(math.ceil(self.remaining() - 1e-9))
+
+    def finished(self):
+        return self.remaining() <= 0
+
+    def next_wake_ms(self):
+        """Milliseconds until the displayed second changes"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            return 0
+        # Time until we cross into the next lower whole second
+        until_change = remaining - (self.seconds_left() - 1)
+        # Wake a hair late rather than early so we never show the same second twice
+        return max(1, int(until_change * 1000) + 1)
+
+    def check_clock_jump(self):
+        """Look for sleep gaps and wall-clock jumps since the last wake
+
+        A sleep gap (the monotonic clock stood still while the machine was suspended)
+        is added to the elapsed time, so the countdown reflects real time that passed.
+        A wall-clock jump (someone changed the system time) is only recorded, since the
+        deadline is monotonic and already immune to it.
+        Returns the sleep gap that was applied, in seconds.
+        """
+        if not self.running or self._anchor is None:
+            return 0.0
+
+        mono_then, wall_then, sleep_then = self._anchor
+        mono_delta = self.clock() - mono_then
+        wall_delta = self.wall_clock() - wall_then
+        gap = 0.0
+        jump = 0.0
+
+        if sleep_then is not None:
+            sleep_delta = self.sleep_clock() - sleep_then
+            if sleep_delta - mono_delta > self.JUMP_TOLERANCE:
+                gap = sleep_delta - mono_delta
+            if abs(wall_delta - sleep_delta) > self.JUMP_TOLERANCE:
+                jump = wall_delta - sleep_delta
+        elif wall_delta - mono_delta > self.JUMP_TOLERANCE:
+            # No suspend-aware clock: a forward wall jump is most likely a sleep
+            gap = wall_delta - mono_delta
+        elif mono_delta - wall_delta > self.JUMP_TOLERANCE:
+            jump = wall_delta - mono_delta
+
+        if gap:
+            self.deadline -= gap
+            self.last_sleep_gap = gap
+        if jump:
+            self.last_wall_jump = jump
+        self._set_anchor()
+        return gap
+
+    def _set_anchor(self):
+        if not self.track_clock_jumps:
+            return
+        sleep_now = self.sleep_clock() if self.sleep_clock else None
+        self._anchor = (self.clock(), self.wall_clock(), sleep_now)
+
+
+class PomodoroEngine:
+    """UI-free work/break state machine for a single pomodoro timer"""
+
+    def __init__(self, work_time=25 * 60, break_time=5 * 60, auto_continue=False, **timer_options):
+        self.work_time = work_time
+        self.break_time = break_time
+        # Start the next session by itself after a transition (the Tk app waits for the user)
+        self.auto_continue = auto_continue
+        self.is_work_session = True
+        self.is_running = False
+        self.session_count = 0
+        self.goal = ""
+        self.countdown = DeadlineTimer(work_time, **timer_options)
+        # Wall-clock start of the current session and how often it was paused (for history)
+        self.started_at = None
+        self.pauses = 0
+        # Bumped on every state change so schedulers can spot stale deadlines
+        self.generation = 0
+
+    @property
+    def session_length(self):
+        return self.work_time if self.is_work_session else self.break_time
+
+    @property
+    def deadline(self):
+        return self.countdown.deadline if self.is_running else None
+
+    def start(self, goal=None, at=None):
+        """Start or resume the current session; returns False if it was already running"""
+        if self.is_running:
+            return False
+        if goal is not None:
+            self.goal = goal
+        if self.started_at is None:
+            self.started_at = self.countdown.wall_clock()
+        self.is_running = True
+        self.countdown.start(at)
+        self.generation += 1
+        return True
+
+    def pause(self):
+        if self.is_running:
+            self.pauses += 1
+        self.is_running = False
+        self.countdown.pause()
+        self.generation += 1
+
+    def reset(self):
+        """Stop and refill the current session, dropping its goal"""
+        self.is_running = False
+        self.countdown.reset(self.session_length)
+        self.goal = ""
+        self._clear_session()
+        self.generation += 1
+
+    def set_time_left(self, seconds):
+        self.countdown.reset(seconds)
+        if self.is_running:
+            self.countdown.start()
+        self.generation += 1
+
+    def set_durations(self, work_time, break_time):
+        """Change session lengths and restart the current session at the new length"""
+        self.work_time = work_time
+        self.break_time = break_time
+        self.set_time_left(self.session_length)
+
+    def finish(self):
+        """Stop at zero; returns True if a work session was just completed"""
+        self.is_running = False
+        self._clear_session()
+        self.generation += 1
+        if self.is_work_session:
+            self.session_count += 1
+            return True
+        return False
+
+    def switch_session(self, at=None):
+        """Flip between work and break, refilling the countdown"""
+        self.is_work_session = not self.is_work_session
+        self.is_running = False
+        self.goal = ""
+        self.countdown.reset(self.session_length)
+        self._clear_session()
+        self.generation += 1
+        if self.auto_continue:
+            self.start(at=at)
+
+    def session_record(self, completed):
+        """History record for the current session, or None if it never started"""
+        if self.started_at is None:
+            return None
+        return {
+            "start": round(self.started_at, 3),
+            "end": round(self.countdown.wall_clock(), 3),
+            "type": "work" if self.is_work_session else "break",
+            "goal": self.goal,
+            "pauses": self.pauses,
+            # Time actually spent counting down (end - start also includes pauses)
+            "focus": round(self.countdown.duration - self.countdown.remaining()),
+            "completed": completed,
+        }
+
+    def _clear_session(self):
+        self.started_at = None
+        self.pauses = 0
+
+    def advance(self):
+        """Handle a due deadline: finish, switch and (maybe) carry on without drift"""
+        due = self.countdown.deadline
+        was_work = self.finish()
+        self.switch_session(at=due)
+        return was_work
+
+
+class TimerManager:
+    """Drives many PomodoroEngines from a single heap-ordered deadline queue
+
+    Every running timer has one heap entry keyed by its deadline. Pausing, resetting or
+    removing a timer doesn't search the heap; the entry just goes stale and is skipped
+    when it reaches the top. An entry holds the engine it was made for, so a timer
+    removed and added again under the same id never inherits the old entries (a new
+    engine counts its generations from 0 again). Each event costs O(log n).
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.timers = {}
+        self._heap = []
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self.timers)
+
+    def add(self, timer_id, work_time=25 * 60, break_time=5 * 60, auto_continue=True):
+        # The manager's clock is the only time source, so there are no jumps to detect
+        engine = PomodoroEngine(
+            work_time, break_time, auto_continue=auto_continue,
+            clock=self.clock, wall_clock=self.clock, track_clock_jumps=False
+        )
+        self.timers[timer_id] = engine
+        return engine
+
+    def remove(self, timer_id):
+        # Any heap entry for it is dropped lazily
+        self.timers.pop(timer_id, None)
+
+    def start(self, timer_id, goal=None):
+        engine = self.timers[timer_id]
+        if engine.start(goal):
+            self._schedule(timer_id, engine)
+
+    def pause(self, timer_id):
+        self.timers[timer_id].pause()
+
+    def reset(self, timer_id):
+        self.timers[timer_id].reset()
+
+    def next_deadline(self):
+        """Earliest live deadline, or None if nothing is running"""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def advance(self, now=None):
+        """Process every deadline that is due; returns a list of (timer_id, was_work)"""
+        if now is None:
+            now = self.clock()
+        heap = self._heap
+        events = []
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if not self._is_live(entry):
+                continue
+            timer_id, engine = entry[2], entry[3]
+            events.append((timer_id, engine.advance()))
+            if engine.is_running:
+                self._schedule(timer_id, engine)
+        return events
+
+    def _schedule(self, timer_id, engine):
+        # The sequence number keeps engines from ever being compared
+        heapq.heappush(self._heap, (engine.deadline, next(self._seq), timer_id, engine, engine.generation))
+
+    def _is_live(self, entry):
+        engine = entry[3]
+        return self.timers.get(entry[2]) is engine and engine.is_running and engine.generation == entry[4]
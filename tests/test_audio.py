@@ -0,0 +1,33 @@
+"""AudioEngine.wait() must return whatever state the worker is in
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from audio import AudioEngine, NullSink
+
+
+class Wait(unittest.TestCase):
+    def setUp(self):
+        self.audio = AudioEngine(None, backend=NullSink())
+
+    def test_before_anything_was_played(self):
+        self.assertTrue(self.audio.wait())
+
+    def test_after_playing(self):
+        self.audio.play()
+        self.assertTrue(self.audio.wait(2))
+        self.assertEqual(len(self.audio.latencies), 1)
+
+    def test_after_close(self):
+        self.audio.play()
+        self.audio.close()
+        self.assertTrue(self.audio.wait(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""A hung event handler must not hold up the others, even with no further emit()
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from events import EventBus
+
+
+class HungHandler(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.bus = EventBus(workers=1, plugins=[])
+
+    def test_queued_handler_runs_without_another_emit(self):
+        delivered = threading.Event()
+        self.bus.subscribe("start", lambda event: self.release.wait(10), timeout=0.05, name="hung")
+        self.bus.subscribe("start", lambda event: delivered.set(), name="healthy")
+        self.bus.emit("start", goal="write tests")
+        # The only worker is stuck in "hung"; the watchdog has to bring in another
+        self.assertTrue(delivered.wait(2), "healthy handler never ran")
+        handlers = self.bus.metrics()["handlers"]
+        self.assertEqual(handlers["start/hung"]["timeouts"], 1)
+        self.assertEqual(handlers["start/healthy"]["calls"], 1)
+
+    def test_the_pool_shrinks_back_when_the_handler_returns(self):
+        self.bus.subscribe("start", lambda event: self.release.wait(10), timeout=0.05, name="hung")
+        self.bus.emit("start")
+        done = threading.Event()
+        self.bus.subscribe("pause", lambda event: done.set(), name="later")
+        self.bus.emit("pause")
+        self.assertTrue(done.wait(2))
+        self.release.set()
+        self.assertTrue(self.bus.wait(2))
+        self.assertEqual(self.bus.metrics()["handlers"]["start/hung"]["calls"], 1)
+
+    def tearDown(self):
+        self.release.set()
+        self.bus.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""--since-last positions must never move past sessions a filter left out
+
+    python -m unittest discover tests
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pda_export
+from history import SessionLog
+from storage import HISTORY_DIR
+
+
+def session(start, kind):
+    return {"start": start, "end": start + 60, "type": kind, "goal": "", "pauses": 0, "focus": 60, "completed": True}
+
+
+class SinceLast(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        previous = os.getcwd()
+        os.chdir(self.folder.name)
+        self.addCleanup(os.chdir, previous)
+        self.history = SessionLog(HISTORY_DIR)
+        for i, kind in enumerate(("work", "break", "work")):
+            self.history.append(session(1_800_000_000 + i * 600, kind))
+
+    def export(self, *args):
+        with contextlib.redirect_stderr(io.StringIO()):
+            pda_export.main(["jsonl", "--store", "json", "-o", "out.jsonl", *args])
+        with open("out.jsonl", encoding="utf-8") as f:
+            return [json.loads(line)["type"] for line in f]
+
+    def test_a_filtered_export_keeps_its_own_position(self):
+        self.assertEqual(self.export("--since-last", "--type", "work"), ["work", "work"])
+        # The break the filter skipped is still new for an unfiltered export
+        self.assertEqual(self.export("--since-last"), ["work", "break", "work"])
+        self.assertEqual(self.export("--since-last", "--type", "break"), ["break"])
+
+        self.history.append(session(1_800_010_000, "break"))
+        self.assertEqual(self.export("--since-last", "--type", "work"), [])
+        self.assertEqual(self.export("--since-last"), ["break"])
+        self.assertEqual(self.export("--since-last", "--type", "break"), ["break"])
+
+    def test_a_date_range_keeps_its_own_position(self):
+        self.assertEqual(self.export("--since-last", "--to", "2000-01-01"), [])
+        self.assertEqual(self.export("--since-last"), ["work", "break", "work"])
+
+    def test_a_name_cannot_be_reused_with_other_filters(self):
+        self.export("--since-last", "--name", "tracker", "--type", "work")
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            self.export("--since-last", "--name", "tracker")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""Two processes sharing the goal file (desktop app and terminal mode) must not lose goals
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from goals import GoalLibrary
+
+
+class SharedFile(unittest.TestCase):
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = os.path.join(folder.name, "pomodoro_goals.txt")
+        GoalLibrary(self.path).import_lines(["beta", "delta"])
+        # Two libraries on one file stand in for the two processes
+        self.app = GoalLibrary(self.path)
+        self.cli = GoalLibrary(self.path)
+
+    def on_disk(self):
+        return sorted(GoalLibrary(self.path).recent())
+
+    def test_a_delete_keeps_goals_the_other_side_added(self):
+        self.app.add("alpha")
+        self.cli.remove("beta")
+        self.assertEqual(self.on_disk(), ["alpha", "delta"])
+        self.assertIn("alpha", self.cli)
+
+    def test_the_other_side_picks_up_a_rewrite(self):
+        self.cli.remove("beta")
+        self.app.add("gamma")
+        self.assertEqual(self.on_disk(), ["delta", "gamma"])
+        # The delete reached the other side instead of being written back
+        self.assertNotIn("beta", self.app)
+
+    def test_compaction_keeps_goals_the_other_side_added(self):
+        self.app.add("alpha")
+        for _ in range(150):
+            # Re-using a goal appends a line; enough of them compact the file
+            self.cli.add("delta")
+        self.assertEqual(self.on_disk(), ["alpha", "beta", "delta"])
+        with open(self.path, encoding="utf-8") as f:
+            self.assertLess(len(f.readlines()), 150)
+
+    def test_recency_follows_the_other_side(self):
+        self.cli.add("beta")
+        self.app.add("epsilon")
+        self.assertEqual(self.app.recent(), ["epsilon", "beta", "delta"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""Date-range reads must find every session, even when starts were logged out of order
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from history import SessionLog
+
+
+def session(start):
+    return {"start": start, "end": start + 60, "type": "work", "goal": "", "pauses": 0, "focus": 60, "completed": True}
+
+
+class Records(unittest.TestCase):
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        # Tiny segments: about one record each
+        self.log = SessionLog(folder.name, segment_bytes=64)
+
+    def starts(self, since=None, until=None):
+        return sorted(record["start"] for record in self.log.records(since, until))
+
+    def test_out_of_order_starts_across_segments(self):
+        # A long session logged by one process after a short one logged by another
+        for start in (1000, 5000, 2000, 6000, 3000):
+            self.log.append(session(start))
+        self.assertGreater(len(self.log.segments), 3)
+        self.assertEqual(self.starts(until=4000), [1000, 2000, 3000])
+        self.assertEqual(self.starts(since=2500, until=5500), [3000, 5000])
+        self.assertEqual(self.starts(since=5500), [6000])
+        self.assertEqual(len(self.log), 5)
+
+    def test_skip_by_count(self):
+        for start in (1000, 2000, 3000):
+            self.log.append(session(start))
+        self.assertEqual([record["start"] for record in self.log.after(1)], [2000, 3000])
+
+
+if __name__ == "__main__":
+    unittest.main()
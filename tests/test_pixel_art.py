@@ -0,0 +1,111 @@
+"""Sprites (plus their sand) and glyphs must paint exactly the original pixels
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from pixel_art import (
+    GLYPHS, SAND_CELLS, SPRITES, SandGauge, compile_glyph, compile_sprite, expand_rects, flatten_layers
+)
+
+
+def _paint(calls):
+    pixels = {}
+    for role, coords in calls:
+        for xy in coords:
+            pixels[xy] = role
+    return pixels
+
+
+# The hourglasses exactly as the original draw_hourglass() / draw_tiny_hourglass() painted
+# them, pixel by pixel in painting order. Colours are theme roles: rim_color = accent3,
+# glass_color = accent1, sand_color = accent2, "sparkle" = #ffd700.
+BASELINE = {
+    "hourglass": _paint([
+        ("sparkle", [(1, 3), (0, 4), (2, 4), (18, 5), (19, 6), (2, 15), (1, 16), (17, 14), (18, 15)]),
+        ("accent3", [(5, 2), (6, 2), (7, 2), (8, 2), (9, 2), (10, 2), (11, 2), (12, 2), (13, 2), (14, 2)]),
+        ("accent3", [(4, 3), (5, 3), (6, 3), (7, 3), (8, 3), (9, 3), (10, 3), (11, 3), (12, 3), (13, 3), (14, 3), (15, 3)]),
+        ("secondary", [(6, 4), (7, 4), (8, 4), (9, 4), (10, 4), (11, 4), (12, 4), (13, 4)]),
+        ("secondary", [(7, 5), (8, 5), (9, 5), (10, 5), (11, 5), (12, 5)]),
+        ("secondary", [(8, 6), (9, 6), (10, 6), (11, 6)]),
+        ("secondary", [(9, 7), (10, 7)]),
+        ("accent1", [(7, 5), (8, 5), (9, 5), (10, 5), (11, 5), (12, 5)]),
+        ("accent2", [(8, 6), (9, 6), (10, 6), (11, 6)]),
+        ("bg", [(9, 8), (10, 8), (9, 9), (10, 9)]),
+        ("secondary", [(9, 10), (10, 10)]),
+        ("secondary", [(8, 11), (9, 11), (10, 11), (11, 11)]),
+        ("secondary", [(7, 12), (8, 12), (9, 12), (10, 12), (11, 12), (12, 12)]),
+        ("secondary", [(6, 13), (7, 13), (8, 13), (9, 13), (10, 13), (11, 13), (12, 13), (13, 13)]),
+        ("secondary", [(6, 14), (7, 14), (8, 14), (9, 14), (10, 14), (11, 14), (12, 14), (13, 14)]),
+        ("secondary", [(6, 15), (7, 15), (8, 15), (9, 15), (10, 15), (11, 15), (12, 15), (13, 15)]),
+        ("accent1", [(8, 14), (9, 14), (10, 14), (11, 14)]),
+        ("accent1", [(8, 15), (9, 15), (10, 15), (11, 15)]),
+        ("accent3", [(4, 16), (5, 16), (6, 16), (7, 16), (8, 16), (9, 16), (10, 16), (11, 16), (12, 16), (13, 16), (14, 16), (15, 16)]),
+        ("accent3", [(5, 17), (6, 17), (7, 17), (8, 17), (9, 17), (10, 17), (11, 17), (12, 17), (13, 17), (14, 17)]),
+    ]),
+    "tiny_hourglass": _paint([
+        ("accent3", [(2, 1), (3, 1), (4, 1), (5, 1), (6, 1), (7, 1)]),
+        ("accent3", [(2, 7), (3, 7), (4, 7), (5, 7), (6, 7), (7, 7)]),
+        ("accent1", [(3, 2), (4, 2), (5, 2), (6, 2), (4, 3), (5, 3)]),
+        ("accent1", [(4, 4), (5, 4)]),
+        ("accent1", [(4, 5), (5, 5), (3, 6), (4, 6), (5, 6), (6, 6)]),
+        ("sparkle", [(1, 2)]),
+    ]),
+}
+
+
+class MatchesTheOriginalPicture(unittest.TestCase):
+    def test_sprite_plus_all_sand_is_the_original(self):
+        for name, expected in BASELINE.items():
+            with self.subTest(sprite=name):
+                pixels = expand_rects(compile_sprite(name))
+                top, bottom = SAND_CELLS[name]
+                # Sand items are drawn over the sprite
+                for role, xy in top + bottom:
+                    pixels[xy] = role
+                self.assertEqual(pixels, expected)
+
+    def test_sand_moves_from_top_to_bottom(self):
+        for name in SAND_CELLS:
+            with self.subTest(sprite=name):
+                gauge = SandGauge(name)
+                grains = len(gauge.top)
+                shown = dict(gauge.update(1.0))
+                self.assertEqual(shown, {i: i < grains for i in range(len(gauge.cells))})
+                for fraction in (0.75, 0.5, 0.1, 0.0, 1.0, 0.0):
+                    shown.update(gauge.update(fraction))
+                    top, bottom = gauge.levels_for(fraction)
+                    self.assertEqual(sum(shown[i] for i in range(grains)), top)
+                    self.assertEqual(sum(shown[i] for i in range(grains, len(gauge.cells))), bottom)
+                self.assertEqual(gauge.levels_for(0.0), (0, len(gauge.bottom)))
+
+
+class MergeIsLossless(unittest.TestCase):
+    def test_sprites(self):
+        for name, layers in SPRITES.items():
+            with self.subTest(sprite=name):
+                self.assertEqual(expand_rects(compile_sprite(name)), flatten_layers(layers))
+
+    def test_sprites_have_no_overlapping_rectangles(self):
+        # Overlaps would still expand to the same pixels, but draw some of them twice
+        for name in SPRITES:
+            with self.subTest(sprite=name):
+                rects = compile_sprite(name)
+                area = sum((x1 - x0) * (y1 - y0) for _, x0, y0, x1, y1 in rects)
+                self.assertEqual(area, len(expand_rects(rects)))
+
+    def test_glyphs(self):
+        for char, rows in GLYPHS.items():
+            with self.subTest(glyph=char):
+                width, rects = compile_glyph(char)
+                ink = {(x, y): "ink" for y, row in enumerate(rows) for x, cell in enumerate(row) if cell == "#"}
+                self.assertEqual(expand_rects(rects), ink)
+                self.assertEqual(width, len(rows[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""Moving to SQLite must never stop the app from starting over a bad settings file
+
+    python -m unittest discover tests
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from sqlite_store import SQLiteStore
+
+
+class MigrateSettings(unittest.TestCase):
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = folder.name
+        self.settings = os.path.join(self.folder, "pomodoro_settings.json")
+
+    def migrate(self, db="pomodoro.db"):
+        store = SQLiteStore(os.path.join(self.folder, db))
+        self.addCleanup(store.close)
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            migrated = store.migrate(
+                self.settings, os.path.join(self.folder, "goals.txt"), os.path.join(self.folder, "history")
+            )
+        self.assertTrue(migrated)
+        return store.load_settings(), stderr.getvalue()
+
+    def test_valid_settings_are_imported(self):
+        with open(self.settings, "w", encoding="utf-8") as f:
+            f.write('{"work_minutes": 50}')
+        self.assertEqual(self.migrate(), ({"work_minutes": 50}, ""))
+
+    def test_json_that_is_not_an_object_is_skipped(self):
+        for text in ("[]", "null", "3"):
+            with self.subTest(settings=text):
+                with open(self.settings, "w", encoding="utf-8") as f:
+                    f.write(text)
+                settings, notice = self.migrate(db=f"pomodoro-{text}.db")
+                self.assertEqual(settings, {})
+                self.assertIn("Not importing", notice)
+
+    def test_a_settings_file_that_cannot_be_read_is_skipped(self):
+        # A directory in its place fails to open with an OSError, even for root
+        os.mkdir(self.settings)
+        settings, notice = self.migrate()
+        self.assertEqual(settings, {})
+        self.assertIn("Not importing", notice)
+
+
+if __name__ == "__main__":
+    unittest.main()
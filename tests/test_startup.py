@@ -0,0 +1,102 @@
+"""Cold start: the first frame must not pay for history, stats, goals or audio
+
+    python -m unittest discover tests
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+from startup import FIRST_FRAME_BUDGET_MS, StartupTimer
+from timer_engine import PomodoroEngine
+
+
+class ImportsAreDeferred(unittest.TestCase):
+    def test_importing_the_app_loads_none_of_the_warm_up_modules(self):
+        # A fresh interpreter, so nothing imported by other tests can hide a regression
+        probe = (
+            "import json, sys; import pda_pomodoro; "
+            "print(json.dumps(sorted(m for m in ('history', 'stats', 'goals', 'sqlite_store', 'pygame') if m in sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", probe], cwd=SRC, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(json.loads(result.stdout.strip().splitlines()[-1]), [])
+
+
+HAS_DISPLAY = bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")) or sys.platform in ("win32", "darwin")
+
+
+@unittest.skipUnless(HAS_DISPLAY, "needs a display")
+class ColdStart(unittest.TestCase):
+    def test_first_frame_is_within_budget(self):
+        # A real launch, in an empty folder so it starts from default settings
+        with tempfile.TemporaryDirectory() as folder:
+            env = dict(os.environ)
+            env.pop("PDA_POMODORO_STORE", None)
+            result = subprocess.run(
+                [sys.executable, os.path.join(SRC, "pda_pomodoro.py"), "--startup-check"],
+                cwd=folder, env=env, capture_output=True, text=True, timeout=60
+            )
+        output = result.stdout
+        report = json.loads(output[output.index("{"):output.rindex("}") + 1])
+        self.assertEqual(report["budget_ms"], FIRST_FRAME_BUDGET_MS)
+        self.assertIsNotNone(report["warm_ms"])
+        self.assertLessEqual(report["first_frame_ms"], FIRST_FRAME_BUDGET_MS, report)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class Budget(unittest.TestCase):
+    def timer_at(self, ms_since_start, budget_ms=400):
+        import startup
+        return StartupTimer(budget_ms=budget_ms, clock=FakeClock(startup.PROCESS_START + ms_since_start / 1000))
+
+    def test_not_over_budget_before_the_first_frame(self):
+        self.assertFalse(self.timer_at(10_000).over_budget)
+
+    def test_within_budget(self):
+        timer = self.timer_at(250)
+        timer.mark_first_frame()
+        self.assertFalse(timer.over_budget)
+        self.assertEqual(timer.report()["first_frame_ms"], 250.0)
+
+    def test_over_budget(self):
+        timer = self.timer_at(401)
+        timer.mark_first_frame()
+        self.assertTrue(timer.over_budget)
+        self.assertTrue(timer.report()["over_budget"])
+
+    def test_phases_are_reported(self):
+        timer = self.timer_at(0)
+        with timer.phase("load_settings"):
+            timer.clock.now += 0.012
+        self.assertEqual(timer.report()["phases_ms"], {"load_settings": 12.0})
+
+
+class SnapshotBeforeWarmUp(unittest.TestCase):
+    def test_uses_the_settings_count_without_loading_the_stats(self):
+        # No Tk root needed: snapshot() only reads the engine, settings and stats
+        from pda_pomodoro import PomodoroTimer
+        app = PomodoroTimer.__new__(PomodoroTimer)
+        app.engine = PomodoroEngine(25 * 60, 5 * 60)
+        app.settings = {"total_sessions_today": 3}
+        app._stats = None
+        self.assertEqual(app.snapshot()["sessions_today"], 3)
+        self.assertIsNone(app._stats)
+
+
+if __name__ == "__main__":
+    unittest.main()
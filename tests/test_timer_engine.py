@@ -0,0 +1,71 @@
+"""TimerManager's lazily dropped heap entries must never fire for the wrong timer
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from timer_engine import DeadlineTimer, TimerManager
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class StaleEntries(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.manager = TimerManager(self.clock)
+
+    def test_removed_then_added_again_ignores_the_old_deadline(self):
+        self.manager.add("a", work_time=10)
+        self.manager.start("a")
+        self.manager.remove("a")
+        self.manager.add("a", work_time=100)
+        self.manager.start("a")
+        self.clock.now = 11
+        self.assertEqual(self.manager.advance(), [])
+        self.assertTrue(self.manager.timers["a"].is_work_session)
+        self.assertEqual(self.manager.next_deadline(), 100)
+        self.clock.now = 100
+        self.assertEqual(self.manager.advance(), [("a", True)])
+
+    def test_paused_timer_does_not_fire(self):
+        self.manager.add("a", work_time=10)
+        self.manager.start("a")
+        self.manager.pause("a")
+        self.clock.now = 20
+        self.assertEqual(self.manager.advance(), [])
+        self.assertIsNone(self.manager.next_deadline())
+
+    def test_sessions_chain_off_the_previous_deadline(self):
+        self.manager.add("a", work_time=10, break_time=5)
+        self.manager.start("a")
+        self.clock.now = 12
+        self.assertEqual(self.manager.advance(), [("a", True)])
+        self.assertEqual(self.manager.next_deadline(), 15)
+
+
+class ClockJumpTracking(unittest.TestCase):
+    def test_turned_off_reads_no_other_clock(self):
+        clock = FakeClock()
+
+        def wall_clock():
+            raise AssertionError("wall clock read")
+
+        timer = DeadlineTimer(10, clock=clock, wall_clock=wall_clock, track_clock_jumps=False)
+        timer.start()
+        clock.now = 4
+        self.assertEqual(timer.check_clock_jump(), 0.0)
+        self.assertEqual(timer.remaining(), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()